@@ -0,0 +1,335 @@
+"""
+Çakışma Denetimi - Schedule Conflict Audit
+Checks a whole exam schedule against the enrollment matrix in one pass
+"""
+
+import logging
+import time as _time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+class CakismaDenetimi:
+    """
+    Whole-schedule conflict auditor
+
+    Students are interned to bit positions and each course's enrollment is kept
+    as a single int bitmask, so intersecting two courses (or counting students
+    with N exams on a day) is a handful of big-int operations instead of a
+    Python loop over students.
+
+    Checks:
+        - student overlaps between exams whose time intervals intersect
+        - room double-booking (interval overlap per room)
+        - room capacity and total capacity per exam
+        - per-day exam limit per student
+        - back-to-back exams (next exam starts within ardisik_esik_dk of the previous end)
+    """
+
+    def __init__(self, course_students: Dict[int, Iterable[str]]):
+        course_students = {ders_id: list(students) for ders_id, students in course_students.items()}
+
+        self._bit_of: Dict[str, int] = {}
+        self._students: List[str] = []
+        for students in course_students.values():
+            for ogrenci_no in students:
+                if ogrenci_no not in self._bit_of:
+                    self._bit_of[ogrenci_no] = len(self._students)
+                    self._students.append(ogrenci_no)
+
+        # Build each mask through a byte buffer (one int conversion per course)
+        n_bytes = (len(self._students) + 7) // 8
+        self._masks: Dict[int, int] = {}
+        for ders_id, students in course_students.items():
+            buf = bytearray(n_bytes)
+            for ogrenci_no in students:
+                bit = self._bit_of[ogrenci_no]
+                buf[bit >> 3] |= 1 << (bit & 7)
+            self._masks[ders_id] = int.from_bytes(buf, 'little')
+
+    @classmethod
+    def from_kayitlar(cls, kayitlar: Iterable[Dict]) -> 'CakismaDenetimi':
+        """Build from ders_kayitlari rows ({'ogrenci_no', 'ders_id'})"""
+        course_students: Dict[int, List[str]] = defaultdict(list)
+        for row in kayitlar:
+            course_students[row['ders_id']].append(row['ogrenci_no'])
+        return cls(course_students)
+
+    @property
+    def student_count(self) -> int:
+        return len(self._students)
+
+    def mask(self, ders_id: int) -> int:
+        return self._masks.get(ders_id, 0)
+
+    def _sample(self, mask: int, limit: int) -> List[str]:
+        """First few student numbers in a mask (for readable reports)"""
+        sample = []
+        while mask and len(sample) < limit:
+            low = mask & -mask
+            sample.append(self._students[low.bit_length() - 1])
+            mask ^= low
+        return sample
+
+    @staticmethod
+    def group_exams(schedule: List[Dict]) -> List[Dict]:
+        """Collapse per-room entries into exams keyed by (ders_id, tarih_saat)"""
+        exams: Dict[Tuple[int, datetime], Dict] = {}
+        for entry in schedule:
+            start = entry['tarih_saat']
+            if not isinstance(start, datetime):
+                start = datetime.fromisoformat(str(start))
+            key = (entry['ders_id'], start)
+            exam = exams.get(key)
+            if exam is None:
+                exam = exams[key] = {
+                    'ders_id': entry['ders_id'],
+                    'ders_kodu': entry.get('ders_kodu') or str(entry['ders_id']),
+                    'start': start,
+                    'end': start + timedelta(minutes=int(entry.get('sure') or 0)),
+                    'rooms': []
+                }
+            exam['rooms'].append(entry)
+        return sorted(exams.values(), key=lambda e: (e['start'], e['ders_id']))
+
+    @staticmethod
+    def entries_from_program_rows(rows: List[Dict]) -> List[Dict]:
+        """Convert SinavModel.get_program_exam_rooms rows to schedule entries"""
+        entries = []
+        for row in rows:
+            start = datetime.combine(row['tarih'], row['baslangic_saati'])
+            end = datetime.combine(row['tarih'], row['bitis_saati'])
+            entries.append({
+                'ders_id': row['ders_id'],
+                'ders_kodu': row.get('ders_kodu'),
+                'tarih_saat': start,
+                'sure': int((end - start).total_seconds() // 60),
+                'derslik_id': row.get('derslik_id'),
+                'derslik_kodu': row.get('derslik_kodu'),
+                'kapasite': row.get('kapasite'),
+            })
+        return entries
+
+    def audit(
+        self,
+        schedule: List[Dict],
+        derslik_kapasiteleri: Optional[Dict[int, int]] = None,
+        daily_limit: int = 0,
+        ardisik_esik_dk: Optional[int] = 0,
+        max_examples: int = 10
+    ) -> Dict:
+        """
+        Audit a schedule and return a conflict report
+
+        Args:
+            schedule: Per-room schedule entries (planner / snapshot format)
+            derslik_kapasiteleri: derslik_id -> kapasite (falls back to entry['kapasite'])
+            daily_limit: Max exams per student per day (0 = not checked)
+            ardisik_esik_dk: Gap in minutes up to which two exams count as back-to-back
+                             (None = not checked)
+            max_examples: Max detailed items kept per conflict type
+        """
+        started = _time.perf_counter()
+        kapasiteler = derslik_kapasiteleri or {}
+        exams = self.group_exams(schedule)
+
+        errors: List[str] = []
+        warnings: List[str] = []
+
+        # Same course at more than one time
+        times_by_course: Dict[int, List[datetime]] = defaultdict(list)
+        for exam in exams:
+            times_by_course[exam['ders_id']].append(exam['start'])
+        duplicate_courses = {ders_id: times for ders_id, times in times_by_course.items() if len(times) > 1}
+        for ders_id, times in list(duplicate_courses.items())[:max_examples]:
+            errors.append(f"Ders {ders_id}: {len(times)} farklı zamanda programlanmış!")
+
+        # Student overlaps: sweep exams by start time, AND masks of intersecting intervals
+        student_conflicts = []
+        conflicted_students = 0
+        active: List[Dict] = []
+        for exam in exams:
+            active = [a for a in active if a['end'] > exam['start']]
+            exam_mask = self.mask(exam['ders_id'])
+            for other in active:
+                if other['ders_id'] == exam['ders_id']:
+                    continue
+                common = exam_mask & self.mask(other['ders_id'])
+                if not common:
+                    continue
+                conflicted_students |= common
+                count = _popcount(common)
+                if len(student_conflicts) < max_examples:
+                    student_conflicts.append({
+                        'ders_kodu_1': other['ders_kodu'],
+                        'ders_kodu_2': exam['ders_kodu'],
+                        'tarih_saat': exam['start'],
+                        'ogrenci_sayisi': count,
+                        'ornek_ogrenciler': self._sample(common, 5)
+                    })
+                errors.append(
+                    f"{exam['start']:%d.%m.%Y %H:%M}: {other['ders_kodu']} / {exam['ders_kodu']} "
+                    f"arasında {count} öğrenci çakışması!"
+                )
+            active.append(exam)
+
+        # Room double-booking and capacity
+        room_conflicts = []
+        capacity_violations = []
+        room_intervals: Dict[int, List[Tuple[datetime, datetime, Dict]]] = defaultdict(list)
+        for exam in exams:
+            total_capacity = 0
+            capacity_known = True
+            for entry in exam['rooms']:
+                derslik_id = entry.get('derslik_id')
+                if derslik_id is None:
+                    errors.append(f"{exam['ders_kodu']}: derslik atanmamış!")
+                    capacity_known = False
+                    continue
+                room_intervals[derslik_id].append((exam['start'], exam['end'], exam))
+                kapasite = kapasiteler.get(derslik_id, entry.get('kapasite'))
+                if kapasite is None:
+                    capacity_known = False
+                    continue
+                total_capacity += kapasite
+                placed = entry.get('ogrenci_sayisi')
+                if placed is not None and placed > kapasite:
+                    if len(capacity_violations) < max_examples:
+                        capacity_violations.append({
+                            'ders_kodu': exam['ders_kodu'],
+                            'derslik_id': derslik_id,
+                            'kapasite': kapasite,
+                            'ogrenci_sayisi': placed
+                        })
+                    errors.append(f"{exam['ders_kodu']}: derslik {entry.get('derslik_kodu', derslik_id)} kapasitesi aşıldı ({placed}/{kapasite})")
+
+            enrolled = _popcount(self.mask(exam['ders_id']))
+            if capacity_known and exam['rooms'] and total_capacity < enrolled:
+                if len(capacity_violations) < max_examples:
+                    capacity_violations.append({
+                        'ders_kodu': exam['ders_kodu'],
+                        'derslik_id': None,
+                        'kapasite': total_capacity,
+                        'ogrenci_sayisi': enrolled
+                    })
+                errors.append(f"{exam['ders_kodu']}: toplam kapasite yetersiz ({total_capacity}/{enrolled})")
+
+        for derslik_id, intervals in room_intervals.items():
+            intervals.sort(key=lambda item: (item[0], item[1]))
+            busy_until, busy_exam = None, None
+            for start, end, exam in intervals:
+                if busy_until is not None and start < busy_until:
+                    if len(room_conflicts) < max_examples:
+                        room_conflicts.append({
+                            'derslik_id': derslik_id,
+                            'ders_kodu_1': busy_exam['ders_kodu'],
+                            'ders_kodu_2': exam['ders_kodu'],
+                            'tarih_saat': start
+                        })
+                    errors.append(f"{start:%d.%m.%Y %H:%M}: derslik {derslik_id} aynı anda birden fazla sınava atanmış!")
+                if busy_until is None or end > busy_until:
+                    busy_until, busy_exam = end, exam
+
+        # Per-day load: unary bit-sliced counters, levels[k] = students with >= k+1 exams that day
+        exams_by_day: Dict = defaultdict(list)
+        for exam in exams:
+            exams_by_day[exam['start'].date()].append(exam)
+
+        max_levels: List[int] = []
+        over_limit_mask = 0
+        daily_limit_violations = []
+        back_to_back_pairs = 0
+        back_to_back_students = 0
+        for day, day_exams in sorted(exams_by_day.items()):
+            levels: List[int] = []
+            for exam in day_exams:
+                carry = self.mask(exam['ders_id'])
+                for i in range(len(levels)):
+                    if not carry:
+                        break
+                    previous = levels[i]
+                    levels[i] = previous | carry
+                    carry &= previous
+                if carry:
+                    levels.append(carry)
+
+            for i, level in enumerate(levels):
+                if i < len(max_levels):
+                    max_levels[i] |= level
+                else:
+                    max_levels.append(level)
+
+            if daily_limit > 0 and len(levels) > daily_limit:
+                exceeding = levels[daily_limit]
+                over_limit_mask |= exceeding
+                if len(daily_limit_violations) < max_examples:
+                    daily_limit_violations.append({
+                        'tarih': day,
+                        'ogrenci_sayisi': _popcount(exceeding),
+                        'ornek_ogrenciler': self._sample(exceeding, 5)
+                    })
+
+            if ardisik_esik_dk is not None:
+                threshold = timedelta(minutes=ardisik_esik_dk)
+                for i, first in enumerate(day_exams):
+                    for second in day_exams[i + 1:]:
+                        gap = second['start'] - first['end']
+                        if timedelta(0) <= gap <= threshold:
+                            common = self.mask(first['ders_id']) & self.mask(second['ders_id'])
+                            if common:
+                                back_to_back_pairs += _popcount(common)
+                                back_to_back_students |= common
+
+        if over_limit_mask:
+            warnings.append(f"{_popcount(over_limit_mask)} öğrenci günlük sınav limitini ({daily_limit}) aşıyor")
+        if back_to_back_students:
+            warnings.append(f"{_popcount(back_to_back_students)} öğrencinin arka arkaya sınavı var")
+
+        # Load distribution: students whose busiest day has exactly k exams
+        load_distribution = {}
+        loaded_students = 0
+        load_sum = 0
+        for i, level in enumerate(max_levels):
+            higher = max_levels[i + 1] if i + 1 < len(max_levels) else 0
+            count = _popcount(level & ~higher)
+            if count:
+                load_distribution[i + 1] = count
+                loaded_students += count
+                load_sum += (i + 1) * count
+
+        report = {
+            'success': not errors,
+            'message': "Program geçerli, çakışma yok!" if not errors else f"{len(errors)} çakışma tespit edildi!",
+            'errors': errors[:max_examples],
+            'warnings': warnings,
+            'duplicate_courses': list(duplicate_courses.keys()),
+            'student_conflicts': student_conflicts,
+            'conflicted_students': _popcount(conflicted_students),
+            'room_conflicts': room_conflicts,
+            'capacity_violations': capacity_violations,
+            'daily_limit_violations': daily_limit_violations,
+            'back_to_back': {
+                'pairs': back_to_back_pairs,
+                'students': _popcount(back_to_back_students)
+            },
+            'load': {
+                'max_student_load': len(max_levels),
+                'avg_student_load': round(load_sum / loaded_students, 2) if loaded_students else 0,
+                'distribution': load_distribution
+            },
+            'stats': {
+                'entries': len(schedule),
+                'exams': len(exams),
+                'students': len(self._students),
+                'error_count': len(errors),
+                'elapsed_ms': round((_time.perf_counter() - started) * 1000, 2)
+            }
+        }
+        return report
@@ -17,10 +17,20 @@ logger = logging.getLogger(__name__)
 class OturmaPlanlama:
     """Seating plan generation algorithm"""
     
-    def __init__(self):
-        self.ogrenci_model = OgrenciModel(db)
-        self.derslik_model = DerslikModel(db)
-        self.sinav_model = SinavModel(db)
+    def __init__(self, snapshot=None):
+        """
+        Args:
+            snapshot: Optional DepartmentSnapshot - reads data from a local
+                snapshot file instead of PostgreSQL
+        """
+        if snapshot is not None:
+            self.ogrenci_model = snapshot
+            self.derslik_model = snapshot
+            self.sinav_model = snapshot
+        else:
+            self.ogrenci_model = OgrenciModel(db)
+            self.derslik_model = DerslikModel(db)
+            self.sinav_model = SinavModel(db)
     
     def generate_seating_plan(
         self,
@@ -13,17 +13,112 @@ from models.database import db
 from models.ders_model import DersModel
 from models.derslik_model import DerslikModel
 from models.ogrenci_model import OgrenciModel
+from algorithms.cakisma_denetimi import CakismaDenetimi
 
 logger = logging.getLogger(__name__)
 
 
+class ParetoArsivi:
+    """
+    Bounded archive of non-dominated schedules
+
+    Objectives (all minimized internally):
+        scheduled_courses (maximized), max_student_load, avg_student_load,
+        class_gap_penalty, days_used
+    Completeness is not traded off: a schedule that places fewer courses
+    than an archived one is rejected, and a more complete one evicts the
+    less complete members, so the front never offers a partial schedule
+    next to a complete one.
+    When the archive is full, the member with the smallest crowding distance
+    is dropped so the kept set stays spread along the front.
+    """
+
+    OBJECTIVES = ('scheduled_courses', 'max_student_load', 'avg_student_load', 'class_gap_penalty', 'days_used')
+
+    def __init__(self, max_size: int = 10):
+        self.max_size = max(1, max_size)
+        self._members: List[Tuple[Tuple, Dict, List[Dict]]] = []
+
+    @staticmethod
+    def _to_vector(objectives: Dict) -> Tuple:
+        return (
+            -objectives['scheduled_courses'],
+            objectives['max_student_load'],
+            round(objectives['avg_student_load'], 4),
+            objectives['class_gap_penalty'],
+            objectives['days_used'],
+        )
+
+    @staticmethod
+    def dominates(a: Tuple, b: Tuple) -> bool:
+        """True if vector a is at least as good as b everywhere and better somewhere"""
+        return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+
+    def add(self, objectives: Dict, schedule: List[Dict]) -> bool:
+        """Try to add a schedule; returns True if the archive changed"""
+        vector = self._to_vector(objectives)
+        if self._members and vector[0] > min(m[0][0] for m in self._members):
+            return False
+        for other, _, _ in self._members:
+            if other == vector or self.dominates(other, vector):
+                return False
+
+        self._members = [
+            m for m in self._members
+            if m[0][0] <= vector[0] and not self.dominates(vector, m[0])
+        ]
+        self._members.append((vector, dict(objectives), schedule))
+
+        if len(self._members) > self.max_size:
+            distances = self._crowding_distances()
+            drop = min(range(len(self._members)), key=lambda i: distances[i])
+            self._members.pop(drop)
+        return True
+
+    def _crowding_distances(self) -> List[float]:
+        count = len(self._members)
+        distances = [0.0] * count
+        for k in range(len(self.OBJECTIVES)):
+            order = sorted(range(count), key=lambda i: self._members[i][0][k])
+            low = self._members[order[0]][0][k]
+            high = self._members[order[-1]][0][k]
+            distances[order[0]] = distances[order[-1]] = float('inf')
+            if high == low:
+                continue
+            for pos in range(1, count - 1):
+                prev_val = self._members[order[pos - 1]][0][k]
+                next_val = self._members[order[pos + 1]][0][k]
+                distances[order[pos]] += (next_val - prev_val) / (high - low)
+        return distances
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def front(self) -> List[Dict]:
+        """Non-dominated schedules, best lexicographic quality first"""
+        return [
+            {'objectives': objectives, 'schedule': schedule}
+            for _, objectives, schedule in sorted(self._members, key=lambda m: m[0])
+        ]
+
+
 class SinavPlanlama:
     """Exam scheduling algorithm using graph coloring approach"""
     
-    def __init__(self):
-        self.ders_model = DersModel(db)
-        self.derslik_model = DerslikModel(db)
-        self.ogrenci_model = OgrenciModel(db)
+    def __init__(self, snapshot=None):
+        """
+        Args:
+            snapshot: Optional DepartmentSnapshot - reads data from a local
+                snapshot file instead of PostgreSQL
+        """
+        if snapshot is not None:
+            self.ders_model = snapshot
+            self.derslik_model = snapshot
+            self.ogrenci_model = snapshot
+        else:
+            self.ders_model = DersModel(db)
+            self.derslik_model = DerslikModel(db)
+            self.ogrenci_model = OgrenciModel(db)
     
     def plan_exam_schedule(
         self, 
@@ -46,6 +141,11 @@ class SinavPlanlama:
                 - ogle_arasi_bitis: Lunch break end time (default: "13:30")
                 - gunluk_ilk_sinav: First exam time (default: "10:00")
                 - gunluk_son_sinav: Last exam start time (default: "19:15")
+                - room_timeline: Per-room timelines instead of aligning every batch
+                  to its longest exam (default: True)
+                - pareto_archive_size: Max non-dominated alternatives kept (default: 10)
+                - pareto_extra_attempts: Attempts to keep exploring trade-offs after
+                  the first complete schedule (default: 50, 0 = stop immediately)
             progress_callback: Optional callback for progress updates
                 
         Returns:
@@ -108,9 +208,14 @@ class SinavPlanlama:
             # Check for capacity issues
             capacity_errors = []
             
+            # Enrollment matrix in one streamed pass instead of one query per course
+            enrollments: Dict[int, Set[str]] = {ders['ders_id']: set() for ders in dersler}
+            for ders_id, ogrenci_no in self.ogrenci_model.iter_kayitlar_by_bolum(params['bolum_id']):
+                if ders_id in enrollments:
+                    enrollments[ders_id].add(ogrenci_no)
+            
             for ders in dersler:
-                ogrenciler = self.ogrenci_model.get_ogrenciler_by_ders(ders['ders_id'])
-                student_ids = set(o['ogrenci_no'] for o in ogrenciler)
+                student_ids = enrollments[ders['ders_id']]
                 ogrenci_sayisi = len(student_ids)
                 
                 # Get exam duration for this course (custom or default)
@@ -283,9 +388,14 @@ class SinavPlanlama:
             
             best_schedule = []
             best_unscheduled = float('inf')
+            best_days_exhausted = False
             any_days_exhausted = False
             attempts_without_improvement = 0
             max_no_improvement = 200# Give up if no improvement for 15 attempts
+            # Non-dominated alternatives for coordinators to choose from
+            pareto_archive = ParetoArsivi(int(params.get('pareto_archive_size', 10) or 1))
+            pareto_extra_attempts = int(params.get('pareto_extra_attempts', 50) or 0)
+            first_perfect_attempt = None
             
             logger.info(f"🎯 Starting optimization with up to {max_attempts} attempts...")
             logger.info(f"   Target: {len(course_info)} courses to schedule")
@@ -354,6 +464,15 @@ class SinavPlanlama:
                 # Penalize consecutive same-class slots within a day
                 class_gap_penalty = self._compute_class_consecutive_penalty(schedule_try, course_info)
                 
+                if schedule_try:
+                    pareto_archive.add({
+                        'scheduled_courses': len(scheduled_course_ids),
+                        'max_student_load': max_student_load,
+                        'avg_student_load': avg_student_load,
+                        'class_gap_penalty': class_gap_penalty,
+                        'days_used': len({s['tarih_saat'].date() for s in schedule_try}),
+                    }, schedule_try)
+                
                 # Log only occasionally to reduce spam
                 if attempt % 500 == 0 or attempt == max_attempts - 1:
                     logger.info(f"📈 Attempt {attempt+1}: scheduled={len(scheduled_course_ids)}/{len(all_course_ids)}, "
@@ -371,6 +490,7 @@ class SinavPlanlama:
                 if current_quality > best_quality:
                     best_unscheduled = unscheduled
                     best_schedule = schedule_try
+                    best_days_exhausted = getattr(self, '_days_exhausted', False)
                     self._best_max_load = -max_student_load
                     self._best_avg_load = -avg_student_load
                     self._best_class_gap_penalty = -class_gap_penalty
@@ -380,10 +500,15 @@ class SinavPlanlama:
                 else:
                     attempts_without_improvement += 1
                 
-                # Perfect solution found!
-                if unscheduled == 0:
+                # Perfect solution found! Optionally keep exploring trade-offs for the Pareto archive
+                if unscheduled == 0 and first_perfect_attempt is None:
+                    first_perfect_attempt = attempt
                     logger.info(f"🎉 Perfect solution found at attempt {attempt+1}!")
-                    break
+                # The exploration budget counts every attempt after the first perfect one
+                if first_perfect_attempt is not None:
+                    if attempt - first_perfect_attempt >= pareto_extra_attempts:
+                        break
+                    continue
                 
                 # Give up if no improvement for too long
                 if attempts_without_improvement >= max_no_improvement and attempt > 20:
@@ -391,8 +516,10 @@ class SinavPlanlama:
                     break
             
             schedule = best_schedule
+            pareto_front = pareto_archive.front()
             
             logger.info(f"🏁 Optimization complete: {len(course_info) - best_unscheduled}/{len(course_info)} courses scheduled")
+            logger.info(f"🧭 Pareto front: {len(pareto_front)} non-dominated alternatives")
             
             if not schedule:
                 return {
@@ -401,7 +528,8 @@ class SinavPlanlama:
                 }
             
             # If days exhausted, return partial schedule with failure
-            if getattr(self, '_days_exhausted', False):
+            # (flag of the attempt that produced best_schedule, not of the last attempt)
+            if best_days_exhausted:
                 scheduled_courses = set((s['ders_id'], s['tarih_saat']) for s in schedule)
                 unique_scheduled_course_ids = {cid for (cid, _) in scheduled_courses}
                 all_course_ids = set(course_info.keys())
@@ -473,7 +601,8 @@ class SinavPlanlama:
                     'success': False,
                     'message': error_msg,
                     'schedule': schedule,
-                    'unassigned_courses': unscheduled_ids
+                    'unassigned_courses': unscheduled_ids,
+                    'pareto_front': pareto_front
                 }
             
             if progress_callback:
@@ -481,7 +610,7 @@ class SinavPlanlama:
             
             # Validate schedule (without min rest; ara_suresi used already)
             self._last_params = {k: v for k, v in params.items() if k != 'min_rest_minutes'}
-            validation = self._validate_schedule(schedule, course_students)
+            validation = self._validate_schedule(schedule, course_students, derslikler)
             
             if not validation['success']:
                 logger.warning(f"⚠️ Validation warnings: {validation['message']}")
@@ -500,46 +629,30 @@ class SinavPlanlama:
             logger.info(f"📝 {len(unique_exams)} unique exams scheduled")
             
             # Calculate final student experience metrics
-            student_daily_exams = self._calculate_student_load(schedule, course_students)
-            daily_limit = params.get('class_per_day_limit', 0) or 0
-            if student_daily_exams:
-                max_student_load = max(student_daily_exams.values())
-                avg_student_load = sum(student_daily_exams.values()) / len(student_daily_exams)
-                students_with_heavy_load = sum(1 for load in student_daily_exams.values() if load >= 4)
-                students_exceeding_limit = sum(1 for load in student_daily_exams.values() if load > daily_limit) if daily_limit > 0 else 0
-                
-                logger.info(f"👥 Öğrenci Yükü: max={max_student_load} sınav/gün, ortalama={avg_student_load:.2f}")
-                logger.info(f"⚠️ Günde 4+ sınava giren öğrenci sayısı: {students_with_heavy_load}")
-                if daily_limit > 0 and students_exceeding_limit > 0:
-                    logger.warning(f"⚠️ Günlük limiti ({daily_limit}) aşan öğrenci sayısı: {students_exceeding_limit}")
-                
-                success_msg = f"✅ {len(unique_exams)} sınav başarıyla programlandı!\n\n"
-                success_msg += f"📊 Öğrenci Yükü:\n"
-                success_msg += f"   • En fazla: {max_student_load} sınav/gün\n"
-                success_msg += f"   • Ortalama: {avg_student_load:.1f} sınav/gün\n"
-                if daily_limit > 0:
-                    success_msg += f"   • Günlük limit: {daily_limit} sınav/gün\n"
-                    if students_exceeding_limit > 0:
-                        success_msg += f"   • ⚠️ {students_exceeding_limit} öğrenci limiti aşıyor\n"
-                if students_with_heavy_load > 0:
-                    success_msg += f"   • ⚠️ {students_with_heavy_load} öğrenci günde 4+ sınava giriyor\n"
-            else:
-                success_msg = f"✅ {len(unique_exams)} sınav başarıyla programlandı!"
-                max_student_load = 0
-                avg_student_load = 0
+            success_msg, stats = self._summarize_schedule(schedule, course_students, len(dersler), params, log_load=True)
+            
+            # Every alternative offered to the coordinator gets the same
+            # audit and statistics as the best schedule; like the best
+            # schedule it stays selectable and audit errors become warnings
+            for alternative in pareto_front:
+                alt_validation = self._validate_schedule(alternative['schedule'], course_students, derslikler)
+                alt_msg, alt_stats = self._summarize_schedule(alternative['schedule'], course_students, len(dersler), params)
+                alt_report = alt_validation.get('report', {})
+                alternative.update({
+                    'message': alt_msg,
+                    'stats': alt_stats,
+                    'warnings': pre_warnings + alt_report.get('errors', []) + alt_report.get('warnings', []),
+                    'validation': alt_report,
+                })
             
             result = {
                 'success': True,
                 'message': success_msg,
                 'schedule': schedule,
-                'stats': {
-                    'total_courses': len(dersler),
-                    'scheduled_courses': len(unique_exams),
-                    'days_used': len(set(s['tarih_saat'].date() for s in schedule)),
-                    'max_student_load': max_student_load,
-                    'avg_student_load': round(avg_student_load, 2) if student_daily_exams else 0
-                },
-                'warnings': pre_warnings
+                'stats': stats,
+                'warnings': pre_warnings + validation.get('report', {}).get('warnings', []),
+                'validation': validation.get('report', {}),
+                'pareto_front': pareto_front
             }
             return result
             
@@ -555,6 +668,54 @@ class SinavPlanlama:
         parts = time_str.split(':')
         return time(hour=int(parts[0]), minute=int(parts[1]))
     
+    def _summarize_schedule(
+        self,
+        schedule: List[Dict],
+        course_students: Dict[int, Set[str]],
+        total_courses: int,
+        params: Dict,
+        log_load: bool = False
+    ) -> Tuple[str, Dict]:
+        """Success message and statistics (student load, days used) of a schedule"""
+        unique_exams = set((s['ders_id'], s['tarih_saat']) for s in schedule)
+        student_daily_exams = self._calculate_student_load(schedule, course_students)
+        daily_limit = params.get('class_per_day_limit', 0) or 0
+        if student_daily_exams:
+            max_student_load = max(student_daily_exams.values())
+            avg_student_load = sum(student_daily_exams.values()) / len(student_daily_exams)
+            students_with_heavy_load = sum(1 for load in student_daily_exams.values() if load >= 4)
+            students_exceeding_limit = sum(1 for load in student_daily_exams.values() if load > daily_limit) if daily_limit > 0 else 0
+            
+            if log_load:
+                logger.info(f"👥 Öğrenci Yükü: max={max_student_load} sınav/gün, ortalama={avg_student_load:.2f}")
+                logger.info(f"⚠️ Günde 4+ sınava giren öğrenci sayısı: {students_with_heavy_load}")
+                if daily_limit > 0 and students_exceeding_limit > 0:
+                    logger.warning(f"⚠️ Günlük limiti ({daily_limit}) aşan öğrenci sayısı: {students_exceeding_limit}")
+            
+            success_msg = f"✅ {len(unique_exams)} sınav başarıyla programlandı!\n\n"
+            success_msg += f"📊 Öğrenci Yükü:\n"
+            success_msg += f"   • En fazla: {max_student_load} sınav/gün\n"
+            success_msg += f"   • Ortalama: {avg_student_load:.1f} sınav/gün\n"
+            if daily_limit > 0:
+                success_msg += f"   • Günlük limit: {daily_limit} sınav/gün\n"
+                if students_exceeding_limit > 0:
+                    success_msg += f"   • ⚠️ {students_exceeding_limit} öğrenci limiti aşıyor\n"
+            if students_with_heavy_load > 0:
+                success_msg += f"   • ⚠️ {students_with_heavy_load} öğrenci günde 4+ sınava giriyor\n"
+        else:
+            success_msg = f"✅ {len(unique_exams)} sınav başarıyla programlandı!"
+            max_student_load = 0
+            avg_student_load = 0
+        
+        stats = {
+            'total_courses': total_courses,
+            'scheduled_courses': len(unique_exams),
+            'days_used': len(set(s['tarih_saat'].date() for s in schedule)),
+            'max_student_load': max_student_load,
+            'avg_student_load': round(avg_student_load, 2) if student_daily_exams else 0
+        }
+        return success_msg, stats
+    
     def _calculate_student_load(self, schedule: List[Dict], course_students: Dict[int, Set[str]]) -> Dict[str, int]:
         """
         Calculate maximum number of exams per day for each student
@@ -565,9 +726,10 @@ class SinavPlanlama:
         # Group exams by date and student
         student_daily_count = defaultdict(lambda: defaultdict(int))
         
-        for exam in schedule:
-            ders_id = exam['ders_id']
-            exam_date = exam['tarih_saat'].date() if hasattr(exam['tarih_saat'], 'date') else exam['tarih_saat']
+        # One exam per (course, start) - multi-room entries must not count twice
+        exams = {(exam['ders_id'], exam['tarih_saat']) for exam in schedule}
+        for ders_id, tarih_saat in exams:
+            exam_date = tarih_saat.date() if hasattr(tarih_saat, 'date') else tarih_saat
             
             # For each student in this course, increment their daily count
             for student_no in course_students.get(ders_id, set()):
@@ -753,6 +915,11 @@ class SinavPlanlama:
         """
         Dynamically assign time slots and classrooms
         Each slot can have different duration based on exams scheduled in it
+
+        With params['room_timeline'] (default on) rooms are tracked on their own
+        timelines: a room freed by a short exam can take the next non-conflicting
+        exam right away instead of waiting for the longest exam of the batch.
+        Students of still-running exams stay blocked until those exams end.
         """
         schedule = []
         
@@ -804,6 +971,10 @@ class SinavPlanlama:
         min_class_gap_slots = int(params.get('min_class_gap_slots', 1) or 1)
         # Track last slot index per (day, class)
         last_slot_idx_for_class: Dict[tuple, int] = {}
+        # Room timeline: when each room is free again (end + ara_suresi), and exams still running
+        room_timeline = bool(params.get('room_timeline', True))
+        room_free_at: Dict[int, datetime] = {}
+        running_exams: List[Tuple[datetime, int]] = []  # (end + ara_suresi, ders_id)
         
         while remaining_courses:
             
@@ -818,6 +989,8 @@ class SinavPlanlama:
                     current_day = days[current_day_idx]
                     current_time = datetime.combine(current_day.date(), gunluk_ilk)
                     day_slot_index = 0
+                    room_free_at.clear()
+                    running_exams = []
                 
                 # Respect lunch break
                 current_time_only = current_time.time()
@@ -826,13 +999,24 @@ class SinavPlanlama:
                 
                 # Available classrooms reset for each batch at this start time
                 slot_time = current_time
-                all_rooms = list(sorted_derslikler)
                 batch_used_students: Set[str] = set()
                 batch_used_classes: Dict[int, int] = defaultdict(int)
+                if room_timeline:
+                    # Only rooms already free; students of running exams are busy
+                    all_rooms = [r for r in sorted_derslikler if room_free_at.get(r['derslik_id'], slot_time) <= slot_time]
+                    running_exams = [(end, cid) for end, cid in running_exams if end > slot_time]
+                    for _, running_cid in running_exams:
+                        batch_used_students.update(course_students.get(running_cid, set()))
+                    free_capacity = sum(r['kapasite'] for r in all_rooms)
+                    all_rooms_free = not running_exams and len(all_rooms) == len(sorted_derslikler)
+                else:
+                    all_rooms = list(sorted_derslikler)
                 
                 # Build zero-conflict set (greedy MIS) for this batch
                 # Different ordering strategies to maximize placement success
-                if order_strategy == 'random':
+                if not all_rooms:
+                    candidate = []
+                elif order_strategy == 'random':
                     # Random order
                     candidate = list(remaining_courses)
                     random.shuffle(candidate)
@@ -892,8 +1076,8 @@ class SinavPlanlama:
                 skipped_reasons = defaultdict(int)  # Track why courses are skipped
                 
                 for cid in candidate:
-                    # Rule 1: If no_parallel_exams is enabled, only one exam per slot
-                    if no_parallel and selected:
+                    # Rule 1: If no_parallel_exams is enabled, only one exam per slot (and none while one is running)
+                    if no_parallel and (selected or (room_timeline and running_exams)):
                         skipped_reasons['no_parallel_enabled'] += 1
                         continue
                     
@@ -959,6 +1143,17 @@ class SinavPlanlama:
                         skipped_reasons['class_consecutive_day_avoid'] += 1
                         continue
                     
+                    # Rule 3d: Room timeline - course needs a free room and enough free capacity
+                    # (a course larger than every room together is still allowed when all rooms are free)
+                    if room_timeline:
+                        if len(selected) >= len(all_rooms):
+                            skipped_reasons['no_free_room'] += 1
+                            continue
+                        need = course_info[cid]['ogrenci_sayisi']
+                        if need > free_capacity and not (all_rooms_free and not selected):
+                            skipped_reasons['room_capacity_busy'] += 1
+                            continue
+                    
                     # Rule 4: Student per day limit - check if ANY student would exceed limit
                     # Only enforce explicit student_per_day_limit if provided
                     limit_for_students = student_day_limit if student_day_limit > 0 else 0
@@ -979,6 +1174,8 @@ class SinavPlanlama:
                     selected.append(cid)
                     batch_used_students.update(course_students.get(cid, set()))
                     batch_used_classes[csinif] += 1
+                    if room_timeline:
+                        free_capacity -= course_info[cid]['ogrenci_sayisi']
                     # Update daily count
                     day_key = (current_day_idx, csinif)
                     day_class_count[day_key] += 1
@@ -1003,6 +1200,11 @@ class SinavPlanlama:
                             overlap = len(course_students[cid] & batch_used_students)
                             if overlap >= conflict_threshold:
                                 continue
+                        # Respect free rooms/capacity on the room timeline
+                        if room_timeline and (
+                            len(selected) >= len(all_rooms) or course_info[cid]['ogrenci_sayisi'] > free_capacity
+                        ):
+                            continue
                         # Respect class slot/day hard limits only
                         csinif = course_info[cid].get('sinif', 0)
                         if class_limit > 0 and batch_used_classes[csinif] >= class_limit:
@@ -1033,6 +1235,8 @@ class SinavPlanlama:
                         batch_used_students.update(course_students.get(cid, set()))
                         batch_used_classes[csinif] += 1
                         day_class_count[(current_day_idx, csinif)] += 1
+                        if room_timeline:
+                            free_capacity -= course_info[cid]['ogrenci_sayisi']
 
                 # Log parallel exam stats for debugging
                 if selected and len(selected) > 1:
@@ -1129,6 +1333,11 @@ class SinavPlanlama:
                     # Append entries
                     for e in entries:
                         schedule.append(e)
+                        if room_timeline:
+                            room_free_at[e['derslik_id']] = slot_time + timedelta(minutes=e['sure'] + ara_suresi)
+                    if room_timeline:
+                        for cid in selected:
+                            running_exams.append((slot_time + timedelta(minutes=duration_map[cid] + ara_suresi), cid))
                     # Update previous slot classes and last day usage
                     last_slot_classes_by_day[current_day_idx] = set(class_in_slot)
                     for sclass in class_in_slot:
@@ -1143,8 +1352,14 @@ class SinavPlanlama:
                     max_duration_in_batch = 0
                 
                 # Advance time to next batch
-                advance_minutes = (max_duration_in_batch + ara_suresi) if max_duration_in_batch > 0 else ara_suresi
-                next_time = current_time + timedelta(minutes=advance_minutes)
+                if room_timeline:
+                    # Jump to the next moment a room or a running exam's students are released
+                    events = [t for t in room_free_at.values() if t > current_time]
+                    events.extend(end for end, _ in running_exams if end > current_time)
+                    next_time = min(events) if events else current_time + timedelta(minutes=ara_suresi)
+                else:
+                    advance_minutes = (max_duration_in_batch + ara_suresi) if max_duration_in_batch > 0 else ara_suresi
+                    next_time = current_time + timedelta(minutes=advance_minutes)
                 # Respect lunch break after advancing
                 next_time_only = next_time.time()
                 if ogle_baslangic <= next_time_only < ogle_bitis:
@@ -1172,49 +1387,35 @@ class SinavPlanlama:
         
         return schedule
     
-    def _validate_schedule(self, schedule: List[Dict], course_students: Dict[int, Set[str]]) -> Dict:
-        """Validate exam schedule for conflicts"""
-        errors = []
-        warnings = []
-        
-        # Group by time slot
-        slots = defaultdict(list)
-        for exam in schedule:
-            slot_key = exam['tarih_saat'].isoformat() if isinstance(exam['tarih_saat'], datetime) else exam['tarih_saat']
-            slots[slot_key].append(exam)
-        
-        # Check each slot
-        for slot_key, exams in slots.items():
-            # Check classroom conflicts
-            derslikler_in_slot = [e['derslik_id'] for e in exams]
-            if len(derslikler_in_slot) != len(set(derslikler_in_slot)):
-                errors.append(f"Slot {slot_key}: Aynı derslik birden fazla kullanılmış!")
-            
-            # Check student conflicts
-            students_in_slot = set()
-            for exam in exams:
-                ders_id = exam['ders_id']
-                students = course_students.get(ders_id, set())
-                
-                overlap = students_in_slot & students
-                if overlap:
-                    errors.append(f"Slot {slot_key}: {len(overlap)} öğrenci çakışması!")
-                
-                students_in_slot.update(students)
+    def _validate_schedule(
+        self,
+        schedule: List[Dict],
+        course_students: Dict[int, Set[str]],
+        derslikler: Optional[List[Dict]] = None
+    ) -> Dict:
+        """Validate exam schedule for conflicts (see CakismaDenetimi)"""
+        params = getattr(self, '_last_params', {}) or {}
+        report = CakismaDenetimi(course_students).audit(
+            schedule,
+            derslik_kapasiteleri={d['derslik_id']: d['kapasite'] for d in derslikler or []},
+            daily_limit=int(params.get('student_per_day_limit', 0) or 0),
+            ardisik_esik_dk=int(params.get('ara_suresi', 15))
+        )
+        logger.info(f"🔎 Conflict audit: {report['stats']['exams']} exams in {report['stats']['elapsed_ms']} ms")
         
-        # Skip per-student min rest validation; ara_suresi policy applies globally
-
-        if errors:
+        if not report['success']:
             return {
                 'success': False,
-                'message': f"{len(errors)} validation error",
-                'errors': errors[:10]
+                'message': f"{report['stats']['error_count']} validation error",
+                'errors': report['errors'],
+                'report': report
             }
         
         return {
             'success': True,
             'message': "Schedule is valid",
-            'warnings': warnings[:20] if warnings else []
+            'warnings': report['warnings'],
+            'report': report
         }
 
     def _compute_class_consecutive_penalty(self, schedule: List[Dict], course_info: Dict[int, Dict]) -> int:
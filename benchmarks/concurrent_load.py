@@ -0,0 +1,443 @@
+"""
+Eşzamanlı yük testi (sınav haftası senaryosu)
+
+Her oturum ayrı bir bölümün koordinatörünü taklit eder ve model katmanı
+üzerinden gerçekçi bir iş karışımı çalıştırır: listeleme, öğrenci içe
+aktarma, sınav programı kaydetme ve oturma planı kaydetme. Tüm oturumlar
+uygulamadaki gibi tek DatabaseManager havuzunu paylaşır; böylece
+DB_POOL_SIZE / DB_MAX_OVERFLOW, tetikleyiciler ve RLS politikaları aynı anda
+zorlanır.
+
+Rapor: işlem türüne göre verim (işlem/sn), gecikme yüzdelikleri (p50/p90/p99),
+havuz bekleme süresi ve havuz tükenmesi (PoolError), kilit bekleyen oturum
+sayısı (pg_stat_activity örneklemesi) ve deadlock sayısı.
+
+Eşzamanlı oturumlar kendi transaction'larını COMMIT ettiğinden sentetik veri
+tek bir ROLLBACK ile geri alınamaz; test bölümleri ve kullanıcısı sonunda
+silinir (bölüme bağlı tüm satırlar ON DELETE CASCADE ile gider).
+
+Gereksinimler: şemanın kurulu olduğu yerel bir PostgreSQL (.env). RLS
+politikaları yalnızca tablo sahibi olmayan bir kullanıcıyla bağlanıldığında
+uygulanır; oturumlar RLS bağlamı olarak geçici bir Admin kullanıcısı kullanır.
+
+Örnek:
+    python benchmarks/concurrent_load.py --sessions 30 --duration 60 --json load.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, time as dtime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import psycopg2
+from psycopg2 import errors, pool
+from models.database import DatabaseManager, db
+from models.query_stats import query_stats
+from models.ogrenci_model import OgrenciModel
+from models.ders_model import DersModel
+from models.sinav_model import SinavModel
+from models.oturma_model import OturmaModel
+from models.dashboard_model import DashboardModel
+
+# Relative weights of the operations each session picks from
+WORKLOAD = {
+    'listing': 50,
+    'import': 15,
+    'schedule_save': 20,
+    'seating_save': 15,
+}
+
+ROOM_ROWS, ROOM_COLS = 10, 10
+SLOTS_PER_DAY = 4
+
+
+def load_dataset(conn, sessions: int, students: int, courses: int, rooms: int,
+                 courses_per_student: int) -> Dict:
+    """Her oturum için bir bölüm: derslikler, dersler, öğrenciler ve kayıtlar"""
+    suffix = os.getpid() % 10000
+    bolumler = []
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO users (email, password_hash, role, ad_soyad)
+            VALUES (%s, 'x', 'Admin', 'Load Test')
+            RETURNING user_id
+        """, (f"load.test.{os.getpid()}@example.invalid",))
+        user_id = cursor.fetchone()[0]
+
+        for index in range(sessions):
+            prefix = f"L{suffix:04d}{index:02d}"
+            cursor.execute(
+                "INSERT INTO bolumler (bolum_adi, bolum_kodu) VALUES (%s, %s) RETURNING bolum_id",
+                (f"Load Test {prefix}", prefix)
+            )
+            bolum_id = cursor.fetchone()[0]
+
+            cursor.execute("""
+                INSERT INTO derslikler (bolum_id, derslik_kodu, derslik_adi, kapasite,
+                                        satir_sayisi, sutun_sayisi, sira_yapisi)
+                SELECT %s, 'D' || g, 'Derslik ' || g, %s, %s, %s, 2
+                FROM generate_series(1, %s) g
+            """, (bolum_id, ROOM_ROWS * ROOM_COLS, ROOM_ROWS, ROOM_COLS, rooms))
+
+            cursor.execute("""
+                INSERT INTO dersler (bolum_id, ders_kodu, ders_adi, ogretim_elemani, sinif, ders_yapisi)
+                SELECT %s, %s || '-' || g, 'Ders ' || g, 'Öğr. Gör.', 1 + g %% 4, 'Zorunlu'
+                FROM generate_series(1, %s) g
+            """, (bolum_id, prefix, courses))
+
+            cursor.execute("""
+                INSERT INTO ogrenciler (ogrenci_no, bolum_id, ad_soyad, sinif)
+                SELECT %s || '-' || g, %s, 'Öğrenci ' || g, 1 + g %% 4
+                FROM generate_series(1, %s) g
+            """, (prefix, bolum_id, students))
+
+            # Student g takes courses_per_student consecutive courses
+            cursor.execute("""
+                INSERT INTO ders_kayitlari (ogrenci_no, ders_id)
+                SELECT o.ogrenci_no, d.ders_id
+                FROM ogrenciler o
+                JOIN LATERAL (
+                    SELECT ders_id FROM dersler
+                    WHERE bolum_id = %s
+                    ORDER BY (ders_id + split_part(o.ogrenci_no, '-', 2)::INT) %% %s
+                    LIMIT %s
+                ) d ON TRUE
+                WHERE o.bolum_id = %s
+            """, (bolum_id, courses, courses_per_student, bolum_id))
+
+            cursor.execute("SELECT ders_id FROM dersler WHERE bolum_id = %s ORDER BY ders_id", (bolum_id,))
+            ders_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT derslik_id FROM derslikler WHERE bolum_id = %s ORDER BY derslik_id", (bolum_id,))
+            derslik_ids = [row[0] for row in cursor.fetchall()]
+            bolumler.append({'bolum_id': bolum_id, 'prefix': prefix,
+                             'ders_ids': ders_ids, 'derslik_ids': derslik_ids})
+
+        for table in ('ogrenciler', 'dersler', 'derslikler', 'ders_kayitlari'):
+            cursor.execute(f"ANALYZE {table}")
+    conn.commit()
+    return {'user_id': user_id, 'bolumler': bolumler}
+
+
+def drop_dataset(conn, dataset: Dict):
+    """Test bölümlerini (CASCADE) ve kullanıcısını sil"""
+    conn.rollback()
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM bolumler WHERE bolum_id = ANY(%s)",
+            ([b['bolum_id'] for b in dataset['bolumler']],)
+        )
+        cursor.execute("DELETE FROM users WHERE user_id = %s", (dataset['user_id'],))
+    conn.commit()
+
+
+class Session:
+    """Bir koordinatörün iş akışı; yalnızca model katmanını kullanır"""
+
+    def __init__(self, bolum: Dict, courses_per_student: int, import_batch: int, seed: int):
+        self.bolum = bolum
+        self.courses_per_student = courses_per_student
+        self.import_batch = import_batch
+        self.rng = random.Random(seed)
+        self.ogrenci_model = OgrenciModel(db)
+        self.ders_model = DersModel(db)
+        self.sinav_model = SinavModel(db)
+        self.oturma_model = OturmaModel(db)
+        self.dashboard_model = DashboardModel(db)
+        self.program_id = None
+        self.sinav_ids: Dict[int, int] = {}
+        self.imported = 0
+
+    def listing(self):
+        bolum_id = self.bolum['bolum_id']
+        self.ogrenci_model.get_ogrenciler_sayfasi(bolum_id, None, 200)
+        self.ders_model.get_dersler_sayfasi(bolum_id, None, 200)
+        for program in self.sinav_model.get_programs_by_bolum(bolum_id)[:1]:
+            self.sinav_model.get_sinavlar_by_program(program['program_id'])
+        self.dashboard_model.get_bolum_istatistikleri(bolum_id)
+
+    def import_students(self):
+        """Excel içe aktarma: öğrenci + ders kayıtları tek transaction'da"""
+        with db.transaction():
+            for _ in range(self.import_batch):
+                self.imported += 1
+                ogrenci_no = self.ogrenci_model.insert_ogrenci({
+                    'ogrenci_no': f"{self.bolum['prefix']}-i{self.imported}",
+                    'bolum_id': self.bolum['bolum_id'],
+                    'ad_soyad': f"Yeni Öğrenci {self.imported}",
+                    'sinif': 1
+                })
+                self.ogrenci_model.insert_kayitlar(
+                    ogrenci_no, self.rng.sample(self.bolum['ders_ids'], self.courses_per_student)
+                )
+
+    def save_schedule(self):
+        """Programı yeniden oluştur: eski program silinir, yenisi toplu kaydedilir"""
+        if self.program_id is not None:
+            self.sinav_model.delete_program(self.program_id)
+            self.program_id, self.sinav_ids = None, {}
+
+        start = date.today() + timedelta(days=30)
+        rooms = self.bolum['derslik_ids']
+        exams = []
+        # One course per slot, so neither rooms nor students overlap
+        for i, ders_id in enumerate(self.bolum['ders_ids']):
+            hour = 9 + 2 * (i % SLOTS_PER_DAY)
+            exams.append({
+                'ders_id': ders_id,
+                'tarih': start + timedelta(days=i // SLOTS_PER_DAY),
+                'baslangic_saati': dtime(hour, 0),
+                'bitis_saati': dtime(hour + 1, 0),
+                'derslik_ids': [rooms[i % len(rooms)]]
+            })
+        result = self.sinav_model.save_program_bulk({
+            'bolum_id': self.bolum['bolum_id'],
+            'program_adi': f"Load Test {self.bolum['prefix']} {time.monotonic_ns()}",
+            'sinav_tipi': 'Final',
+            'baslangic_tarihi': start,
+            'bitis_tarihi': start + timedelta(days=len(exams) // SLOTS_PER_DAY + 1)
+        }, exams)
+        self.program_id, self.sinav_ids = result['program_id'], result['sinav_ids']
+
+    def save_seating(self):
+        """Bir sınavın oturma planını baştan yaz (kapasite/çakışma tetikleyicileri)"""
+        if not self.sinav_ids:
+            self.save_schedule()
+        ders_id = self.rng.choice(list(self.sinav_ids))
+        sinav_id = self.sinav_ids[ders_id]
+        index = self.bolum['ders_ids'].index(ders_id)
+        derslik_id = self.bolum['derslik_ids'][index % len(self.bolum['derslik_ids'])]
+
+        ogrenciler = self.ogrenci_model.get_ogrenciler_by_ders(ders_id)[:ROOM_ROWS * ROOM_COLS]
+        plan = [
+            {'ogrenci_no': o['ogrenci_no'], 'derslik_id': derslik_id,
+             'satir': seat // ROOM_COLS + 1, 'sutun': seat % ROOM_COLS + 1}
+            for seat, o in enumerate(ogrenciler)
+        ]
+        self.oturma_model.replace_plan_bulk(sinav_id, plan)
+
+    OPERATIONS = {
+        'listing': listing,
+        'import': import_students,
+        'schedule_save': save_schedule,
+        'seating_save': save_seating,
+    }
+
+
+def classify_error(error: Exception) -> str:
+    if isinstance(error, pool.PoolError):
+        return 'pool_exhausted'
+    if isinstance(error, errors.DeadlockDetected):
+        return 'deadlock'
+    if isinstance(error, (errors.LockNotAvailable, errors.QueryCanceled)):
+        return 'lock_timeout'
+    if isinstance(error, psycopg2.OperationalError):
+        return 'connection'
+    return type(error).__name__
+
+
+class ActivityMonitor(threading.Thread):
+    """pg_stat_activity'yi örnekle: bağlantı, aktif sorgu ve kilit bekleyen oturum sayısı"""
+
+    QUERY = """
+        SELECT COUNT(*) AS baglanti,
+               COUNT(*) FILTER (WHERE state = 'active') AS aktif,
+               COUNT(*) FILTER (WHERE wait_event_type = 'Lock') AS kilit_bekleyen
+        FROM pg_stat_activity
+        WHERE datname = current_database() AND pid <> pg_backend_pid()
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name='load-monitor', daemon=True)
+        self.interval = interval
+        self.samples: List[tuple] = []
+        self.stop_event = threading.Event()
+
+    def run(self):
+        conn = psycopg2.connect(**DatabaseManager._connection_params())
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                while not self.stop_event.is_set():
+                    cursor.execute(self.QUERY)
+                    self.samples.append(cursor.fetchone())
+                    self.stop_event.wait(self.interval)
+        finally:
+            conn.close()
+
+    def summary(self) -> Dict:
+        if not self.samples:
+            return {}
+        lock_waits = [s[2] for s in self.samples]
+        return {
+            'samples': len(self.samples),
+            'max_connections': max(s[0] for s in self.samples),
+            'max_active': max(s[1] for s in self.samples),
+            'max_lock_waiters': max(lock_waits),
+            'avg_lock_waiters': round(sum(lock_waits) / len(lock_waits), 2),
+            'samples_with_lock_waits': sum(1 for w in lock_waits if w)
+        }
+
+
+def deadlock_count(conn) -> int:
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()")
+        value = cursor.fetchone()[0]
+    conn.rollback()
+    return value
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_sessions(dataset: Dict, duration: float, think_ms: float,
+                 courses_per_student: int, import_batch: int) -> Dict:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    failures: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    lock = threading.Lock()
+    names, weights = zip(*WORKLOAD.items())
+    deadline = time.monotonic() + duration
+    start_barrier = threading.Barrier(len(dataset['bolumler']))
+
+    def worker(index: int, bolum: Dict):
+        session = Session(bolum, courses_per_student, import_batch, seed=index)
+        start_barrier.wait()
+        while time.monotonic() < deadline:
+            name = session.rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                Session.OPERATIONS[name](session)
+            except Exception as e:
+                with lock:
+                    failures[name][classify_error(e)] += 1
+            else:
+                with lock:
+                    latencies[name].append((time.perf_counter() - started) * 1000)
+            if think_ms:
+                time.sleep(session.rng.uniform(0, 2 * think_ms) / 1000)
+
+    threads = [
+        threading.Thread(target=worker, args=(i, bolum), name=f'load-session-{i}')
+        for i, bolum in enumerate(dataset['bolumler'])
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    operations = {}
+    for name in WORKLOAD:
+        values = latencies.get(name, [])
+        operations[name] = {
+            'ok': len(values),
+            'failed': sum(failures[name].values()),
+            'errors': dict(failures[name]),
+            'ops_per_sec': round(len(values) / elapsed, 2),
+            'p50_ms': round(percentile(values, 0.50), 2) if values else None,
+            'p90_ms': round(percentile(values, 0.90), 2) if values else None,
+            'p99_ms': round(percentile(values, 0.99), 2) if values else None,
+            'max_ms': round(max(values), 2) if values else None,
+        }
+    return {'elapsed_seconds': round(elapsed, 2), 'operations': operations}
+
+
+def run(sessions: int, duration: float, students: int, courses: int, rooms: int,
+        courses_per_student: int, import_batch: int, think_ms: float) -> Dict:
+    report = {
+        'sessions': sessions, 'duration': duration, 'students': students, 'courses': courses,
+        'rooms': rooms, 'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20))
+    }
+    conn = psycopg2.connect(**DatabaseManager._connection_params())
+    dataset = None
+    try:
+        started = time.perf_counter()
+        dataset = load_dataset(conn, sessions, students, courses, rooms, courses_per_student)
+        report['load_seconds'] = round(time.perf_counter() - started, 2)
+
+        db.set_user_context(dataset['user_id'])
+        db.reset_query_stats()
+        deadlocks_before = deadlock_count(conn)
+        monitor = ActivityMonitor(interval=0.2)
+        monitor.start()
+        try:
+            report.update(run_sessions(dataset, duration, think_ms, courses_per_student, import_batch))
+        finally:
+            monitor.stop_event.set()
+            monitor.join()
+        report['activity'] = monitor.summary()
+        report['deadlocks'] = deadlock_count(conn) - deadlocks_before
+        report['pool_wait'] = query_stats.snapshot(top=0)['pool_wait']
+    finally:
+        db.set_user_context(None)
+        if dataset is not None:
+            drop_dataset(conn, dataset)
+        conn.close()
+        db.close_all_connections()
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\nConcurrent load — {report['sessions']} sessions for {report['elapsed_seconds']}s "
+          f"(pool {report['pool_size']}/{report['max_overflow']})\n")
+    print(f"{'operation':<16}{'ok':>8}{'failed':>8}{'ops/s':>9}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for name, stats in report['operations'].items():
+        cells = [stats[k] if stats[k] is not None else float('nan') for k in ('p50_ms', 'p90_ms', 'p99_ms', 'max_ms')]
+        print(f"{name:<16}{stats['ok']:>8}{stats['failed']:>8}{stats['ops_per_sec']:>9.2f}"
+              + ''.join(f"{value:>10.1f}" for value in cells))
+        for error, count in stats['errors'].items():
+            print(f"{'':<16}  {error}: {count}")
+
+    wait = report['pool_wait']
+    print(f"\npool wait: avg {wait['avg_ms']:.2f} ms, max {wait['max_ms']:.2f} ms over {wait['checkouts']} checkouts")
+    exhausted = sum(s['errors'].get('pool_exhausted', 0) for s in report['operations'].values())
+    print(f"pool exhausted: {exhausted}")
+    activity = report.get('activity') or {}
+    if activity:
+        print(f"connections: max {activity['max_connections']}, active max {activity['max_active']}")
+        print(f"lock waiters: max {activity['max_lock_waiters']}, avg {activity['avg_lock_waiters']} "
+              f"({activity['samples_with_lock_waits']}/{activity['samples']} samples)")
+    print(f"deadlocks: {report['deadlocks']}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Eşzamanlı koordinatör yük testi (test verisi sonunda silinir)")
+    parser.add_argument('--sessions', type=int, default=30, help="Eşzamanlı oturum (bölüm) sayısı")
+    parser.add_argument('--duration', type=float, default=60, help="Ölçüm süresi (saniye)")
+    parser.add_argument('--students', type=int, default=400, help="Bölüm başına öğrenci")
+    parser.add_argument('--courses', type=int, default=24, help="Bölüm başına ders")
+    parser.add_argument('--rooms', type=int, default=6, help="Bölüm başına derslik")
+    parser.add_argument('--courses-per-student', type=int, default=5, help="Öğrenci başına ders kaydı")
+    parser.add_argument('--import-batch', type=int, default=25, help="İçe aktarma başına öğrenci")
+    parser.add_argument('--think-ms', type=float, default=50, help="İşlemler arası ortalama bekleme (ms)")
+    parser.add_argument('--json', help="Sonuçları JSON dosyasına yaz")
+    args = parser.parse_args(argv)
+
+    # Model INFO logs on every save would drown the report
+    logging.basicConfig(level=logging.WARNING)
+
+    report = run(args.sessions, args.duration, args.students, args.courses, args.rooms,
+                 args.courses_per_student, args.import_batch, args.think_ms)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
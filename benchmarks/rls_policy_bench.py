@@ -0,0 +1,200 @@
+"""
+RLS politika maliyeti ölçümü
+
+Sentetik bir veri setinde (varsayılan 100k öğrenci) aynı sorguları üç kez
+çalıştırır: RLS olmadan (tablo sahibi), güncel politikalarla ve eski
+satır-başına EXISTS politikalarıyla. Her şey tek bir transaction içinde
+yapılır ve sonunda ROLLBACK edilir; veritabanında iz kalmaz.
+
+Gereksinimler: şemanın sahibi olan ve CREATEROLE yetkisi bulunan bir kullanıcı
+(.env). RLS süper kullanıcılar için uygulanmadığından ölçüm geçici,
+ayrıcalıksız bir role geçilerek yapılır.
+
+Örnek:
+    python benchmarks/rls_policy_bench.py --students 100000 --repeat 5 --json rls.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import psycopg2
+from models.database import DatabaseManager
+
+QUERIES = {
+    'ogrenciler_count': "SELECT COUNT(*) FROM ogrenciler",
+    'ogrenciler_page': "SELECT * FROM ogrenciler ORDER BY ogrenci_no LIMIT 500",
+    'dersler_count': "SELECT COUNT(*) FROM dersler",
+    'sinavlar_count': "SELECT COUNT(*) FROM sinavlar",
+}
+
+# Policies as they were before the rls_admin_mi()/rls_bolum_id() rewrite
+LEGACY_POLICIES = {
+    'ogrenciler': ('pol_ogrenciler_erisim', """
+        EXISTS (
+            SELECT 1 FROM users u
+            WHERE u.user_id = COALESCE(current_setting('app.current_user_id', TRUE)::INT, 0)
+            AND u.aktif = TRUE
+            AND (u.role = 'Admin' OR u.bolum_id = ogrenciler.bolum_id)
+        )"""),
+    'dersler': ('pol_dersler_erisim', """
+        EXISTS (
+            SELECT 1 FROM users u
+            WHERE u.user_id = COALESCE(current_setting('app.current_user_id', TRUE)::INT, 0)
+            AND u.aktif = TRUE
+            AND (u.role = 'Admin' OR u.bolum_id = dersler.bolum_id)
+        )"""),
+    'sinavlar': ('pol_sinavlar_erisim', """
+        EXISTS (
+            SELECT 1 FROM users u
+            JOIN sinav_programi sp ON sp.program_id = sinavlar.program_id
+            WHERE u.user_id = COALESCE(current_setting('app.current_user_id', TRUE)::INT, 0)
+            AND u.aktif = TRUE
+            AND (u.role = 'Admin' OR u.bolum_id = sp.bolum_id)
+        )"""),
+}
+
+
+def load_dataset(cursor, students: int, courses: int) -> Dict[str, int]:
+    """İki bölüm, bir koordinatör, öğrenciler, dersler ve sınavlar ekle"""
+    suffix = os.getpid()
+    cursor.execute(
+        "INSERT INTO bolumler (bolum_adi, bolum_kodu) VALUES (%s, %s), (%s, %s) RETURNING bolum_id",
+        (f"RLS Bench A {suffix}", f"RBA{suffix}", f"RLS Bench B {suffix}", f"RBB{suffix}")
+    )
+    bolum_a, bolum_b = [row[0] for row in cursor.fetchall()]
+
+    cursor.execute("""
+        INSERT INTO users (email, password_hash, role, bolum_id, ad_soyad)
+        VALUES (%s, 'x', 'Bölüm Koordinatörü', %s, 'RLS Bench')
+        RETURNING user_id
+    """, (f"rls.bench.{suffix}@example.invalid", bolum_a))
+    user_id = cursor.fetchone()[0]
+
+    cursor.execute("""
+        INSERT INTO ogrenciler (ogrenci_no, bolum_id, ad_soyad, sinif)
+        SELECT 'RB' || %s || '-' || g, CASE WHEN g %% 2 = 0 THEN %s ELSE %s END,
+               'Öğrenci ' || g, 1 + g %% 4
+        FROM generate_series(1, %s) g
+    """, (suffix, bolum_a, bolum_b, students))
+
+    cursor.execute("""
+        INSERT INTO dersler (bolum_id, ders_kodu, ders_adi, ogretim_elemani, sinif, ders_yapisi)
+        SELECT CASE WHEN g %% 2 = 0 THEN %s ELSE %s END, 'RB' || %s || '-' || g,
+               'Ders ' || g, 'Öğr. Gör.', 1 + g %% 4, 'Zorunlu'
+        FROM generate_series(1, %s) g
+    """, (bolum_a, bolum_b, suffix, courses))
+
+    cursor.execute("""
+        INSERT INTO sinav_programi (bolum_id, program_adi, sinav_tipi, baslangic_tarihi, bitis_tarihi)
+        SELECT b, 'RLS Bench ' || %s || '-' || b, 'Final', CURRENT_DATE, CURRENT_DATE + 30
+        FROM unnest(ARRAY[%s, %s]) b
+    """, (suffix, bolum_a, bolum_b))
+
+    cursor.execute("""
+        INSERT INTO sinavlar (program_id, ders_id, tarih, baslangic_saati, bitis_saati)
+        SELECT sp.program_id, d.ders_id,
+               CURRENT_DATE + (d.ders_id %% 30), TIME '09:00', TIME '10:00'
+        FROM dersler d
+        JOIN sinav_programi sp ON sp.bolum_id = d.bolum_id AND sp.program_adi LIKE 'RLS Bench ' || %s || '-%%'
+    """, (suffix,))
+
+    for table in ('ogrenciler', 'dersler', 'sinav_programi', 'sinavlar', 'users'):
+        cursor.execute(f"ANALYZE {table}")
+
+    return {'bolum_id': bolum_a, 'user_id': user_id}
+
+
+def measure(cursor, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Her sorgu için sunucu tarafı çalışma süresi (EXPLAIN ANALYZE), ms"""
+    results = {}
+    for name, query in QUERIES.items():
+        timings = []
+        for _ in range(repeat):
+            cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}")
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            timings.append(plan[0]['Execution Time'])
+        cursor.execute(query)
+        rows = cursor.rowcount if not query.lstrip().upper().startswith("SELECT COUNT") else cursor.fetchone()[0]
+        results[name] = {
+            'median_ms': round(statistics.median(timings), 3),
+            'min_ms': round(min(timings), 3),
+            'rows': rows
+        }
+    return results
+
+
+def run(students: int, courses: int, repeat: int) -> Dict:
+    conn = psycopg2.connect(**DatabaseManager._connection_params())
+    role = f"rls_bench_{os.getpid()}"
+    report = {'students': students, 'courses': courses, 'repeat': repeat}
+    try:
+        with conn.cursor() as cursor:
+            started = time.perf_counter()
+            ids = load_dataset(cursor, students, courses)
+            report['load_seconds'] = round(time.perf_counter() - started, 2)
+
+            cursor.execute(f"CREATE ROLE {role} NOLOGIN")
+            cursor.execute(f"GRANT USAGE ON SCHEMA public TO {role}")
+            cursor.execute(f"GRANT SELECT ON ALL TABLES IN SCHEMA public TO {role}")
+            cursor.execute("SELECT set_config('app.current_user_id', %s, TRUE)", (str(ids['user_id']),))
+
+            report['no_rls'] = measure(cursor, repeat)
+
+            cursor.execute(f"SET LOCAL ROLE {role}")
+            report['current_policies'] = measure(cursor, repeat)
+            cursor.execute("RESET ROLE")
+
+            for table, (policy, using) in LEGACY_POLICIES.items():
+                cursor.execute(f"DROP POLICY {policy} ON {table}")
+                cursor.execute(f"CREATE POLICY {policy} ON {table} FOR ALL USING ({using})")
+
+            cursor.execute(f"SET LOCAL ROLE {role}")
+            report['legacy_policies'] = measure(cursor, repeat)
+            cursor.execute("RESET ROLE")
+    finally:
+        # Dataset, role and policy swap are all discarded
+        conn.rollback()
+        conn.close()
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\nRLS policy overhead — {report['students']} students, {report['courses']} courses "
+          f"(median of {report['repeat']}, ms)\n")
+    print(f"{'query':<20}{'no RLS':>12}{'current':>12}{'legacy':>12}{'rows':>10}")
+    for name in QUERIES:
+        print(f"{name:<20}"
+              f"{report['no_rls'][name]['median_ms']:>12.2f}"
+              f"{report['current_policies'][name]['median_ms']:>12.2f}"
+              f"{report['legacy_policies'][name]['median_ms']:>12.2f}"
+              f"{report['current_policies'][name]['rows']:>10}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="RLS politika maliyeti ölçümü (ROLLBACK ile temizlenir)")
+    parser.add_argument('--students', type=int, default=100_000, help="Sentetik öğrenci sayısı")
+    parser.add_argument('--courses', type=int, default=2_000, help="Sentetik ders sayısı")
+    parser.add_argument('--repeat', type=int, default=5, help="Sorgu başına tekrar")
+    parser.add_argument('--json', help="Sonuçları JSON dosyasına yaz")
+    args = parser.parse_args(argv)
+
+    report = run(args.students, args.courses, args.repeat)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
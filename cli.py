@@ -0,0 +1,409 @@
+"""
+Kocaeli Üniversitesi Sınav Takvimi Sistemi
+Headless komut satırı arayüzü - Qt/GUI olmadan toplu sınav planlama
+
+Örnek:
+    python cli.py plan --bolum-id 1 --params parametreler.json \\
+        --save --seating --excel program.xlsx --json program.json
+
+    python cli.py snapshot --bolum-id 1 --output bmu.sqlite --params parametreler.json
+    python cli.py plan --snapshot bmu.sqlite --seating --json program.json
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime, date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+logger = logging.getLogger("cli")
+
+# Exit codes
+EXIT_OK = 0
+EXIT_PLAN_FAILED = 1
+EXIT_USAGE = 2
+
+
+def setup_logging(verbose: bool = False):
+    """Log to stderr so that stdout only carries the metrics JSON"""
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+
+
+def _parse_datetime(value) -> datetime:
+    """Accept 'YYYY-MM-DD' or full ISO datetime strings"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(str(value))
+
+
+def normalize_params(params: Dict, bolum_id: int) -> Dict:
+    """
+    Convert JSON-friendly planning parameters to SinavPlanlama types
+
+    Uses the same keys as SinavPlanlama.plan_exam_schedule.
+    Dates are ISO strings and ders_sinavlari_suresi keys are course IDs.
+    """
+    params = dict(params)
+    params['bolum_id'] = bolum_id
+    params.setdefault('sinav_tipi', 'Final')
+
+    for key in ('baslangic_tarih', 'bitis_tarih'):
+        if key not in params:
+            raise ValueError(f"Parametrelerde '{key}' eksik")
+        params[key] = _parse_datetime(params[key])
+
+    # JSON object keys are always strings
+    params['ders_sinavlari_suresi'] = {
+        int(ders_id): int(sure)
+        for ders_id, sure in (params.get('ders_sinavlari_suresi') or {}).items()
+    }
+    if params.get('selected_ders_ids'):
+        params['selected_ders_ids'] = [int(d) for d in params['selected_ders_ids']]
+
+    return params
+
+
+def load_params(path: str, bolum_id: int) -> Dict:
+    """Load scheduling parameters from a JSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return normalize_params(json.load(f), bolum_id)
+
+
+def _json_default(value):
+    """JSON serializer for datetime/date/time values"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def write_schedule_json(schedule: List[Dict], file_path: str):
+    """Write schedule entries as JSON"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(schedule, f, ensure_ascii=False, indent=2, default=_json_default)
+
+
+def export_schedule(schedule: List[Dict], params: Dict, bolum_adi: str,
+                    excel_path: Optional[str], pdf_path: Optional[str]) -> Dict:
+    """Export schedule to Excel/PDF with the same layout as the GUI"""
+    from utils.export_utils import ExportUtils
+
+    data = {
+        'type': 'sinav_takvimi',
+        'title': 'Sınav Programı',
+        'bolum_adi': bolum_adi,
+        'sinav_tipi': params.get('sinav_tipi', 'SINAV'),
+        'data': schedule,
+        'bolum_id': params['bolum_id'],
+        'options': {}
+    }
+
+    results = {}
+    if excel_path:
+        results['excel'] = ExportUtils.export_to_excel(data, excel_path)
+    if pdf_path:
+        results['pdf'] = ExportUtils.export_to_pdf(data, pdf_path)
+    return results
+
+
+def save_schedule(schedule: List[Dict]) -> Dict:
+    """Persist schedule through SinavController (same path as the GUI)"""
+    from models.database import db
+    from models.sinav_model import SinavModel
+    from models.ders_model import DersModel
+    from models.derslik_model import DerslikModel
+    from controllers.sinav_controller import SinavController
+
+    controller = SinavController(SinavModel(db), DersModel(db), DerslikModel(db))
+    return controller.save_exam_schedule(schedule)
+
+
+def generate_seating(program_id: int) -> Dict:
+    """Generate and save seating plans for every exam of a saved program"""
+    from models.database import db
+    from models.sinav_model import SinavModel
+    from models.oturma_model import OturmaModel
+    from controllers.oturma_controller import OturmaController
+    from algorithms.oturma_planlama import OturmaPlanlama
+
+    sinav_model = SinavModel(db)
+    controller = OturmaController(OturmaModel(db), sinav_model)
+    planlama = OturmaPlanlama()
+
+    sinavlar = sinav_model.get_sinavlar_by_program(program_id)
+    placed = 0
+    unplaced = 0
+    failed = []
+
+    for sinav in sinavlar:
+        result = planlama.generate_seating_plan(sinav['sinav_id'])
+        if not result['success']:
+            failed.append({'sinav_id': sinav['sinav_id'], 'message': result['message']})
+            continue
+
+        save_result = controller.save_seating_plan(sinav['sinav_id'], result['plan'])
+        if not save_result['success']:
+            failed.append({'sinav_id': sinav['sinav_id'], 'message': save_result['message']})
+            continue
+
+        placed += result['placed_count']
+        unplaced += result['unplaced_count']
+
+    return {
+        'exams': len(sinavlar),
+        'placed_students': placed,
+        'unplaced_students': unplaced,
+        'failed': failed
+    }
+
+
+def generate_seating_offline(snapshot, schedule: List[Dict]) -> Dict:
+    """Generate seating plans from a snapshot without touching the database"""
+    from algorithms.oturma_planlama import OturmaPlanlama
+
+    planlama = OturmaPlanlama(snapshot=snapshot)
+    sinavlar = snapshot.add_schedule(schedule)
+    placed = 0
+    unplaced = 0
+    failed = []
+
+    for sinav in sinavlar:
+        result = planlama.generate_seating_plan(sinav['sinav_id'])
+        if not result['success']:
+            failed.append({'ders_id': sinav['ders_id'], 'message': result['message']})
+            continue
+        placed += result['placed_count']
+        unplaced += result['unplaced_count']
+
+    return {
+        'exams': len(sinavlar),
+        'placed_students': placed,
+        'unplaced_students': unplaced,
+        'failed': failed
+    }
+
+
+def cmd_plan(args) -> int:
+    """Run the scheduler (and optionally save/seat/export) and print metrics"""
+    if args.seating and not args.save and not args.snapshot:
+        logger.error("--seating requires --save or --snapshot (seating plans need exams)")
+        return EXIT_USAGE
+
+    snapshot = None
+    if args.snapshot:
+        from models.snapshot import DepartmentSnapshot
+        try:
+            snapshot = DepartmentSnapshot.load(args.snapshot)
+        except (OSError, ValueError) as e:
+            logger.error(f"Snapshot okunamadı: {e}")
+            return EXIT_USAGE
+
+    bolum_id = args.bolum_id if args.bolum_id is not None else (snapshot.bolum_id if snapshot else None)
+    if bolum_id is None:
+        logger.error("--bolum-id or --snapshot is required")
+        return EXIT_USAGE
+
+    try:
+        if args.params:
+            params = load_params(args.params, bolum_id)
+        elif snapshot is not None and snapshot.params:
+            params = normalize_params(snapshot.params, bolum_id)
+        else:
+            logger.error("--params is required (snapshot has no stored parameters)")
+            return EXIT_USAGE
+    except (OSError, ValueError) as e:
+        logger.error(f"Parametre dosyası okunamadı: {e}")
+        return EXIT_USAGE
+
+    if args.max_attempts is not None:
+        params['max_attempts'] = args.max_attempts
+
+    from algorithms.sinav_planlama import SinavPlanlama
+
+    metrics = {'bolum_id': bolum_id, 'timings': {}}
+    if snapshot is not None:
+        metrics['snapshot'] = args.snapshot
+
+    started = time.perf_counter()
+    result = SinavPlanlama(snapshot=snapshot).plan_exam_schedule(params)
+    metrics['timings']['plan_seconds'] = round(time.perf_counter() - started, 3)
+
+    schedule = result.get('schedule', [])
+    metrics['success'] = bool(result.get('success'))
+    metrics['message'] = result.get('message', '')
+    metrics['stats'] = result.get('stats', {})
+    metrics['warnings'] = result.get('warnings', [])
+    if result.get('validation'):
+        validation = result['validation']
+        metrics['validation'] = {k: validation[k] for k in ('success', 'message', 'conflicted_students', 'back_to_back', 'load', 'stats')}
+    metrics['schedule_entries'] = len(schedule)
+    if result.get('unassigned_courses'):
+        metrics['unassigned_courses'] = result['unassigned_courses']
+
+    pareto_front = result.get('pareto_front', [])
+    metrics['pareto_front'] = [alt['objectives'] for alt in pareto_front]
+
+    if args.json and schedule:
+        write_schedule_json(schedule, args.json)
+        metrics['json'] = args.json
+
+    if args.pareto_json and pareto_front:
+        with open(args.pareto_json, 'w', encoding='utf-8') as f:
+            json.dump(pareto_front, f, ensure_ascii=False, indent=2, default=_json_default)
+        metrics['pareto_json'] = args.pareto_json
+
+    if metrics['success'] and (args.excel or args.pdf):
+        if snapshot is not None:
+            bolum_adi = snapshot.meta.get('bolum_adi') or "BÖLÜM"
+        else:
+            from models.database import db
+            from models.bolum_model import BolumModel
+
+            bolum_adi = BolumModel(db).get_bolum_adi(bolum_id)
+
+        started = time.perf_counter()
+        metrics['exports'] = export_schedule(schedule, params, bolum_adi, args.excel, args.pdf)
+        metrics['timings']['export_seconds'] = round(time.perf_counter() - started, 3)
+
+    if metrics['success'] and args.save:
+        started = time.perf_counter()
+        save_result = save_schedule(schedule)
+        metrics['timings']['save_seconds'] = round(time.perf_counter() - started, 3)
+        metrics['save'] = {k: v for k, v in save_result.items() if k != 'message'}
+        metrics['save']['message'] = save_result.get('message', '')
+        metrics['success'] = bool(save_result.get('success'))
+
+        if metrics['success'] and args.seating:
+            started = time.perf_counter()
+            metrics['seating'] = generate_seating(save_result['program_id'])
+            metrics['timings']['seating_seconds'] = round(time.perf_counter() - started, 3)
+
+    elif metrics['success'] and args.seating and snapshot is not None:
+        started = time.perf_counter()
+        metrics['seating'] = generate_seating_offline(snapshot, schedule)
+        metrics['timings']['seating_seconds'] = round(time.perf_counter() - started, 3)
+
+    json.dump(metrics, sys.stdout, ensure_ascii=False, indent=2, default=_json_default)
+    sys.stdout.write("\n")
+
+    return EXIT_OK if metrics['success'] else EXIT_PLAN_FAILED
+
+
+def cmd_snapshot(args) -> int:
+    """Export a department's scheduling dataset to a local snapshot file"""
+    from models.database import db
+    from models.snapshot import DepartmentSnapshot
+
+    params = None
+    if args.params:
+        with open(args.params, 'r', encoding='utf-8') as f:
+            params = json.load(f)
+
+    started = time.perf_counter()
+    counts = DepartmentSnapshot.export_from_db(
+        db, args.bolum_id, args.output, program_id=args.program_id, params=params
+    )
+    metrics = {
+        'success': True,
+        'snapshot': args.output,
+        'counts': counts,
+        'timings': {'export_seconds': round(time.perf_counter() - started, 3)}
+    }
+    json.dump(metrics, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return EXIT_OK
+
+
+def cmd_audit(args) -> int:
+    """Run the conflict audit on a stored program and print the report"""
+    from models.database import db
+    from models.sinav_model import SinavModel
+    from models.ders_model import DersModel
+    from models.derslik_model import DerslikModel
+    from controllers.sinav_controller import SinavController
+
+    controller = SinavController(SinavModel(db), DersModel(db), DerslikModel(db))
+    report = controller.audit_program(args.program_id, daily_limit=args.daily_limit, ara_suresi=args.ara_suresi)
+    if args.ogrenci_yukleri:
+        report['ogrenci_yukleri'] = controller.get_ogrenci_yukleri(
+            args.program_id, daily_limit=args.daily_limit, ara_suresi=args.ara_suresi
+        )
+
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2, default=_json_default)
+    sys.stdout.write("\n")
+    return EXIT_OK if report.get('success') else EXIT_PLAN_FAILED
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="KOÜ Sınav Takvimi - headless toplu planlama aracı"
+    )
+    parser.add_argument('-v', '--verbose', action='store_true', help="INFO seviyesinde log yaz")
+    parser.add_argument('--db-stats', help="Sorgu istatistiklerini (gecikme, çağrı yeri, N+1) JSON dosyasına yaz")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    plan = subparsers.add_parser('plan', help="Sınav programı oluştur")
+    plan.add_argument('--bolum-id', type=int, help="Bölüm ID (snapshot ile verilirse opsiyonel)")
+    plan.add_argument('--params', help="Planlama parametreleri (JSON)")
+    plan.add_argument('--snapshot', help="PostgreSQL yerine yerel snapshot dosyasından oku")
+    plan.add_argument('--max-attempts', type=int, help="Optimizasyon deneme sayısı")
+    plan.add_argument('--save', action='store_true', help="Programı veritabanına kaydet")
+    plan.add_argument('--seating', action='store_true', help="Kaydedilen sınavlar için oturma planı oluştur")
+    plan.add_argument('--json', help="Program çıktısı (JSON)")
+    plan.add_argument('--pareto-json', help="Birbirine üstün olmayan tüm alternatif programlar (JSON)")
+    plan.add_argument('--excel', help="Program çıktısı (Excel)")
+    plan.add_argument('--pdf', help="Program çıktısı (PDF)")
+    plan.set_defaults(func=cmd_plan)
+
+    snapshot = subparsers.add_parser('snapshot', help="Bölüm verisini yerel snapshot dosyasına aktar")
+    snapshot.add_argument('--bolum-id', type=int, required=True, help="Bölüm ID")
+    snapshot.add_argument('--output', required=True, help="Hedef snapshot dosyası (.sqlite)")
+    snapshot.add_argument('--program-id', type=int, help="Kayıtlı bir programın sınavlarını da ekle")
+    snapshot.add_argument('--params', help="Snapshot içine kaydedilecek planlama parametreleri (JSON)")
+    snapshot.set_defaults(func=cmd_snapshot)
+
+    audit = subparsers.add_parser('audit', help="Kayıtlı bir programı çakışmalara karşı denetle")
+    audit.add_argument('--program-id', type=int, required=True, help="Program ID")
+    audit.add_argument('--daily-limit', type=int, default=0, help="Öğrenci başına günlük sınav limiti (0 = kontrol yok)")
+    audit.add_argument('--ara-suresi', type=int, default=15, help="Arka arkaya sayılacak en fazla ara (dakika)")
+    audit.add_argument('--ogrenci-yukleri', action='store_true',
+                       help="Sorunlu öğrencilerin çakışma/yük istatistiklerini de ekle (veritabanında hesaplanır)")
+    audit.set_defaults(func=cmd_audit)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    setup_logging(args.verbose)
+
+    try:
+        return args.func(args)
+    except Exception as e:
+        logger.error(f"❌ Kritik hata: {e}", exc_info=True)
+        return EXIT_PLAN_FAILED
+    finally:
+        if args.db_stats and 'models.database' in sys.modules:
+            from models.database import db
+
+            with open(args.db_stats, 'w', encoding='utf-8') as f:
+                json.dump(db.get_query_stats(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,13 @@ class DatabaseConfig:
     # Connection timeout
     CONNECT_TIMEOUT = 10
     
+    # Optional read replica (reports, exports, dashboard counts)
+    REPLICA_HOST = os.getenv('DB_REPLICA_HOST', '')
+    REPLICA_PORT = int(os.getenv('DB_REPLICA_PORT', PORT))
+    REPLICA_DATABASE = os.getenv('DB_REPLICA_NAME', DATABASE)
+    REPLICA_USER = os.getenv('DB_REPLICA_USER', USER)
+    REPLICA_PASSWORD = os.getenv('DB_REPLICA_PASSWORD', PASSWORD)
+    
     @classmethod
     def get_connection_string(cls) -> str:
         """Get database connection string"""
@@ -45,6 +52,11 @@ class DatabaseConfig:
             'connect_timeout': cls.CONNECT_TIMEOUT
         }
     
+    @classmethod
+    def has_replica(cls) -> bool:
+        """Check if a read replica is configured"""
+        return bool(cls.REPLICA_HOST)
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate configuration"""
@@ -4,7 +4,8 @@ Business logic for course management
 """
 
 import logging
-from typing import Dict, List
+import re
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -12,34 +13,40 @@ logger = logging.getLogger(__name__)
 class DersController:
     """Course business logic controller"""
     
+    # Rows committed per transaction by bulk_import_courses
+    IMPORT_CHUNK_SIZE = 500
+    
     def __init__(self, ders_model):
         self.ders_model = ders_model
     
+    @staticmethod
+    def _validation_error(ders_data: Dict) -> Optional[str]:
+        """Field and code-format check shared by single and bulk inserts (normalizes ders_kodu)"""
+        # Validate required fields
+        if not ders_data.get('ders_kodu'):
+            return "Ders kodu gereklidir"
+        
+        if not ders_data.get('ders_adi'):
+            return "Ders adı gereklidir"
+        
+        if not ders_data.get('ogretim_elemani'):
+            return "Öğretim elemanı gereklidir"
+        
+        # Validate course code format (ABC123)
+        ders_kodu = str(ders_data['ders_kodu']).strip().upper()
+        if not re.match(r'^[A-Z]{3}\d{3}$', ders_kodu):
+            return f"Geçersiz ders kodu formatı: '{ders_kodu}' (Beklenen: ABC123)"
+        
+        # Normalize the code
+        ders_data['ders_kodu'] = ders_kodu
+        return None
+    
     def create_ders(self, ders_data: Dict) -> Dict:
         """Create new course with detailed validation"""
         try:
-            import re
-            
-            # Validate required fields
-            if not ders_data.get('ders_kodu'):
-                return {'success': False, 'message': "Ders kodu gereklidir"}
-            
-            if not ders_data.get('ders_adi'):
-                return {'success': False, 'message': "Ders adı gereklidir"}
-            
-            if not ders_data.get('ogretim_elemani'):
-                return {'success': False, 'message': "Öğretim elemanı gereklidir"}
-            
-            # Validate course code format (ABC123)
-            ders_kodu = str(ders_data['ders_kodu']).strip().upper()
-            if not re.match(r'^[A-Z]{3}\d{3}$', ders_kodu):
-                return {
-                    'success': False,
-                    'message': f"Geçersiz ders kodu formatı: '{ders_kodu}' (Beklenen: ABC123)"
-                }
-            
-            # Normalize the code
-            ders_data['ders_kodu'] = ders_kodu
+            error = self._validation_error(ders_data)
+            if error:
+                return {'success': False, 'message': error}
             
             # Check for duplicate
             existing = self.ders_model.get_ders_by_kod(
@@ -94,23 +101,70 @@ class DersController:
             logger.error(f"Error deleting course: {e}")
             return {'success': False, 'message': str(e)}
     
+    def delete_dersler(self, ders_ids: List[int]) -> Dict:
+        """Delete many courses in one statement"""
+        try:
+            result = self.ders_model.delete_dersler(ders_ids)
+            
+            return {
+                'success': True,
+                'message': f"{result['ders_sayisi']} ders silindi!",
+                **result
+            }
+            
+        except Exception as e:
+            logger.error(f"Error deleting courses: {e}")
+            return {'success': False, 'message': str(e)}
+    
     def bulk_import_courses(self, courses: List[Dict], bolum_id: int) -> Dict:
-        """Bulk import courses"""
+        """
+        Bulk import courses
+
+        Every row is validated first (fields, code format, duplicates in the
+        file and in the department); valid rows are then inserted with one
+        transaction per IMPORT_CHUNK_SIZE rows. A chunk that still fails is
+        retried row by row so only the offending rows are reported.
+        """
         try:
-            success_count = 0
-            error_count = 0
             errors = []
+            valid = []
+            seen = set()
             
             for course in courses:
                 course['bolum_id'] = bolum_id
-                result = self.create_ders(course)
-                
-                if result['success']:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    errors.append(f"{course['ders_kodu']}: {result['message']}")
+                error = self._validation_error(course)
+                if error:
+                    errors.append(f"{course.get('ders_kodu')}: {error}")
+                    continue
+                valid.append(course)
+            
+            existing = self.ders_model.get_ders_ids_by_kod(bolum_id, [c['ders_kodu'] for c in valid])
+            unique = []
+            for course in valid:
+                if course['ders_kodu'] in existing or course['ders_kodu'] in seen:
+                    errors.append(f"{course['ders_kodu']}: Bu ders kodu zaten kayıtlı")
+                    continue
+                seen.add(course['ders_kodu'])
+                unique.append(course)
             
+            success_count = 0
+            for start in range(0, len(unique), self.IMPORT_CHUNK_SIZE):
+                chunk = unique[start:start + self.IMPORT_CHUNK_SIZE]
+                try:
+                    with self.ders_model.db.transaction():
+                        for course in chunk:
+                            self.ders_model.insert_ders(course)
+                    success_count += len(chunk)
+                except Exception as e:
+                    logger.warning(f"Import chunk of {len(chunk)} courses failed, retrying row by row: {e}")
+                    for course in chunk:
+                        result = self.create_ders(course)
+                        if result['success']:
+                            success_count += 1
+                        else:
+                            errors.append(f"{course['ders_kodu']}: {result['message']}")
+            
+            error_count = len(errors)
             return {
                 'success': True,
                 'message': f"{success_count} ders başarıyla eklendi, {error_count} hata.",
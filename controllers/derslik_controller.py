@@ -77,17 +77,19 @@ class DerslikController:
     def delete_derslik(self, derslik_id: int) -> Dict:
         """Delete classroom (soft delete)"""
         try:
-            # Check if classroom is in use
-            usage = self.derslik_model.check_derslik_kullanimi(derslik_id)
-            
-            if usage['sinav_sayisi'] > 0:
-                return {
-                    'success': False,
-                    'message': f"⚠️ Bu derslik {usage['sinav_sayisi']} sınavda kullanılıyor. Önce sınavları silin."
-                }
-            
-            # Delete classroom
-            success = self.derslik_model.delete_derslik(derslik_id)
+            # Usage check and soft delete share one connection and commit
+            with self.derslik_model.db.transaction():
+                # Check if classroom is in use
+                usage = self.derslik_model.check_derslik_kullanimi(derslik_id)
+                
+                if usage['sinav_sayisi'] > 0:
+                    return {
+                        'success': False,
+                        'message': f"⚠️ Bu derslik {usage['sinav_sayisi']} sınavda kullanılıyor. Önce sınavları silin."
+                    }
+                
+                # Delete classroom
+                success = self.derslik_model.delete_derslik(derslik_id)
             
             if success:
                 return {
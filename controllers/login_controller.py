@@ -59,6 +59,9 @@ class LoginController:
             # Successful login
             logger.info(f"Successful login for user: {email}")
             
+            # RLS: applied lazily to each pooled connection on checkout
+            db.set_user_context(user['user_id'])
+            
             # Return user data (without password)
             user_data = {
                 'user_id': user['user_id'],
@@ -120,6 +123,7 @@ class LoginController:
         """Logout user"""
         try:
             # Clear any session data if needed
+            db.set_user_context(None)
             logger.info(f"User logged out: {user_id}")
             
             return {
@@ -4,7 +4,7 @@ Business logic for student management
 """
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 from models.database import db
 
 logger = logging.getLogger(__name__)
@@ -13,19 +13,29 @@ logger = logging.getLogger(__name__)
 class OgrenciController:
     """Student business logic controller"""
     
+    # Rows committed per transaction by bulk_import_students
+    IMPORT_CHUNK_SIZE = 500
+    
     def __init__(self, ogrenci_model):
         self.ogrenci_model = ogrenci_model
         self.db = db
     
+    @staticmethod
+    def _validation_error(ogrenci_data: Dict) -> Optional[str]:
+        """Required-field check shared by single and bulk inserts"""
+        if not ogrenci_data.get('ogrenci_no'):
+            return "Öğrenci numarası gereklidir!"
+        if not ogrenci_data.get('ad_soyad'):
+            return "Ad soyad gereklidir!"
+        return None
+    
     def create_ogrenci(self, ogrenci_data: Dict) -> Dict:
         """Create new student"""
         try:
             # Validate data
-            if not ogrenci_data.get('ogrenci_no'):
-                return {'success': False, 'message': "Öğrenci numarası gereklidir!"}
-            
-            if not ogrenci_data.get('ad_soyad'):
-                return {'success': False, 'message': "Ad soyad gereklidir!"}
+            error = self._validation_error(ogrenci_data)
+            if error:
+                return {'success': False, 'message': error}
             
             # Check for duplicate
             existing = self.ogrenci_model.get_ogrenci_by_no(ogrenci_data['ogrenci_no'])
@@ -36,13 +46,15 @@ class OgrenciController:
                     'message': f"Öğrenci no '{ogrenci_data['ogrenci_no']}' zaten mevcut!"
                 }
             
-            # Create student
-            ogrenci_id = self.ogrenci_model.insert_ogrenci(ogrenci_data)
-            
-            # Register courses if provided
-            dersler = ogrenci_data.get('dersler', [])
-            if dersler and ogrenci_data.get('bolum_id'):
-                self._register_courses(ogrenci_data['ogrenci_no'], dersler, ogrenci_data['bolum_id'])
+            # Student and course registrations are committed together
+            with self.db.transaction():
+                # Create student
+                ogrenci_id = self.ogrenci_model.insert_ogrenci(ogrenci_data)
+                
+                # Register courses if provided
+                dersler = ogrenci_data.get('dersler', [])
+                if dersler and ogrenci_data.get('bolum_id'):
+                    self._register_courses(ogrenci_data['ogrenci_no'], dersler, ogrenci_data['bolum_id'])
             
             return {
                 'success': True,
@@ -55,28 +67,19 @@ class OgrenciController:
             return {'success': False, 'message': str(e)}
     
     def _register_courses(self, ogrenci_no: str, ders_kodlari: List[str], bolum_id: int):
-        """Register student to courses"""
-        try:
-            from models.ders_model import DersModel
-            ders_model = DersModel(db)
-            
-            for ders_kodu in ders_kodlari:
-                # Find course by code
-                ders = ders_model.get_ders_by_kod(bolum_id, ders_kodu.strip())
-                if ders:
-                    # Insert course registration
-                    query = """
-                        INSERT INTO ders_kayitlari (ogrenci_no, ders_id)
-                        VALUES (%s, %s)
-                        ON CONFLICT (ogrenci_no, ders_id) DO NOTHING
-                    """
-                    self.db.execute_query(query, (ogrenci_no, ders['ders_id']), fetch=False)
-                    logger.info(f"✅ {ogrenci_no} -> {ders_kodu} kayıt edildi")
-                else:
-                    logger.warning(f"Ders bulunamadı: {ders_kodu}")
-                    
-        except Exception as e:
-            logger.error(f"Error registering courses: {e}")
+        """Register student to courses (one lookup, one INSERT)"""
+        from models.ders_model import DersModel
+        ders_model = DersModel(db)
+        
+        kodlar = [kod.strip() for kod in ders_kodlari if kod and kod.strip()]
+        ders_ids = ders_model.get_ders_ids_by_kod(bolum_id, kodlar)
+        
+        for ders_kodu in kodlar:
+            if ders_kodu not in ders_ids:
+                logger.warning(f"Ders bulunamadı: {ders_kodu}")
+        
+        eklenen = self.ogrenci_model.insert_kayitlar(ogrenci_no, list(ders_ids.values()))
+        logger.info(f"✅ {ogrenci_no} -> {eklenen} derse kayıt edildi")
     
     def update_ogrenci(self, ogrenci_no: str, ogrenci_data: Dict) -> Dict:
         """Update student"""
@@ -106,23 +109,83 @@ class OgrenciController:
             logger.error(f"Error deleting student: {e}")
             return {'success': False, 'message': str(e)}
     
+    def delete_ogrenciler(self, ogrenci_nolari: List[str]) -> Dict:
+        """Delete many students in one statement"""
+        try:
+            result = self.ogrenci_model.delete_ogrenciler(ogrenci_nolari)
+            
+            return {
+                'success': True,
+                'message': f"{result['ogrenci_sayisi']} öğrenci silindi!",
+                **result
+            }
+            
+        except Exception as e:
+            logger.error(f"Error deleting students: {e}")
+            return {'success': False, 'message': str(e)}
+    
     def bulk_import_students(self, students: List[Dict], bolum_id: int) -> Dict:
-        """Bulk import students"""
+        """
+        Bulk import students
+
+        Every row is validated first (required fields, duplicates in the file
+        and in the database); valid rows are then inserted with one
+        transaction per IMPORT_CHUNK_SIZE rows. A chunk that still fails (e.g.
+        a student added concurrently) is retried row by row so only the
+        offending rows are reported.
+        """
         try:
-            success_count = 0
-            error_count = 0
             errors = []
+            valid = []
+            seen = set()
+            
+            nolar = [s['ogrenci_no'] for s in students if s.get('ogrenci_no')]
+            existing = self.ogrenci_model.get_mevcut_ogrenci_nolari(nolar)
             
             for student in students:
                 student['bolum_id'] = bolum_id
-                result = self.create_ogrenci(student)
-                
-                if result['success']:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    errors.append(f"{student['ogrenci_no']}: {result['message']}")
+                error = self._validation_error(student)
+                if not error and (student['ogrenci_no'] in existing or student['ogrenci_no'] in seen):
+                    error = f"Öğrenci no '{student['ogrenci_no']}' zaten mevcut!"
+                if error:
+                    errors.append(f"{student.get('ogrenci_no')}: {error}")
+                    continue
+                seen.add(student['ogrenci_no'])
+                valid.append(student)
+            
+            # Course codes of all rows resolved in one query
+            from models.ders_model import DersModel
+            kodlar = sorted({
+                kod.strip() for student in valid
+                for kod in student.get('dersler', []) if kod and kod.strip()
+            })
+            ders_ids = DersModel(db).get_ders_ids_by_kod(bolum_id, kodlar)
+            missing = [kod for kod in kodlar if kod not in ders_ids]
+            if missing:
+                logger.warning(f"Ders bulunamadı: {', '.join(missing)}")
+            
+            success_count = 0
+            for start in range(0, len(valid), self.IMPORT_CHUNK_SIZE):
+                chunk = valid[start:start + self.IMPORT_CHUNK_SIZE]
+                try:
+                    with self.db.transaction():
+                        for student in chunk:
+                            self.ogrenci_model.insert_ogrenci(student)
+                            self.ogrenci_model.insert_kayitlar(student['ogrenci_no'], [
+                                ders_ids[kod.strip()] for kod in student.get('dersler', [])
+                                if kod and kod.strip() in ders_ids
+                            ])
+                    success_count += len(chunk)
+                except Exception as e:
+                    logger.warning(f"Import chunk of {len(chunk)} students failed, retrying row by row: {e}")
+                    for student in chunk:
+                        result = self.create_ogrenci(student)
+                        if result['success']:
+                            success_count += 1
+                        else:
+                            errors.append(f"{student['ogrenci_no']}: {result['message']}")
             
+            error_count = len(errors)
             return {
                 'success': True,
                 'message': f"{success_count} öğrenci başarıyla eklendi, {error_count} hata.",
@@ -6,6 +6,8 @@ Business logic for seating plan management
 import logging
 from typing import Dict, List
 
+from models.database import constraint_violation_message
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,35 +24,23 @@ class OturmaController:
             if not plan:
                 return {'success': False, 'message': "Boş plan kaydedilemez!"}
             
-            # Delete existing plan if any
-            self.oturma_model.delete_by_sinav(sinav_id)
-            
-            # Insert new plan
-            success_count = 0
-            error_count = 0
-            
-            for oturma in plan:
-                try:
-                    oturma_data = {
-                        'sinav_id': sinav_id,
-                        'ogrenci_no': oturma['ogrenci_no'],
-                        'derslik_id': oturma['derslik_id'],
-                        'satir': oturma['satir'],
-                        'sutun': oturma['sutun']
-                    }
-                    
-                    self.oturma_model.insert_oturma(oturma_data)
-                    success_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error saving seating: {e}")
-                    error_count += 1
+            # Replace existing plan atomically (delete + one multi-row insert)
+            try:
+                success_count = self.oturma_model.replace_plan_bulk(sinav_id, plan)
+            except Exception as e:
+                logger.error(f"Error saving seating plan in bulk: {e}")
+                return {
+                    'success': False,
+                    'message': f"Oturma planı kaydedilemedi, mevcut plan korundu: {constraint_violation_message(e) or e}",
+                    'success_count': 0,
+                    'error_count': len(plan)
+                }
             
             return {
                 'success': True,
-                'message': f"✅ {success_count} öğrenci oturma planına eklendi! (Hata: {error_count})",
+                'message': f"✅ {success_count} öğrenci oturma planına eklendi!",
                 'success_count': success_count,
-                'error_count': error_count
+                'error_count': 0
             }
             
         except Exception as e:
@@ -7,6 +7,9 @@ import logging
 from typing import Dict, List
 from datetime import datetime, timedelta
 
+from algorithms.cakisma_denetimi import CakismaDenetimi
+from models.database import constraint_violation_message
+
 
 logger = logging.getLogger(__name__)
 
@@ -39,12 +42,24 @@ class SinavController:
             logger.error(f"Error creating exam program: {e}")
             return {'success': False, 'message': str(e)}
     
-    def save_exam_schedule(self, schedule: List[Dict]) -> Dict:
-        """Save exam schedule to database"""
+    def save_exam_schedule(self, schedule: List[Dict], strict: bool = False) -> Dict:
+        """Save exam schedule to database (strict=True refuses schedules with conflicts)"""
         try:
             if not schedule:
                 return {'success': False, 'message': "Boş program kaydedilemez!"}
             
+            # Audit the whole schedule before writing anything
+            report = self.audit_schedule(schedule)
+            if not report['success']:
+                logger.warning(f"⚠️ Pre-save audit: {report['message']}")
+                if strict:
+                    return {
+                        'success': False,
+                        'message': report['message'],
+                        'details': "\n".join(report['errors']),
+                        'validation': report
+                    }
+            
             # DEBUG: Check for duplicate courses in schedule
             from collections import Counter
             ders_ids = [exam.get('ders_id') for exam in schedule]
@@ -62,7 +77,7 @@ class SinavController:
                     else:
                         logger.info(f"✅ OK: ders_id {ders_id} appears {count} times but all at same time (multi-classroom)")
             
-            # First, create a program
+            # Program row is created together with its exams (see save_program_bulk)
             # Find earliest and latest dates in schedule
             all_dates = [exam.get('tarih_saat') for exam in schedule]
             all_dates = [d if isinstance(d, datetime) else datetime.fromisoformat(d) for d in all_dates]
@@ -78,13 +93,6 @@ class SinavController:
                 'aktif': True
             }
             
-            program_result = self.create_exam_program(program_data)
-            
-            if not program_result['success']:
-                return program_result
-            
-            program_id = program_result['program_id']
-            
             # Group exams by (ders_id, tarih_saat) - same course at same time uses multiple classrooms
             from collections import defaultdict
             exam_groups = defaultdict(list)
@@ -95,98 +103,155 @@ class SinavController:
             
             logger.info(f"📊 Schedule stats: {len(schedule)} total exams → {len(exam_groups)} unique course-time combinations")
             
-            # Insert each unique exam (one record per course per time slot)
-            success_count = 0
-            error_count = 0
-            
+            # Build one row per unique exam; refuse the whole program on invalid data
+            exams_to_save = []
+            invalid = []
             for (ders_id, tarih_saat), exams in exam_groups.items():
-                try:
-                    sure = exams[0].get('sure', 120)
-                    
-                    # Calculate end time
-                    if isinstance(tarih_saat, str):
-                        tarih_saat = datetime.fromisoformat(tarih_saat)
-                    
-                    bitis_saat = tarih_saat + timedelta(minutes=sure)
-                    
-                    # Validate required fields
-                    if not ders_id or not isinstance(ders_id, int):
-                        logger.error(f"Invalid ders_id: {ders_id}")
-                        error_count += 1
-                        continue
-                    
-                    exam_data = {
-                        'program_id': program_id,
-                        'ders_id': ders_id,
-                        'tarih': tarih_saat.date(),
-                        'baslangic_saati': tarih_saat.time(),
-                        'bitis_saati': bitis_saat.time()
-                    }
-                    
-                    # Collect classrooms for this time slot
-                    derslik_ids = []
-                    for exam in exams:
-                        derslik_id = exam.get('derslik_id')
-                        if derslik_id and isinstance(derslik_id, int):
-                            derslik_ids.append(derslik_id)
-                        else:
-                            logger.warning(f"Invalid derslik_id for exam: {derslik_id}")
-
-                    # Insert exam and classrooms atomically
-                    sinav_id = self.sinav_model.insert_exam_with_classrooms(exam_data, derslik_ids)
-                    
-                    success_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error saving exam for ders_id {ders_id}: {e}", exc_info=True)
-                    error_count += 1
-            
-            success = error_count == 0 and success_count > 0
-            message = (
-                f"✅ {success_count} sınav kaydedildi!"
-                if success
-                else f"⚠️ Kısmen kaydedildi: {success_count} başarılı, {error_count} hatalı"
-            )
+                if not ders_id or not isinstance(ders_id, int):
+                    logger.error(f"Invalid ders_id: {ders_id}")
+                    invalid.append(str(ders_id))
+                    continue
+                
+                sure = exams[0].get('sure', 120)
+                
+                # Calculate end time
+                if isinstance(tarih_saat, str):
+                    tarih_saat = datetime.fromisoformat(tarih_saat)
+                
+                bitis_saat = tarih_saat + timedelta(minutes=sure)
+                
+                # Collect classrooms for this time slot
+                derslik_ids = []
+                for exam in exams:
+                    derslik_id = exam.get('derslik_id')
+                    if derslik_id and isinstance(derslik_id, int):
+                        derslik_ids.append(derslik_id)
+                    else:
+                        logger.warning(f"Invalid derslik_id for exam: {derslik_id}")
+                
+                exams_to_save.append({
+                    'ders_id': ders_id,
+                    'tarih': tarih_saat.date(),
+                    'baslangic_saati': tarih_saat.time(),
+                    'bitis_saati': bitis_saat.time(),
+                    'derslik_ids': derslik_ids
+                })
+            
+            if report.get('duplicate_courses'):
+                invalid.extend(str(ders_id) for ders_id in report['duplicate_courses'])
+            if invalid:
+                return {
+                    'success': False,
+                    'message': "Program kaydedilemedi: geçersiz veya tekrarlanan dersler var!",
+                    'details': ", ".join(invalid),
+                    'validation': report
+                }
+            
+            # Program, exams and classrooms in a single transaction
+            try:
+                saved = self.sinav_model.save_program_bulk(program_data, exams_to_save)
+            except Exception as e:
+                logger.error(f"Error saving exam schedule in bulk: {e}")
+                return {
+                    'success': False,
+                    'message': "Program kaydedilemedi, hiçbir değişiklik yapılmadı.",
+                    'details': constraint_violation_message(e) or str(e),
+                    'validation': report
+                }
+            
+            success_count = len(saved['sinav_ids'])
             return {
-                'success': success,
-                'message': message,
-                'program_id': program_id,
+                'success': True,
+                'message': f"✅ {success_count} sınav kaydedildi!",
+                'program_id': saved['program_id'],
                 'success_count': success_count,
-                'error_count': error_count,
+                'error_count': 0,
+                'validation': report,
             }
             
         except Exception as e:
             logger.error(f"Error saving exam schedule: {e}")
             return {'success': False, 'message': str(e)}
     
+    def audit_schedule(self, schedule: List[Dict], daily_limit: int = 0, ara_suresi: int = 15) -> Dict:
+        """Run the full conflict audit on an in-memory schedule"""
+        ders_ids = list({exam['ders_id'] for exam in schedule})
+        auditor = CakismaDenetimi.from_kayitlar(self.ders_model.get_kayitlar_by_dersler(ders_ids))
+        
+        kapasiteler = {}
+        for bolum_id in {exam.get('bolum_id') for exam in schedule if exam.get('bolum_id')}:
+            for derslik in self.derslik_model.get_derslikler_by_bolum(bolum_id):
+                kapasiteler[derslik['derslik_id']] = derslik['kapasite']
+        
+        return auditor.audit(
+            schedule,
+            derslik_kapasiteleri=kapasiteler,
+            daily_limit=daily_limit,
+            ardisik_esik_dk=ara_suresi
+        )
+    
+    def audit_program(self, program_id: int, daily_limit: int = 0, ara_suresi: int = 15) -> Dict:
+        """Run the full conflict audit on a stored exam program"""
+        try:
+            rows = self.sinav_model.get_program_exam_rooms(program_id)
+            if not rows:
+                return {'success': False, 'message': "Programda sınav bulunamadı!"}
+            
+            schedule = CakismaDenetimi.entries_from_program_rows(rows)
+            ders_ids = list({row['ders_id'] for row in rows})
+            auditor = CakismaDenetimi.from_kayitlar(self.ders_model.get_kayitlar_by_dersler(ders_ids))
+            return auditor.audit(schedule, daily_limit=daily_limit, ardisik_esik_dk=ara_suresi)
+            
+        except Exception as e:
+            logger.error(f"Error auditing program {program_id}: {e}")
+            return {'success': False, 'message': str(e)}
+    
+    def get_ogrenci_yukleri(self, program_id: int, daily_limit: int = 0, ara_suresi: int = 15,
+                            sadece_sorunlu: bool = True) -> Dict:
+        """Per-student conflict/load statistics of a stored program, computed in the database"""
+        try:
+            ogrenciler = self.sinav_model.get_ogrenci_yukleri(program_id, ara_suresi, sadece_sorunlu)
+            ozet = {
+                'cakismali_ogrenci': sum(1 for o in ogrenciler if o['cakisma_sayisi']),
+                'ayni_gun_birden_fazla': sum(1 for o in ogrenciler if o['gunluk_en_fazla'] > 1),
+                'ardisik_sinavli': sum(1 for o in ogrenciler if o['ardisik_sayisi']),
+            }
+            if daily_limit:
+                ozet['gunluk_limit_asan'] = sum(1 for o in ogrenciler if o['gunluk_en_fazla'] > daily_limit)
+            
+            return {
+                'success': True,
+                'program_id': program_id,
+                'ozet': ozet,
+                'ogrenciler': ogrenciler
+            }
+            
+        except Exception as e:
+            logger.error(f"Error loading student loads for program {program_id}: {e}")
+            return {'success': False, 'message': str(e)}
+    
     def validate_exam_schedule(self, schedule: List[Dict]) -> Dict:
         """Validate exam schedule for conflicts"""
         try:
-            conflicts = []
-            
-            # Check for time conflicts
-            for i, exam1 in enumerate(schedule):
-                for j, exam2 in enumerate(schedule[i+1:], i+1):
-                    # Same time, same classroom
-                    if (exam1['tarih_saat'] == exam2['tarih_saat'] and
-                        exam1.get('derslik_id') == exam2.get('derslik_id')):
-                        conflicts.append({
-                            'type': 'classroom_conflict',
-                            'exam1': exam1['ders_kodu'],
-                            'exam2': exam2['ders_kodu'],
-                            'message': f"Aynı anda aynı derslik kullanılıyor"
-                        })
-            
-            if conflicts:
+            report = self.audit_schedule(schedule)
+            conflicts = (
+                [dict(c, type='student_conflict') for c in report['student_conflicts']] +
+                [dict(c, type='classroom_conflict') for c in report['room_conflicts']] +
+                [dict(c, type='capacity') for c in report['capacity_violations']]
+            )
+            
+            if not report['success']:
                 return {
                     'success': False,
-                    'message': f"{len(conflicts)} çakışma tespit edildi!",
-                    'conflicts': conflicts
+                    'message': report['message'],
+                    'conflicts': conflicts,
+                    'report': report
                 }
             
             return {
                 'success': True,
-                'message': "Program geçerli, çakışma yok!"
+                'message': "Program geçerli, çakışma yok!",
+                'report': report
             }
             
         except Exception as e:
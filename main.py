@@ -13,7 +13,7 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from PySide6.QtWidgets import QApplication, QMessageBox, QStackedWidget, QWidget
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QFont
 
 from views.login_view import LoginView
@@ -50,17 +50,21 @@ def setup_logging():
 class SingleWindowApp(QStackedWidget):
     """Single window application - Login and Main screens"""
     
+    # Emitted from the warm-up thread; queued to the GUI thread
+    database_checked = Signal(bool, str)
+    
     def __init__(self):
         super().__init__()
         self.logger = logging.getLogger(__name__)
+        self._db_retry = False
         
         # Window setup
         self.setWindowTitle("KOÜ Sınav Takvimi Sistemi")
         self.setMinimumSize(1400, 800)
         
-        # Test database connection
-        if not self.check_database():
-            return
+        # Test database connection in the background; login renders immediately
+        self.database_checked.connect(self.on_database_checked)
+        self.check_database()
         
         # Create login page
         self.login_page = LoginView()
@@ -76,20 +80,24 @@ class SingleWindowApp(QStackedWidget):
         
         self.logger.info("✅ Uygulama başlatıldı - Login ekranı")
     
-    def check_database(self):
-        """Check database connection"""
-        try:
-            if db.test_connection():
-                self.logger.info("✅ Veritabanı bağlantısı başarılı")
-                return True
-            else:
-                self.logger.error("❌ Veritabanı bağlantısı başarısız")
-                self.show_database_error()
-                return False
-        except Exception as e:
-            self.logger.error(f"❌ Veritabanı hatası: {e}")
-            self.show_database_error(str(e))
-            return False
+    def check_database(self, force=False):
+        """Open the pool and test the connection without blocking the UI"""
+        db.warm_up(callback=self.database_checked.emit, force=force)
+    
+    def on_database_checked(self, success, error_msg):
+        """Handle the background connection test result"""
+        if success:
+            self.logger.info("✅ Veritabanı bağlantısı başarılı")
+            if self._db_retry:
+                QMessageBox.information(
+                    self,
+                    "Başarılı",
+                    "Veritabanı bağlantısı başarılı!"
+                )
+        else:
+            self.logger.error(f"❌ Veritabanı bağlantısı başarısız: {error_msg}")
+            self.show_database_error(error_msg)
+        self._db_retry = False
     
     def show_database_error(self, error_msg=""):
         """Show database connection error"""
@@ -115,12 +123,8 @@ class SingleWindowApp(QStackedWidget):
         result = msg.exec()
         
         if result == QMessageBox.Retry:
-            if self.check_database():
-                QMessageBox.information(
-                    self,
-                    "Başarılı",
-                    "Veritabanı bağlantısı başarılı!"
-                )
+            self._db_retry = True
+            self.check_database(force=True)
         else:
             sys.exit(1)
     
@@ -141,6 +145,7 @@ class SingleWindowApp(QStackedWidget):
     def on_logout(self):
         """Handle logout - Switch back to login"""
         self.logger.info("Kullanıcı çıkış yaptı")
+        db.set_user_context(None)
         
         # Remove main page
         if self.main_page:
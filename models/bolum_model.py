@@ -5,6 +5,7 @@ Bolum Model - CRUD Operations
 import logging
 from typing import List, Dict, Optional
 from models.database import DatabaseManager
+from models.cache import reference_cache
 
 logger = logging.getLogger(__name__)
 
@@ -16,27 +17,35 @@ class BolumModel:
         self.db = db
     
     def get_all(self) -> List[Dict]:
-        """Get all departments"""
+        """Get all departments (cached)"""
         query = """
             SELECT bolum_id, bolum_kodu, bolum_adi, aktif
             FROM bolumler
             WHERE aktif = TRUE
             ORDER BY bolum_adi
         """
-        return self.db.execute_query(query)
+        rows = reference_cache.get_or_load(('bolumler',), lambda: self.db.execute_query(query))
+        return [dict(row) for row in rows]
     
     def get_all_bolumler(self) -> List[Dict]:
         """Get all departments (alias for compatibility)"""
         return self.get_all()
     
     def get_bolum_by_id(self, bolum_id: int) -> Optional[Dict]:
-        """Get department by ID"""
+        """Get department by ID (cached)"""
         query = """
             SELECT * FROM bolumler
             WHERE bolum_id = %s AND aktif = TRUE
         """
-        result = self.db.execute_query(query, (bolum_id,))
-        return result[0] if result else None
+        result = reference_cache.get_or_load(
+            ('bolumler', bolum_id), lambda: self.db.execute_query(query, (bolum_id,))
+        )
+        return dict(result[0]) if result else None
+    
+    def get_bolum_adi(self, bolum_id: int, default: str = "BÖLÜM") -> str:
+        """Department name for exports/headers, falling back to default"""
+        bolum = self.get_bolum_by_id(bolum_id)
+        return bolum['bolum_adi'] if bolum else default
     
     def get_bolum_by_kod(self, bolum_kodu: str) -> Optional[Dict]:
         """Get department by code"""
@@ -60,6 +69,7 @@ class BolumModel:
         )
         
         result = self.db.execute_query(query, params)
+        self.db.on_commit(lambda: reference_cache.invalidate('bolumler'))
         logger.info(f"Department created: {bolum_data['bolum_adi']}")
         return result[0]['bolum_id']
     
@@ -78,6 +88,7 @@ class BolumModel:
         )
         
         self.db.execute_query(query, params, fetch=False)
+        self.db.on_commit(lambda: reference_cache.invalidate('bolumler'))
         logger.info(f"Department updated: {bolum_id}")
         return True
     
@@ -85,6 +96,7 @@ class BolumModel:
         """Delete department (soft delete)"""
         query = "UPDATE bolumler SET aktif = FALSE WHERE bolum_id = %s"
         self.db.execute_query(query, (bolum_id,), fetch=False)
+        self.db.on_commit(lambda: reference_cache.invalidate('bolumler'))
         logger.info(f"Department deleted: {bolum_id}")
         return True
 
@@ -0,0 +1,104 @@
+"""
+Referans Veri Önbelleği - Reference data cache
+Process-wide read-through cache for rarely changing tables (dersler,
+derslikler, bolumler) with TTL/LRU eviction and write invalidation
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class ReferenceCache:
+    """
+    Thread-safe TTL + LRU cache
+
+    Keys are tuples whose first element is the table name and whose second
+    element (if any) is the department/row id, e.g. ('dersler', bolum_id).
+    Writes call invalidate(table, bolum_id) so only the affected entries drop.
+
+    Env:
+        REFERENCE_CACHE=0        disable caching (every read goes to the DB)
+        REFERENCE_CACHE_TTL      entry lifetime in seconds (default 300)
+        REFERENCE_CACHE_SIZE     max number of entries (default 256)
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        self.enabled = os.getenv('REFERENCE_CACHE', '1') != '0'
+        self.ttl = float(ttl if ttl is not None else os.getenv('REFERENCE_CACHE_TTL', 300))
+        self.max_size = int(max_size if max_size is not None else os.getenv('REFERENCE_CACHE_SIZE', 256))
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation; a load that started before it is not stored
+        self._generation = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get_or_load(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader() on a miss"""
+        if not self.enabled:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[1]
+            self._stats['misses'] += 1
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            # Skip the store if a write invalidated the table while we were loading
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self._stats['evictions'] += 1
+        return value
+
+    def invalidate(self, table: str, key_id: Optional[Any] = None) -> int:
+        """Drop entries of a table (optionally only those for one id); returns count"""
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key for key in self._entries
+                if key[0] == table and (key_id is None or (len(key) > 1 and key[1] == key_id))
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += 1
+        if stale:
+            logger.debug(f"🧹 Cache invalidated: {table} {key_id if key_id is not None else '*'} ({len(stale)} entries)")
+        return len(stale)
+
+    def clear(self):
+        """Drop everything"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return dict(
+                self._stats,
+                size=len(self._entries),
+                hit_ratio=round(self._stats['hits'] / lookups, 3) if lookups else 0.0,
+                enabled=self.enabled,
+                ttl=self.ttl
+            )
+
+
+reference_cache = ReferenceCache()
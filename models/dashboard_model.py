@@ -0,0 +1,99 @@
+"""
+Dashboard Model - Summary statistics
+Reads the trigger-maintained bolum_istatistikleri table instead of counting rows
+"""
+
+import logging
+from typing import List, Dict
+from models.database import DatabaseManager, read_query
+
+logger = logging.getLogger(__name__)
+
+EMPTY_STATS = {'ders_sayisi': 0, 'ogrenci_sayisi': 0, 'derslik_sayisi': 0, 'program_sayisi': 0}
+
+
+class DashboardModel:
+    """Dashboard statistics data access layer"""
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def get_bolum_istatistikleri(self, bolum_id: int) -> Dict:
+        """
+        Course/student/room/program counts of one department (primary key read)
+
+        Untagged: page-enable checks call this right after imports, so it
+        follows the caller's routing (primary unless inside read_replica()).
+        """
+        query = """
+            SELECT ders_sayisi, ogrenci_sayisi, derslik_sayisi, program_sayisi, guncelleme_zamani
+            FROM bolum_istatistikleri
+            WHERE bolum_id = %s
+        """
+        result = self.db.execute_query(query, (bolum_id,))
+        return dict(result[0]) if result else dict(EMPTY_STATS)
+
+    @read_query
+    def get_tum_bolum_istatistikleri(self) -> List[Dict]:
+        """Per-department counts for every active department"""
+        query = """
+            SELECT b.bolum_id, b.bolum_kodu, b.bolum_adi,
+                   COALESCE(bi.ders_sayisi, 0) AS ders_sayisi,
+                   COALESCE(bi.ogrenci_sayisi, 0) AS ogrenci_sayisi,
+                   COALESCE(bi.derslik_sayisi, 0) AS derslik_sayisi,
+                   COALESCE(bi.program_sayisi, 0) AS program_sayisi
+            FROM bolumler b
+            LEFT JOIN bolum_istatistikleri bi ON bi.bolum_id = b.bolum_id
+            WHERE b.aktif = TRUE
+            ORDER BY b.bolum_adi
+        """
+        return self.db.execute_query(query)
+
+    @read_query
+    def get_sistem_ozeti(self) -> Dict:
+        """Active user/coordinator/department counts in one round trip"""
+        query = """
+            SELECT COUNT(*) FILTER (WHERE aktif = TRUE) AS kullanici_sayisi,
+                   COUNT(*) FILTER (WHERE aktif = TRUE AND role = 'Bölüm Koordinatörü') AS koordinator_sayisi,
+                   (SELECT COUNT(*) FROM bolumler WHERE aktif = TRUE) AS bolum_sayisi
+            FROM users
+        """
+        return dict(self.db.execute_query(query)[0])
+
+    @read_query
+    def get_son_girisler(self, limit: int = 5) -> List[Dict]:
+        """Most recent logins (admin activity list)"""
+        query = """
+            SELECT ad_soyad, son_giris
+            FROM users
+            WHERE aktif = TRUE AND son_giris IS NOT NULL
+            ORDER BY son_giris DESC
+            LIMIT %s
+        """
+        return self.db.execute_query(query, (limit,))
+
+    @read_query
+    def get_son_programlar(self, bolum_id: int, limit: int = 5) -> List[Dict]:
+        """Most recent exam programs of a department (coordinator activity list)"""
+        query = """
+            SELECT program_id, program_adi, baslangic_tarihi
+            FROM sinav_programi
+            WHERE bolum_id = %s
+            ORDER BY baslangic_tarihi DESC
+            LIMIT %s
+        """
+        return self.db.execute_query(query, (bolum_id, limit))
+
+    @read_query
+    def load_dashboard(self, bolum_id: int = None) -> Dict:
+        """Everything the dashboard shows: admin overview when bolum_id is None"""
+        if bolum_id is None:
+            return {
+                'ozet': self.get_sistem_ozeti(),
+                'bolumler': self.get_tum_bolum_istatistikleri(),
+                'aktiviteler': self.get_son_girisler()
+            }
+        return {
+            'bolum': self.get_bolum_istatistikleri(bolum_id),
+            'aktiviteler': self.get_son_programlar(bolum_id)
+        }
@@ -4,13 +4,22 @@ Thread-safe PostgreSQL connection pooling
 """
 
 import os
+import re
+import json
+import time
+import select
+import uuid
 import logging
+import threading
+import functools
 from contextlib import contextmanager
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, Callable, Iterable
 import psycopg2
-from psycopg2 import pool, extras
+from psycopg2 import pool, extras, errors
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from dotenv import load_dotenv
+from models.query_stats import query_stats, InstrumentedCursor
+from models.cache import reference_cache
 
 load_dotenv()
 
@@ -24,60 +33,371 @@ class DatabaseManager:
     _instance = None
     _pool = None
 
+    # Prepared statement registry: name -> (original SQL, server SQL with $n, param count)
+    _queries: Dict[str, tuple] = {}
+    # (id(conn), backend pid) -> names prepared on that session
+    _prepared: Dict[tuple, set] = {}
+    _prepared_stats: Dict[str, Dict[str, float]] = {}
+    _prepared_lock = threading.Lock()
+    _use_prepared = os.getenv('DB_PREPARED_STATEMENTS', '1') != '0'
+
+    # LISTEN/NOTIFY: channel filled by the table triggers, subscribers and listener thread
+    CHANGE_CHANNEL = 'tablo_degisiklik'
+    _change_subscribers: List[tuple] = []
+    _change_lock = threading.Lock()
+    _listener_thread: Optional[threading.Thread] = None
+    _listener_stop = threading.Event()
+
+    # Lazy pool: created on first use, warmed up in the background
+    _pool_lock = threading.Lock()
+    _pool_error: Optional[Exception] = None
+    _pool_backoff = 0.0
+    _next_pool_attempt = 0.0
+    # id(conn) -> monotonic time the connection was returned to the pool
+    _last_used: Dict[int, float] = {}
+    _healthcheck_idle = float(os.getenv('DB_HEALTHCHECK_IDLE', 30))
+    _checkout_retries = int(os.getenv('DB_CONNECT_RETRIES', 3))
+
+    # RLS context: desired user id (process-wide) and the value each pooled
+    # session currently has, keyed by (id(conn), backend pid)
+    _context_user_id: Optional[int] = None
+    _applied_context: Dict[tuple, int] = {}
+
+    # Unit of work: per-thread shared connection/cursor of the open transaction()
+    _tx_local = threading.local()
+
+    # Read replica (optional, DB_REPLICA_HOST): lazy pool and per-thread routing
+    # set by read_replica()/primary() (or the read_query/write_query decorators)
+    _replica_pool = None
+    _replica_lock = threading.Lock()
+    _next_replica_attempt = 0.0
+    _replica_retry = float(os.getenv('DB_REPLICA_RETRY', 30))
+    _replica_stats = {'reads': 0, 'fallbacks': 0}
+    _route_local = threading.local()
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        if self._pool is None:
-            self._initialize_pool()
+    @staticmethod
+    def _connection_params() -> Dict[str, Any]:
+        """psycopg2.connect parametreleri (.env)"""
+        return {
+            'host': os.getenv('DB_HOST', 'localhost'),
+            'port': int(os.getenv('DB_PORT', 5432)),
+            'database': os.getenv('DB_NAME', 'sinav_takvimi_db'),
+            'user': os.getenv('DB_USER', 'postgres'),
+            'password': os.getenv('DB_PASSWORD', ''),
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5))
+        }
+
+    @staticmethod
+    def _replica_params() -> Optional[Dict[str, Any]]:
+        """Okuma replikası parametreleri (.env DB_REPLICA_*); tanımlı değilse None"""
+        host = os.getenv('DB_REPLICA_HOST')
+        if not host:
+            return None
+        primary = DatabaseManager._connection_params()
+        return {
+            **primary,
+            'host': host,
+            'port': int(os.getenv('DB_REPLICA_PORT', primary['port'])),
+            'database': os.getenv('DB_REPLICA_NAME', primary['database']),
+            'user': os.getenv('DB_REPLICA_USER', primary['user']),
+            'password': os.getenv('DB_REPLICA_PASSWORD', primary['password']),
+            # A write routed here by mistake fails instead of silently diverging
+            'options': '-c default_transaction_read_only=on'
+        }
 
     def _initialize_pool(self):
-        """Connection pool'u başlat"""
+        """
+        Connection pool'u başlat
+
+        Sadece bir bağlantı eşzamanlı açılır; DB_POOL_SIZE'a kadar olanlar arka
+        planda ısıtılır. Başarısız denemeden sonra bir sonraki deneme artan
+        bekleme (1s, 2s, 4s ... 30s) sonrasına ertelenir.
+        """
+        target = int(os.getenv('DB_POOL_SIZE', 5))
+        db_config = {
+            'minconn': 1,
+            'maxconn': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+            **self._connection_params(),
+            'cursor_factory': InstrumentedCursor
+        }
+
+        logger.info(f"Initializing connection pool: {db_config['user']}@{db_config['host']}:{db_config['port']}/{db_config['database']}")
+
         try:
-            db_config = {
-                'minconn': int(os.getenv('DB_POOL_SIZE', 5)),
-                'maxconn': int(os.getenv('DB_MAX_OVERFLOW', 20)),
-                'host': os.getenv('DB_HOST', 'localhost'),
-                'port': int(os.getenv('DB_PORT', 5432)),
-                'database': os.getenv('DB_NAME', 'sinav_takvimi_db'),
-                'user': os.getenv('DB_USER', 'postgres'),
-                'password': os.getenv('DB_PASSWORD', ''),
-                'cursor_factory': extras.RealDictCursor
-            }
-            
-            logger.info(f"Initializing connection pool: {db_config['user']}@{db_config['host']}:{db_config['port']}/{db_config['database']}")
-            
-            self._pool = psycopg2.pool.ThreadedConnectionPool(**db_config)
-            logger.info("✅ Database connection pool initialized successfully")
+            new_pool = psycopg2.pool.ThreadedConnectionPool(**db_config)
         except Exception as e:
-            logger.error(f"❌ Database connection pool initialization failed: {str(e)}", exc_info=True)
+            DatabaseManager._pool_error = e
+            DatabaseManager._pool_backoff = min(max(DatabaseManager._pool_backoff * 2, 1.0), 30.0)
+            DatabaseManager._next_pool_attempt = time.monotonic() + DatabaseManager._pool_backoff
+            logger.error(f"❌ Database connection pool initialization failed "
+                         f"(retry in {DatabaseManager._pool_backoff:.0f}s): {str(e)}")
             raise
 
+        # putconn keeps up to minconn idle connections, so raise it to the target now
+        new_pool.minconn = max(target, 1)
+        DatabaseManager._pool = new_pool
+        DatabaseManager._pool_error = None
+        DatabaseManager._pool_backoff = 0.0
+        logger.info("✅ Database connection pool initialized successfully")
+
+        if target > 1:
+            threading.Thread(
+                target=self._warm_up_pool, args=(new_pool, target), name='db-pool-warmup', daemon=True
+            ).start()
+
+    @staticmethod
+    def _warm_up_pool(pool_, target: int):
+        """Havuzu minimum bağlantı sayısına kadar arka planda doldur"""
+        started = time.perf_counter()
+        conns = []
+        try:
+            for _ in range(target):
+                conns.append(pool_.getconn())
+        except Exception as e:
+            logger.warning(f"⚠️ Pool warm-up stopped at {len(conns)}/{target} connections: {e}")
+        finally:
+            for conn in conns:
+                DatabaseManager._last_used[id(conn)] = time.monotonic()
+                pool_.putconn(conn, close=bool(conn.closed))
+        logger.info(f"🔥 Pool warmed up: {len(conns)} connections in {time.perf_counter() - started:.2f}s")
+
+    def _get_pool(self):
+        """Havuzu ilk kullanımda oluştur (thread-safe, backoff'a uyar)"""
+        if self._pool is not None:
+            return self._pool
+        with self._pool_lock:
+            if self._pool is None:
+                wait = DatabaseManager._next_pool_attempt - time.monotonic()
+                if wait > 0:
+                    raise psycopg2.OperationalError(
+                        f"Veritabanına ulaşılamıyor, {wait:.0f} sn sonra tekrar denenecek: {DatabaseManager._pool_error}"
+                    )
+                self._initialize_pool()
+            return self._pool
+
+    def _get_replica_pool(self):
+        """
+        Replika havuzunu ilk okumada oluştur
+
+        Returns None when no replica is configured or it is unreachable; reads
+        then go to the primary and the replica is retried after DB_REPLICA_RETRY
+        seconds.
+        """
+        if self._replica_pool is not None:
+            return self._replica_pool
+        params = self._replica_params()
+        if params is None or time.monotonic() < DatabaseManager._next_replica_attempt:
+            return None
+        with self._replica_lock:
+            if self._replica_pool is None:
+                try:
+                    DatabaseManager._replica_pool = psycopg2.pool.ThreadedConnectionPool(
+                        minconn=1,
+                        maxconn=int(os.getenv('DB_REPLICA_MAX_CONN', os.getenv('DB_MAX_OVERFLOW', 20))),
+                        cursor_factory=InstrumentedCursor,
+                        **params
+                    )
+                    logger.info(f"✅ Read replica pool initialized: {params['host']}:{params['port']}/{params['database']}")
+                except Exception as e:
+                    DatabaseManager._next_replica_attempt = time.monotonic() + self._replica_retry
+                    logger.warning(f"⚠️ Read replica unavailable, reading from primary "
+                                   f"(retry in {self._replica_retry:.0f}s): {e}")
+                    return None
+            return self._replica_pool
+
+    def _route(self) -> Optional[str]:
+        return getattr(self._route_local, 'target', None)
+
+    @contextmanager
+    def _routed(self, target: str):
+        previous = self._route()
+        self._route_local.target = target
+        try:
+            yield
+        finally:
+            self._route_local.target = previous
+
+    def read_replica(self):
+        """
+        Bu thread'deki okumaları blok boyunca replikaya yönlendir
+
+        Without DB_REPLICA_HOST (or while the replica is down) this is a no-op.
+        Open transactions always stay on the primary.
+        """
+        return self._routed('replica')
+
+    def primary(self):
+        """Bu thread'deki sorguları blok boyunca birincil sunucuya yönlendir"""
+        return self._routed('primary')
+
+    def _select_pool(self):
+        """get_connection için havuz: read_replica() içindeyse replika, değilse birincil"""
+        if self._route() == 'replica':
+            replica = self._get_replica_pool()
+            key = 'reads' if replica is not None else 'fallbacks'
+            if replica is not None or self._replica_params() is not None:
+                with self._prepared_lock:
+                    self._replica_stats[key] += 1
+            if replica is not None:
+                return replica
+        return self._get_pool()
+
+    def _replica_failed(self, replica, error: Exception):
+        """
+        Replika bağlantı veremedi: havuzu bırak, DB_REPLICA_RETRY sonra tekrar dene
+
+        The pool is only dropped, not closed; connections other threads still
+        hold are returned to it and go away with it.
+        """
+        with self._replica_lock:
+            if DatabaseManager._replica_pool is replica:
+                DatabaseManager._replica_pool = None
+                DatabaseManager._next_replica_attempt = time.monotonic() + self._replica_retry
+                logger.warning(f"⚠️ Read replica lost, reading from primary "
+                               f"(retry in {self._replica_retry:.0f}s): {error}")
+        with self._prepared_lock:
+            self._replica_stats['reads'] -= 1
+            self._replica_stats['fallbacks'] += 1
+
+    def get_replica_stats(self) -> Dict[str, Any]:
+        """Replikaya giden okumalar ve replika yokken birincile düşen okumalar"""
+        with self._prepared_lock:
+            return dict(
+                self._replica_stats,
+                configured=self._replica_params() is not None,
+                connected=self._replica_pool is not None
+            )
+
+    def warm_up(self, callback: Optional[Callable[[bool, str], None]] = None, force: bool = False):
+        """
+        Havuzu arka planda aç ve bağlantıyı test et (GUI'yi bloklamaz)
+
+        callback(success, error_message) arka plan thread'inde çağrılır.
+        force=True bekleyen backoff süresini sıfırlar (kullanıcı 'Tekrar Dene' dediğinde).
+        """
+        if force:
+            DatabaseManager._next_pool_attempt = 0.0
+
+        def run():
+            try:
+                success, error = self.test_connection(), ''
+            except Exception as e:
+                success, error = False, str(e)
+            if not success and not error and DatabaseManager._pool_error is not None:
+                error = str(DatabaseManager._pool_error)
+            if callback is not None:
+                callback(success, error)
+
+        threading.Thread(target=run, name='db-warmup', daemon=True).start()
+
+    def _is_healthy(self, conn) -> bool:
+        """Kapanmış veya uzun süre boşta kalmış bağlantıyı SELECT 1 ile doğrula"""
+        if conn.closed:
+            return False
+        # Connections the pool just opened have no entry yet and count as fresh
+        now = time.monotonic()
+        idle = now - self._last_used.get(id(conn), now)
+        if idle < self._healthcheck_idle:
+            return True
+        try:
+            # Plain cursor: health checks stay out of the query statistics
+            with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    def _checkout(self, pool_, retries: Optional[int] = None):
+        """Havuzdan sağlıklı bir bağlantı al; kopuk bağlantıları atıp yeniden bağlan"""
+        retries = retries or self._checkout_retries
+        delay = 0.2
+        last_error = None
+        for attempt in range(retries):
+            try:
+                conn = pool_.getconn()
+            except psycopg2.OperationalError as e:
+                # Server unreachable while opening a new connection
+                last_error = e
+            else:
+                if self._is_healthy(conn):
+                    return conn
+                logger.warning("⚠️ Discarding broken pooled connection")
+                self._last_used.pop(id(conn), None)
+                pool_.putconn(conn, close=True)
+                continue
+            if attempt < retries - 1:
+                time.sleep(delay)
+                delay *= 2
+        raise last_error or psycopg2.OperationalError("Sağlıklı veritabanı bağlantısı alınamadı")
+
     @contextmanager
     def get_connection(self):
         """
         Context manager ile güvenli bağlantı
+
+        Inside transaction() the unit of work's connection is returned; callers
+        that commit on their own should not be used inside such a block.
         """
+        tx = self._current_transaction()
+        if tx is not None:
+            yield tx['conn']
+            return
+
         conn = None
+        pool_ = self._select_pool()
         try:
-            conn = self._pool.getconn()
+            started = time.perf_counter()
+            if pool_ is self._pool:
+                conn = self._checkout(pool_)
+            else:
+                try:
+                    # One attempt: a dead replica should not delay the read
+                    conn = self._checkout(pool_, retries=1)
+                except psycopg2.OperationalError as e:
+                    self._replica_failed(pool_, e)
+                    pool_ = self._get_pool()
+                    conn = self._checkout(pool_)
+            query_stats.record_pool_wait((time.perf_counter() - started) * 1000)
+            self._apply_user_context(conn)
             yield conn
         except Exception as e:
-            if conn:
+            if conn and not conn.closed:
                 conn.rollback()
             logger.error(f"Veritabanı işlem hatası: {e}")
             raise
         finally:
             if conn:
-                self._pool.putconn(conn)
+                self._last_used[id(conn)] = time.monotonic()
+                try:
+                    pool_.putconn(conn, close=bool(conn.closed))
+                except pool.PoolError:
+                    # Pool was closed (application shutdown) while the connection was out
+                    conn.close()
 
     @contextmanager
     def get_cursor(self, commit=True):
         """
         Context manager ile güvenli cursor
+
+        Inside transaction() the shared cursor is reused and the commit is left
+        to the outermost transaction block.
         """
+        tx = self._current_transaction()
+        if tx is not None:
+            try:
+                yield tx['cursor']
+            except Exception:
+                # The server transaction is aborted now; make sure it is not "committed"
+                tx['failed'] = True
+                raise
+            return
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
             try:
@@ -91,6 +411,62 @@ class DatabaseManager:
             finally:
                 cursor.close()
 
+    def _current_transaction(self) -> Optional[Dict[str, Any]]:
+        return getattr(self._tx_local, 'tx', None)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: tek bağlantı, tek cursor, tek COMMIT
+
+        Every execute_query / execute_many / get_cursor call made on this thread
+        inside the block shares one pooled connection and cursor; the work is
+        committed once when the outermost block exits and rolled back if it
+        raises. Nested blocks join the outer transaction. Callbacks registered
+        with on_commit() run after the commit succeeded. Transactions always run
+        on the primary, even inside read_replica().
+
+            with db.transaction():
+                db.execute_query("DELETE ...", (...), fetch=False)
+                db.execute_query("DELETE ...", (...), fetch=False)
+        """
+        tx = self._current_transaction()
+        if tx is not None:
+            yield tx['cursor']
+            return
+
+        with self.primary(), self.get_connection() as conn:
+            cursor = conn.cursor()
+            tx = {'conn': conn, 'cursor': cursor, 'failed': False, 'on_commit': []}
+            self._tx_local.tx = tx
+            try:
+                yield cursor
+                if tx['failed']:
+                    raise psycopg2.InternalError("Transaction aborted by an earlier error in the block")
+                conn.commit()
+            finally:
+                self._tx_local.tx = None
+                cursor.close()
+
+        for callback in tx['on_commit']:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"on_commit callback failed: {e}")
+
+    def on_commit(self, callback: Callable[[], None]):
+        """
+        callback'i açık transaction() commit edildikten sonra çalıştır
+
+        Outside a transaction the statement has already been committed, so the
+        callback runs immediately (used for cache invalidation after writes).
+        """
+        tx = self._current_transaction()
+        if tx is None:
+            callback()
+        else:
+            tx['on_commit'].append(callback)
+
     def execute_query(self, query: str, params: tuple = None, fetch: bool = True) -> Optional[List[Dict]]:
         """
         SQL sorgusu çalıştır
@@ -101,6 +477,42 @@ class DatabaseManager:
                 return cursor.fetchall()
             return None
 
+    # Row types for stream_query: dict (default), plain tuple, or namedtuple
+    _STREAM_CURSOR_FACTORIES = {
+        'dict': extras.RealDictCursor,
+        'tuple': psycopg2.extensions.cursor,
+        'namedtuple': extras.NamedTupleCursor,
+    }
+
+    def stream_query(self, query: str, params: tuple = None, itersize: int = 2000,
+                     row_type: str = 'dict') -> Iterator:
+        """
+        Büyük sonuç kümeleri için server-side (named) cursor ile satır satır okuma
+
+        Rows are fetched from the server in batches of `itersize`, so memory stays
+        constant regardless of result size. The pooled connection is held until the
+        generator is exhausted or closed; consume it fully or use contextlib.closing.
+        row_type: 'dict' | 'tuple' | 'namedtuple'
+        """
+        cursor_factory = self._STREAM_CURSOR_FACTORIES.get(row_type)
+        if cursor_factory is None:
+            raise ValueError(f"Geçersiz row_type: {row_type}")
+
+        in_transaction = self._current_transaction() is not None
+        with self.get_connection() as conn:
+            cursor = conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=cursor_factory)
+            cursor.itersize = itersize
+            try:
+                cursor.execute(query, params or ())
+                for row in cursor:
+                    yield row
+            finally:
+                cursor.close()
+                # Read-only: end the transaction that holds the named cursor
+                # (unless it belongs to an open unit of work)
+                if not in_transaction:
+                    conn.rollback()
+
     def execute_many(self, query: str, params_list: List[tuple]) -> int:
         """
         Toplu INSERT/UPDATE
@@ -109,12 +521,158 @@ class DatabaseManager:
             cursor.executemany(query, params_list)
             return cursor.rowcount
 
-    def set_user_context(self, user_id: int):
+    @staticmethod
+    def _to_server_placeholders(query: str) -> tuple:
+        """Convert psycopg2 %s placeholders to PREPARE-style $1..$n"""
+        parts = query.split('%s')
+        sql = parts[0]
+        for i, part in enumerate(parts[1:], start=1):
+            sql += f"${i}{part}"
+        return sql.replace('%%', '%'), len(parts) - 1
+
+    def register_query(self, name: str, query: str):
+        """
+        Sık kullanılan sorguyu isimle kaydet (her havuz bağlantısında bir kez PREPARE edilir)
+
+        Re-registering the same name with the same SQL is a no-op; different SQL
+        replaces it and forces a fresh PREPARE on every connection.
+        """
+        if not re.fullmatch(r'[a-z_][a-z0-9_]*', name):
+            raise ValueError(f"Geçersiz sorgu adı: {name}")
+
+        compiled = (query,) + self._to_server_placeholders(query)
+        with self._prepared_lock:
+            if self._queries.get(name) == compiled:
+                return
+            replaced = name in self._queries
+            self._queries[name] = compiled
+            self._prepared_stats.setdefault(
+                name, {'calls': 0, 'prepares': 0, 'hits': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+            )
+            if replaced:
+                for names in self._prepared.values():
+                    names.discard(name)
+
+    def execute_prepared(self, name: str, params: tuple = None, fetch: bool = True) -> Optional[List[Dict]]:
+        """
+        Kayıtlı sorguyu PREPARE/EXECUTE ile çalıştır
+
+        Falls back to execute_query when DB_PREPARED_STATEMENTS=0 (e.g. behind a
+        transaction-mode pooler). If the server lost the statement (DISCARD ALL,
+        restarted session) it is prepared again and retried once.
+        """
+        query, sql, param_count = self._queries[name]
+        params = tuple(params or ())
+        if len(params) != param_count:
+            raise ValueError(f"{name}: {param_count} parametre bekleniyor, {len(params)} verildi")
+
+        started = time.perf_counter()
+        # A failed PREPARE/EXECUTE cannot be retried inside a shared transaction
+        if not self._use_prepared or self._current_transaction() is not None:
+            result = self.execute_query(query, params, fetch)
+            self._record_prepared(name, started, prepared=False)
+            return result
+
+        execute_sql = f"EXECUTE {name}" + (f" ({', '.join(['%s'] * param_count)})" if param_count else "")
+
+        with self.get_connection() as conn:
+            key = (id(conn), conn.get_backend_pid())
+            prepared_now = False
+            for attempt in range(2):
+                cursor = conn.cursor()
+                try:
+                    with self._prepared_lock:
+                        is_prepared = name in self._prepared.get(key, ())
+                    if not is_prepared:
+                        cursor.execute(f"PREPARE {name} AS {sql}")
+                        with self._prepared_lock:
+                            self._prepared.setdefault(key, set()).add(name)
+                        prepared_now = True
+                    cursor.execute(execute_sql, params)
+                    result = cursor.fetchall() if fetch else None
+                    conn.commit()
+                    break
+                except psycopg2.errors.InvalidSqlStatementName:
+                    conn.rollback()
+                    with self._prepared_lock:
+                        self._prepared.get(key, set()).discard(name)
+                    if attempt:
+                        raise
+                    logger.warning(f"Prepared statement '{name}' missing on server, re-preparing")
+                except psycopg2.errors.DuplicatePreparedStatement:
+                    # Prepared by an earlier session state we did not track
+                    conn.rollback()
+                    with self._prepared_lock:
+                        self._prepared.setdefault(key, set()).add(name)
+                    if attempt:
+                        raise
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    cursor.close()
+
+        self._record_prepared(name, started, prepared=prepared_now)
+        return result
+
+    def _record_prepared(self, name: str, started: float, prepared: bool):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._prepared_lock:
+            stats = self._prepared_stats[name]
+            stats['calls'] += 1
+            stats['prepares' if prepared else 'hits'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+    def get_prepared_stats(self) -> Dict[str, Dict[str, float]]:
+        """Kayıtlı sorguların çağrı/PREPARE/isabet ve gecikme istatistikleri"""
+        with self._prepared_lock:
+            return {
+                name: dict(stats, avg_ms=round(stats['total_ms'] / stats['calls'], 3) if stats['calls'] else 0.0)
+                for name, stats in self._prepared_stats.items()
+            }
+
+    def get_query_stats(self, top: int = 20) -> Dict[str, Any]:
+        """
+        Sorgu istatistikleri: gecikme histogramları, satır sayıları, havuz bekleme
+        süresi, çağrı yeri dağılımı ve olası N+1 desenleri
+        """
+        snapshot = query_stats.snapshot(top)
+        snapshot['prepared'] = self.get_prepared_stats()
+        snapshot['reference_cache'] = reference_cache.get_stats()
+        snapshot['replica'] = self.get_replica_stats()
+        return snapshot
+
+    def reset_query_stats(self):
+        """İstatistikleri sıfırla"""
+        query_stats.reset()
+
+    def set_user_context(self, user_id: Optional[int]):
         """
         RLS (Row Level Security) için kullanıcı context'i ayarla
+
+        Değer süreç genelinde saklanır ve her bağlantıya checkout sırasında,
+        yalnızca o oturumdaki değerden farklıysa uygulanır. None = temizle
+        (politikalar 0 kullanıcısını hiçbir satırla eşleştirmez).
         """
-        with self.get_cursor() as cursor:
-            cursor.execute("SELECT set_current_user_id(%s)", (user_id,))
+        DatabaseManager._context_user_id = user_id
+
+    def get_user_context(self) -> Optional[int]:
+        """Geçerli RLS kullanıcısı"""
+        return self._context_user_id
+
+    def _apply_user_context(self, conn):
+        """Checkout hook: bağlantının RLS context'i farklıysa güncelle"""
+        desired = self._context_user_id or 0
+        key = (id(conn), conn.get_backend_pid())
+        # Fresh sessions have no setting, which the policies read as 0
+        if self._applied_context.get(key, 0) == desired:
+            return
+        with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cursor:
+            cursor.execute("SELECT set_current_user_id(%s)", (desired,))
+        # Session-level set_config is transactional; commit so a later rollback keeps it
+        conn.commit()
+        self._applied_context[key] = desired
 
     def call_function(self, func_name: str, *args) -> Any:
         """
@@ -132,10 +690,6 @@ class DatabaseManager:
         Bağlantı testi
         """
         try:
-            if not self._pool:
-                logger.error("Connection pool not initialized")
-                return False
-                
             with self.get_cursor() as cursor:
                 cursor.execute("SELECT 1 as test")
                 result = cursor.fetchone()
@@ -147,15 +701,217 @@ class DatabaseManager:
             logger.error(f"❌ Database connection test failed: {str(e)}", exc_info=True)
             return False
 
+    # ------------------------------------------------------------------
+    # Değişiklik bildirimleri (LISTEN/NOTIFY)
+    # ------------------------------------------------------------------
+
+    def subscribe_changes(self, callback: Callable[[Dict[str, Any]], None],
+                          tables: Optional[Iterable[str]] = None) -> tuple:
+        """
+        Başka uygulama örneklerinin yaptığı tablo değişikliklerine abone ol
+
+        callback(event) dinleyici thread'inde çağrılır; event =
+        {'tablo', 'islem', 'bolum_id', 'program_id', 'pid'}. tablo == '*' ise
+        bağlantı koptuğu için her şey değişmiş sayılmalıdır. Qt görünümleri
+        utils.change_notifier.ChangeNotifier üzerinden GUI thread'ine geçmelidir.
+        Dönen değer unsubscribe_changes için anahtardır.
+        """
+        token = (callback, frozenset(tables) if tables else None)
+        with self._change_lock:
+            self._change_subscribers.append(token)
+        return token
+
+    def unsubscribe_changes(self, token: tuple):
+        """Aboneliği kaldır"""
+        with self._change_lock:
+            if token in self._change_subscribers:
+                self._change_subscribers.remove(token)
+
+    def start_change_listener(self) -> bool:
+        """
+        Arka planda LISTEN bağlantısını başlat (idempotent)
+
+        Havuzdan ayrı, autocommit bir bağlantı kullanır; koparsa artan
+        beklemeyle yeniden bağlanır. DB_CHANGE_NOTIFICATIONS=0 ile kapatılır.
+        """
+        if os.getenv('DB_CHANGE_NOTIFICATIONS', '1') == '0':
+            return False
+
+        with self._change_lock:
+            thread = DatabaseManager._listener_thread
+            if thread is not None and thread.is_alive():
+                return True
+            DatabaseManager._listener_stop.clear()
+            thread = threading.Thread(target=self._listen_loop, name='db-change-listener', daemon=True)
+            DatabaseManager._listener_thread = thread
+            thread.start()
+        return True
+
+    def stop_change_listener(self):
+        """Dinleyici thread'ini durdur"""
+        self._listener_stop.set()
+        thread = DatabaseManager._listener_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+        DatabaseManager._listener_thread = None
+
+    def _listen_loop(self):
+        """LISTEN döngüsü: bildirimleri toplar, aynı turdakileri birleştirip dağıtır"""
+        backoff = 1.0
+        connected_before = False
+
+        while not self._listener_stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**self._connection_params())
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.CHANGE_CHANNEL}")
+                logger.info(f"👂 Listening for table changes on '{self.CHANGE_CHANNEL}'")
+                backoff = 1.0
+
+                if connected_before:
+                    # Bağlantı yokken gelen bildirimler kayboldu
+                    self._dispatch_change({'tablo': '*', 'islem': 'RECONNECT', 'bolum_id': None,
+                                           'program_id': None, 'pid': None})
+                connected_before = True
+
+                while not self._listener_stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    events = {}
+                    while conn.notifies:
+                        event = self._parse_change(conn.notifies.pop(0))
+                        if event is not None:
+                            events[(event['tablo'], event['bolum_id'], event['program_id'])] = event
+                    for event in events.values():
+                        self._dispatch_change(event)
+            except Exception as e:
+                if self._listener_stop.is_set():
+                    break
+                logger.warning(f"⚠️ Change listener disconnected, retrying in {backoff:.0f}s: {e}")
+                self._listener_stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    @staticmethod
+    def _parse_change(notify) -> Optional[Dict[str, Any]]:
+        """pg_notify yükünü event sözlüğüne çevir"""
+        try:
+            payload = json.loads(notify.payload)
+        except (TypeError, ValueError):
+            logger.warning(f"Unparseable change notification: {notify.payload!r}")
+            return None
+        return {
+            'tablo': payload.get('tablo'),
+            'islem': payload.get('islem'),
+            'bolum_id': payload.get('bolum_id'),
+            'program_id': payload.get('program_id'),
+            'pid': notify.pid
+        }
+
+    def _dispatch_change(self, event: Dict[str, Any]):
+        """Önbelleği geçersiz kıl ve ilgili abonelere ilet"""
+        tablo = event['tablo']
+        if tablo == '*':
+            reference_cache.clear()
+        elif tablo in ('dersler', 'derslikler'):
+            reference_cache.invalidate(tablo, event['bolum_id'])
+        elif tablo == 'bolumler':
+            reference_cache.invalidate('bolumler')
+
+        with self._change_lock:
+            subscribers = list(self._change_subscribers)
+        for callback, tables in subscribers:
+            if tables is None or tablo == '*' or tablo in tables:
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.error(f"❌ Change subscriber failed for {tablo}: {e}", exc_info=True)
+
     def close_all_connections(self):
         """
         Tüm bağlantıları kapat
         """
-        if self._pool:
-            self._pool.closeall()
+        self.stop_change_listener()
+        with self._pool_lock:
+            if self._pool:
+                self._pool.closeall()
+                DatabaseManager._pool = None
+                self._last_used.clear()
+        with self._replica_lock:
+            if self._replica_pool:
+                self._replica_pool.closeall()
+                DatabaseManager._replica_pool = None
             logger.info("Tüm veritabanı bağlantıları kapatıldı")
 
 
+def read_query(method):
+    """
+    Model metodunu okuma olarak işaretle: sorgular replikaya gider
+
+    For report/export style reads that tolerate replication lag; the model
+    must keep its DatabaseManager in self.db.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.db.read_replica():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def write_query(method):
+    """Model metodunu yazma olarak işaretle: read_replica() içinden çağrılsa da birincile gider"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.db.primary():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+# EXCLUDE constraints on the reservation tables -> user-facing messages
+_EXCLUSION_MESSAGES = {
+    'exc_derslik_cakisma': ("Derslik çakışması", "{anahtar} numaralı derslik {baslangic} - {bitis} arasında başka bir sınava ayrılmış."),
+    'exc_ogrenci_cakisma': ("Öğrenci çakışması", "{anahtar} numaralı öğrencinin {baslangic} - {bitis} arasında başka bir sınavı var."),
+}
+# '(3, ["2025-01-06 09:00:00","2025-01-06 10:15:00"))' parts of the (possibly localized) detail
+_EXCLUSION_KEY = re.compile(r'=\((?P<anahtar>[^,]+), \["(?P<baslangic>[^"]+)","(?P<bitis>[^"]+)"\)\)')
+
+
+def _format_timestamp(value: str) -> str:
+    try:
+        return time.strftime('%d.%m.%Y %H:%M', time.strptime(value[:16], '%Y-%m-%d %H:%M'))
+    except ValueError:
+        return value
+
+
+def constraint_violation_message(error: Exception) -> Optional[str]:
+    """
+    Çakışma kısıtı ihlalini (SQLSTATE 23P01) kullanıcıya gösterilecek mesaja çevir
+
+    Diğer hatalar için None döner; çağıran kendi mesajını kullanır.
+    """
+    if not isinstance(error, errors.ExclusionViolation):
+        return None
+    title, template = _EXCLUSION_MESSAGES.get(error.diag.constraint_name, ("Zaman çakışması", None))
+    matches = list(_EXCLUSION_KEY.finditer(error.diag.message_detail or ''))
+    if template is None or not matches:
+        return f"{title}!"
+    # The last tuple in the detail is the already stored (conflicting) booking
+    existing = matches[-1]
+    return f"{title}: " + template.format(
+        anahtar=existing.group('anahtar').strip(),
+        baslangic=_format_timestamp(existing.group('baslangic')),
+        bitis=_format_timestamp(existing.group('bitis'))
+    )
+
+
 # Global singleton instance
 db = DatabaseManager()
 
@@ -3,8 +3,9 @@ Ders Model - CRUD Operations
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from models.database import DatabaseManager
+from models.cache import reference_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,36 +15,119 @@ class DersModel:
     
     def __init__(self, db: DatabaseManager):
         self.db = db
+        # Hot lookups during imports/reports: prepared once per pooled connection
+        self.db.register_query('ders_by_id', """
+            SELECT d.*, b.bolum_adi
+            FROM dersler d
+            JOIN bolumler b ON d.bolum_id = b.bolum_id
+            WHERE d.ders_id = %s
+        """)
+        self.db.register_query('ders_by_kod', """
+            SELECT * FROM dersler
+            WHERE bolum_id = %s AND ders_kodu = %s AND aktif = TRUE
+        """)
     
     def get_dersler_by_bolum(self, bolum_id: int) -> List[Dict]:
-        """Get all courses for a department"""
+        """Get all courses for a department (cached per department)"""
         query = """
-            SELECT ders_id, bolum_id, ders_kodu, ders_adi, ogretim_elemani, sinif, ders_yapisi, aktif
+            SELECT ders_id, bolum_id, ders_kodu, ders_adi, ogretim_elemani, sinif, ders_yapisi, aktif,
+                   ogrenci_sayisi
             FROM dersler
             WHERE bolum_id = %s AND aktif = TRUE
             ORDER BY sinif, ders_kodu
         """
-        return self.db.execute_query(query, (bolum_id,))
+        rows = reference_cache.get_or_load(
+            ('dersler', bolum_id), lambda: self.db.execute_query(query, (bolum_id,))
+        )
+        # Callers may annotate the rows; hand out copies so the cache stays clean
+        return [dict(row) for row in rows]
+    
+    def get_dersler_sayfasi(
+        self,
+        bolum_id: int,
+        after: Optional[Tuple[int, str]] = None,
+        limit: int = 200,
+        sinif: Optional[int] = None,
+        ders_yapisi: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        One keyset page of a department's courses
+
+        Ordered by (sinif, ders_kodu) like get_dersler_by_bolum; pass the last
+        row's key as `after` for the next page. Not cached: pages are cheap
+        index seeks (idx_dersler_sayfa).
+        """
+        conditions = ["bolum_id = %s", "aktif = TRUE"]
+        params: list = [bolum_id]
+        if after is not None:
+            conditions.append("(sinif, ders_kodu) > (%s, %s)")
+            params.extend(after)
+        if sinif is not None:
+            conditions.append("sinif = %s")
+            params.append(sinif)
+        if ders_yapisi is not None:
+            conditions.append("ders_yapisi = %s")
+            params.append(ders_yapisi)
+        query = f"""
+            SELECT ders_id, bolum_id, ders_kodu, ders_adi, ogretim_elemani, sinif, ders_yapisi, aktif,
+                   ogrenci_sayisi
+            FROM dersler
+            WHERE {' AND '.join(conditions)}
+            ORDER BY sinif, ders_kodu
+            LIMIT %s
+        """
+        params.append(limit)
+        return self.db.execute_query(query, tuple(params))
+    
+    @staticmethod
+    def sayfa_anahtari(ders: Dict) -> Tuple[int, str]:
+        """Keyset cursor of a row returned by get_dersler_sayfasi"""
+        return (ders['sinif'], ders['ders_kodu'])
     
     def get_ders_by_id(self, ders_id: int) -> Optional[Dict]:
         """Get course by ID"""
-        query = """
-            SELECT d.*, b.bolum_adi
-            FROM dersler d
-            JOIN bolumler b ON d.bolum_id = b.bolum_id
-            WHERE d.ders_id = %s
-        """
-        result = self.db.execute_query(query, (ders_id,))
+        result = self.db.execute_prepared('ders_by_id', (ders_id,))
         return result[0] if result else None
     
     def get_ders_by_kod(self, bolum_id: int, ders_kodu: str) -> Optional[Dict]:
         """Get course by code"""
+        result = self.db.execute_prepared('ders_by_kod', (bolum_id, ders_kodu))
+        return result[0] if result else None
+    
+    def get_ders_ids_by_kod(self, bolum_id: int, ders_kodlari: List[str]) -> Dict[str, int]:
+        """Resolve many active course codes of a department in one query (kod -> ders_id)"""
+        if not ders_kodlari:
+            return {}
         query = """
-            SELECT * FROM dersler
-            WHERE bolum_id = %s AND ders_kodu = %s AND aktif = TRUE
+            SELECT ders_kodu, ders_id
+            FROM dersler
+            WHERE bolum_id = %s AND ders_kodu = ANY(%s) AND aktif = TRUE
         """
-        result = self.db.execute_query(query, (bolum_id, ders_kodu))
-        return result[0] if result else None
+        result = self.db.execute_query(query, (bolum_id, list(ders_kodlari)))
+        return {row['ders_kodu']: row['ders_id'] for row in result}
+    
+    def get_ogrenci_sayilari(self, ders_ids: List[int]) -> Dict[int, int]:
+        """Enrollment counts per course, read from the trigger-maintained counter"""
+        if not ders_ids:
+            return {}
+        query = """
+            SELECT ders_id, ogrenci_sayisi
+            FROM dersler
+            WHERE ders_id = ANY(%s)
+        """
+        result = self.db.execute_query(query, (list(ders_ids),))
+        return {row['ders_id']: row['ogrenci_sayisi'] for row in result}
+    
+    def get_kayitlar_by_dersler(self, ders_ids: List[int]) -> List[Dict]:
+        """Get enrollment rows (ogrenci_no, ders_id) for many courses at once"""
+        if not ders_ids:
+            return []
+        query = """
+            SELECT ogrenci_no, ders_id
+            FROM ders_kayitlari
+            WHERE ders_id = ANY(%s)
+        """
+        return self.db.execute_query(query, (list(ders_ids),))
     
     def insert_ders(self, ders_data: Dict) -> int:
         """Insert new course"""
@@ -63,6 +147,7 @@ class DersModel:
         )
         
         result = self.db.execute_query(query, params)
+        self.db.on_commit(lambda bolum_id=ders_data['bolum_id']: reference_cache.invalidate('dersler', bolum_id))
         logger.info(f"✅ Course created: {ders_data['ders_kodu']}")
         return result[0]['ders_id']
     
@@ -87,17 +172,35 @@ class DersModel:
         )
         
         self.db.execute_query(query, params, fetch=False)
+        self.db.on_commit(lambda: reference_cache.invalidate('dersler'))
         logger.info(f"✅ Course updated: {ders_id}")
         return True
     
     def delete_ders(self, ders_id: int) -> bool:
-        """Delete course (hard delete)"""
-        # First delete course registrations
-        query1 = "DELETE FROM ders_kayitlari WHERE ders_id = %s"
-        self.db.execute_query(query1, (ders_id,), fetch=False)
-        
-        # Then delete course
-        query2 = "DELETE FROM dersler WHERE ders_id = %s"
-        self.db.execute_query(query2, (ders_id,), fetch=False)
-        logger.info(f"Course deleted: {ders_id}")
+        """Delete course (hard delete, one transaction)"""
+        self.delete_dersler([ders_id])
         return True
+    
+    def delete_dersler(self, ders_ids: List[int]) -> Dict[str, int]:
+        """
+        Delete many courses and their registrations in one statement (hard delete)
+
+        Registrations are removed with one set-based DELETE instead of a
+        cascade per course. Returns {'ders_sayisi', 'kayit_sayisi'} deleted.
+        """
+        if not ders_ids:
+            return {'ders_sayisi': 0, 'kayit_sayisi': 0}
+        query = """
+            WITH silinen_kayitlar AS (
+                DELETE FROM ders_kayitlari WHERE ders_id = ANY(%s) RETURNING 1
+            ), silinen_dersler AS (
+                DELETE FROM dersler WHERE ders_id = ANY(%s) RETURNING 1
+            )
+            SELECT (SELECT COUNT(*) FROM silinen_dersler) AS ders_sayisi,
+                   (SELECT COUNT(*) FROM silinen_kayitlar) AS kayit_sayisi
+        """
+        ids = list(ders_ids)
+        result = dict(self.db.execute_query(query, (ids, ids))[0])
+        self.db.on_commit(lambda: reference_cache.invalidate('dersler'))
+        logger.info(f"Courses deleted: {result['ders_sayisi']} ({result['kayit_sayisi']} registrations)")
+        return result
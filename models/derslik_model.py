@@ -5,6 +5,7 @@ Derslik Model - CRUD İşlemleri
 import logging
 from typing import List, Dict, Optional
 from models.database import DatabaseManager
+from models.cache import reference_cache
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,7 @@ class DerslikModel:
         self.db = db
 
     def get_derslikler_by_bolum(self, bolum_id: int) -> List[Dict]:
-        """Bölüme ait tüm derslikleri getir"""
+        """Bölüme ait tüm derslikleri getir (bölüm bazında önbellekli)"""
         query = """
                 SELECT derslik_id, \
                        bolum_id, \
@@ -32,7 +33,11 @@ class DerslikModel:
                   AND aktif = TRUE
                 ORDER BY derslik_kodu \
                 """
-        return self.db.execute_query(query, (bolum_id,))
+        rows = reference_cache.get_or_load(
+            ('derslikler', bolum_id), lambda: self.db.execute_query(query, (bolum_id,))
+        )
+        # Planlayıcı ve görünümler satırları değiştirebilir; önbelleğe kopya dışında dokunulmaz
+        return [dict(row) for row in rows]
 
     def get_derslik_by_id(self, derslik_id: int) -> Optional[Dict]:
         """ID'ye göre derslik getir"""
@@ -77,6 +82,7 @@ class DerslikModel:
         )
 
         result = self.db.execute_query(query, params)
+        self.db.on_commit(lambda bolum_id=derslik_data['bolum_id']: reference_cache.invalidate('derslikler', bolum_id))
         logger.info(f"✅ Derslik eklendi: {derslik_data['derslik_kodu']}")
         return result[0]['derslik_id']
 
@@ -105,6 +111,7 @@ class DerslikModel:
             )
 
             result = self.db.execute_query(query, params)
+            self.db.on_commit(lambda: reference_cache.invalidate('derslikler'))
             if result and len(result) > 0:
                 logger.info(f"✅ Derslik güncellendi: {derslik_id} - {derslik_data['derslik_kodu']}")
                 return True
@@ -125,6 +132,7 @@ class DerslikModel:
                 RETURNING derslik_id, derslik_kodu
             """
             result = self.db.execute_query(query, (derslik_id,))
+            self.db.on_commit(lambda: reference_cache.invalidate('derslikler'))
             if result and len(result) > 0:
                 logger.info(f"✅ Derslik silindi: {derslik_id} - {result[0].get('derslik_kodu', '')}")
                 return True
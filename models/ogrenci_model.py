@@ -3,8 +3,9 @@
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Set, Tuple
 from models.database import DatabaseManager
+from models.cache import reference_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,13 @@ class OgrenciModel:
     
     def __init__(self, db: DatabaseManager):
         self.db = db
+        # Hot lookup during imports/reports: prepared once per pooled connection
+        self.db.register_query('ogrenci_by_no', """
+            SELECT o.*, b.bolum_adi
+            FROM ogrenciler o
+            JOIN bolumler b ON o.bolum_id = b.bolum_id
+            WHERE o.ogrenci_no = %s
+        """)
     
     def get_ogrenciler_by_bolum(self, bolum_id: int) -> List[Dict]:
         """Get all students for a department"""
@@ -25,16 +33,58 @@ class OgrenciModel:
         """
         return self.db.execute_query(query, (bolum_id,))
     
+    def get_ogrenciler_sayfasi(
+        self,
+        bolum_id: int,
+        after: Optional[Tuple[int, str]] = None,
+        limit: int = 200,
+        arama: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        One keyset page of a department's students
+
+        Ordered by (sinif, ogrenci_no); pass the last row's key as `after` to
+        get the next page (idx_ogrenciler_sayfa serves the seek).
+        """
+        conditions = ["bolum_id = %s", "aktif = TRUE"]
+        params: list = [bolum_id]
+        if after is not None:
+            conditions.append("(COALESCE(sinif, 0), ogrenci_no) > (%s, %s)")
+            params.extend(after)
+        if arama:
+            conditions.append("(ogrenci_no ILIKE %s OR ad_soyad ILIKE %s)")
+            params.extend([f"%{arama}%"] * 2)
+        query = f"""
+            SELECT ogrenci_no, bolum_id, ad_soyad, sinif, aktif
+            FROM ogrenciler
+            WHERE {' AND '.join(conditions)}
+            ORDER BY COALESCE(sinif, 0), ogrenci_no
+            LIMIT %s
+        """
+        params.append(limit)
+        return self.db.execute_query(query, tuple(params))
+    
+    @staticmethod
+    def sayfa_anahtari(ogrenci: Dict) -> Tuple[int, str]:
+        """Keyset cursor of a row returned by get_ogrenciler_sayfasi"""
+        return (ogrenci.get('sinif') or 0, ogrenci['ogrenci_no'])
+    
     def get_ogrenci_by_no(self, ogrenci_no: str) -> Optional[Dict]:
         """Get student by student number"""
+        result = self.db.execute_prepared('ogrenci_by_no', (ogrenci_no,))
+        return result[0] if result else None
+    
+    def get_mevcut_ogrenci_nolari(self, ogrenci_nolari: List[str]) -> Set[str]:
+        """Which of the given student numbers already exist (one query)"""
+        if not ogrenci_nolari:
+            return set()
         query = """
-            SELECT o.*, b.bolum_adi
-            FROM ogrenciler o
-            JOIN bolumler b ON o.bolum_id = b.bolum_id
-            WHERE o.ogrenci_no = %s
+            SELECT ogrenci_no
+            FROM ogrenciler
+            WHERE ogrenci_no = ANY(%s)
         """
-        result = self.db.execute_query(query, (ogrenci_no,))
-        return result[0] if result else None
+        result = self.db.execute_query(query, (list(ogrenci_nolari),))
+        return {row['ogrenci_no'] for row in result}
     
     def get_ogrenciler_by_ders(self, ders_id: int) -> List[Dict]:
         """Get all students taking a specific course"""
@@ -47,6 +97,17 @@ class OgrenciModel:
         """
         return self.db.execute_query(query, (ders_id,))
     
+    def iter_kayitlar_by_bolum(self, bolum_id: int) -> Iterator[Tuple[int, str]]:
+        """Stream (ders_id, ogrenci_no) enrollments of a department's active courses"""
+        query = """
+            SELECT dk.ders_id, dk.ogrenci_no
+            FROM ders_kayitlari dk
+            JOIN dersler d ON d.ders_id = dk.ders_id
+            JOIN ogrenciler o ON o.ogrenci_no = dk.ogrenci_no
+            WHERE d.bolum_id = %s AND d.aktif = TRUE AND o.aktif = TRUE
+        """
+        return self.db.stream_query(query, (bolum_id,), itersize=5000, row_type='tuple')
+    
     def get_dersler_by_ogrenci(self, ogrenci_no: str) -> List[Dict]:
         """Get all courses taken by a student"""
         query = """
@@ -95,14 +156,46 @@ class OgrenciModel:
         logger.info(f"✅ Student updated: {ogrenci_no}")
         return True
     
+    def insert_kayitlar(self, ogrenci_no: str, ders_ids: List[int]) -> int:
+        """Register a student to many courses in one statement; returns new rows"""
+        if not ders_ids:
+            return 0
+        query = """
+            INSERT INTO ders_kayitlari (ogrenci_no, ders_id)
+            SELECT %s, unnest(%s::int[])
+            ON CONFLICT (ogrenci_no, ders_id) DO NOTHING
+            RETURNING ders_id
+        """
+        result = self.db.execute_query(query, (ogrenci_no, list(ders_ids)))
+        # Cached course rows carry ogrenci_sayisi, which the triggers just changed
+        self.db.on_commit(lambda: reference_cache.invalidate('dersler'))
+        return len(result)
+    
     def delete_ogrenci(self, ogrenci_no: str) -> bool:
-        """Delete student (hard delete)"""
-        # First delete course registrations
-        query1 = "DELETE FROM ders_kayitlari WHERE ogrenci_no = %s"
-        self.db.execute_query(query1, (ogrenci_no,), fetch=False)
-        
-        # Then delete student
-        query2 = "DELETE FROM ogrenciler WHERE ogrenci_no = %s"
-        self.db.execute_query(query2, (ogrenci_no,), fetch=False)
-        logger.info(f"Student deleted: {ogrenci_no}")
+        """Delete student (hard delete, one transaction)"""
+        self.delete_ogrenciler([ogrenci_no])
         return True
+    
+    def delete_ogrenciler(self, ogrenci_nolari: List[str]) -> Dict[str, int]:
+        """
+        Delete many students and their registrations in one statement (hard delete)
+
+        Returns {'ogrenci_sayisi', 'kayit_sayisi'} deleted.
+        """
+        if not ogrenci_nolari:
+            return {'ogrenci_sayisi': 0, 'kayit_sayisi': 0}
+        query = """
+            WITH silinen_kayitlar AS (
+                DELETE FROM ders_kayitlari WHERE ogrenci_no = ANY(%s) RETURNING 1
+            ), silinen_ogrenciler AS (
+                DELETE FROM ogrenciler WHERE ogrenci_no = ANY(%s) RETURNING 1
+            )
+            SELECT (SELECT COUNT(*) FROM silinen_ogrenciler) AS ogrenci_sayisi,
+                   (SELECT COUNT(*) FROM silinen_kayitlar) AS kayit_sayisi
+        """
+        nolar = list(ogrenci_nolari)
+        result = dict(self.db.execute_query(query, (nolar, nolar))[0])
+        # Cached course rows carry ogrenci_sayisi, which the triggers just changed
+        self.db.on_commit(lambda: reference_cache.invalidate('dersler'))
+        logger.info(f"Students deleted: {result['ogrenci_sayisi']} ({result['kayit_sayisi']} registrations)")
+        return result
@@ -4,7 +4,8 @@ Oturma Model - CRUD Operations
 
 import logging
 from typing import List, Dict, Optional
-from models.database import DatabaseManager
+from psycopg2.extras import execute_values
+from models.database import DatabaseManager, read_query, write_query
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,7 @@ class OturmaModel:
     def __init__(self, db: DatabaseManager):
         self.db = db
     
+    @read_query
     def get_by_sinav(self, sinav_id: int) -> List[Dict]:
         """Get seating plan for an exam"""
         query = """
@@ -30,6 +32,7 @@ class OturmaModel:
         """
         return self.db.execute_query(query, (sinav_id,))
     
+    @read_query
     def get_by_derslik(self, sinav_id: int, derslik_id: int) -> List[Dict]:
         """Get seating plan for a specific classroom in an exam"""
         query = """
@@ -42,6 +45,7 @@ class OturmaModel:
         """
         return self.db.execute_query(query, (sinav_id, derslik_id))
     
+    @write_query
     def insert_oturma(self, oturma_data: Dict) -> int:
         """Insert seating assignment"""
         query = """
@@ -61,6 +65,43 @@ class OturmaModel:
         result = self.db.execute_query(query, params)
         return result[0]['oturma_id']
     
+    @write_query
+    def replace_plan_bulk(self, sinav_id: int, plan: List[Dict]) -> int:
+        """Replace an exam's seating plan in one transaction (single multi-row INSERT).
+
+        Conflict/capacity checks and yerlesim_sayisi counters are handled by the
+        statement-level triggers on oturma_planlari, so any violation rolls back
+        the delete as well. Returns inserted row count.
+        """
+        rows = [
+            (
+                sinav_id,
+                oturma['ogrenci_no'],
+                oturma['derslik_id'],
+                oturma.get('satir', oturma.get('satir_no')),
+                oturma.get('sutun', oturma.get('sutun_no'))
+            )
+            for oturma in plan
+        ]
+        
+        with self.db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM oturma_planlari WHERE sinav_id = %s", (sinav_id,))
+            if rows:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO oturma_planlari
+                    (sinav_id, ogrenci_no, derslik_id, satir_no, sutun_no)
+                    VALUES %s
+                    """,
+                    rows,
+                    page_size=len(rows)
+                )
+        
+        logger.info(f"✅ Seating plan saved in bulk: sinav_id={sinav_id}, {len(rows)} seats")
+        return len(rows)
+    
+    @write_query
     def delete_by_sinav(self, sinav_id: int) -> bool:
         """Delete all seating for an exam"""
         query = "DELETE FROM oturma_planlari WHERE sinav_id = %s"
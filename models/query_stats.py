@@ -0,0 +1,209 @@
+"""
+Sorgu İstatistikleri - Query instrumentation
+Per-statement latency histograms, row counts, pool wait time, call-site
+attribution and a slow-query log for DatabaseManager
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+from psycopg2 import extras
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger('models.database.slow')
+
+# Histogram bucket upper bounds (ms); the last bucket is open-ended
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Frames from these files are skipped when looking for the calling model method
+_INTERNAL_FILES = ('query_stats.py', 'database.py', 'contextlib.py', 'extras.py')
+
+_WHITESPACE = re.compile(r'\s+')
+# execute_values inlines the rows; keep only the statement shape
+_INLINE_VALUES = re.compile(r'\bVALUES\s*\(.*$', re.IGNORECASE | re.DOTALL)
+
+
+def _normalize(statement) -> str:
+    """Collapse whitespace so the same SQL from different call sites shares a key"""
+    if isinstance(statement, bytes):
+        statement = statement.decode('utf-8', errors='replace')
+    statement = _WHITESPACE.sub(' ', str(statement)).strip()
+    statement = _INLINE_VALUES.sub('VALUES (...)', statement)
+    return statement[:300]
+
+
+def _call_site() -> str:
+    """First frame outside the DB layer, as module.function:line"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.endswith(_INTERNAL_FILES):
+            module = os.path.splitext(os.path.basename(filename))[0]
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "?"
+
+
+class QueryStats:
+    """
+    Thread-safe query statistics collector
+
+    Env:
+        DB_INSTRUMENTATION=0   disable collection
+        DB_SLOW_QUERY_MS       slow-query threshold in ms (default 500)
+        DB_SLOW_QUERY_LOG      optional file for the slow-query log
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv('DB_INSTRUMENTATION', '1') != '0'
+        self.slow_ms = float(os.getenv('DB_SLOW_QUERY_MS', 500))
+        self._lock = threading.Lock()
+        self.reset()
+
+        slow_log_path = os.getenv('DB_SLOW_QUERY_LOG')
+        if slow_log_path:
+            handler = logging.FileHandler(slow_log_path, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            slow_logger.addHandler(handler)
+
+    def reset(self):
+        """Clear all collected statistics"""
+        with self._lock:
+            self._statements: Dict[str, Dict] = {}
+            self._call_sites: Dict[str, Dict] = defaultdict(lambda: {'calls': 0, 'total_ms': 0.0, 'statements': defaultdict(int)})
+            self._pool_wait = {'checkouts': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'histogram': [0] * (len(BUCKETS_MS) + 1)}
+            self._started = time.time()
+
+    @staticmethod
+    def _bucket(elapsed_ms: float) -> int:
+        for i, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                return i
+        return len(BUCKETS_MS)
+
+    @staticmethod
+    def _labelled(histogram) -> Dict[str, int]:
+        labels = [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, histogram))
+
+    def record(self, statement, elapsed_ms: float, rows: int = -1, error: bool = False,
+               call_site: Optional[str] = None):
+        """Record one executed statement"""
+        if not self.enabled:
+            return
+        key = _normalize(statement)
+        site = call_site or _call_site()
+
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = {
+                    'calls': 0, 'errors': 0, 'rows': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'histogram': [0] * (len(BUCKETS_MS) + 1), 'call_sites': defaultdict(int)
+                }
+            stats['calls'] += 1
+            stats['errors'] += int(error)
+            stats['rows'] += max(rows, 0)
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['histogram'][self._bucket(elapsed_ms)] += 1
+            stats['call_sites'][site] += 1
+
+            site_stats = self._call_sites[site]
+            site_stats['calls'] += 1
+            site_stats['total_ms'] += elapsed_ms
+            site_stats['statements'][key] += 1
+
+        if elapsed_ms >= self.slow_ms:
+            slow_logger.warning(f"🐢 Slow query {elapsed_ms:.1f} ms, rows={rows}, site={site}: {key}")
+
+    def record_pool_wait(self, elapsed_ms: float):
+        """Record time spent waiting for a pooled connection"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pool_wait['checkouts'] += 1
+            self._pool_wait['total_ms'] += elapsed_ms
+            self._pool_wait['max_ms'] = max(self._pool_wait['max_ms'], elapsed_ms)
+            self._pool_wait['histogram'][self._bucket(elapsed_ms)] += 1
+
+    def snapshot(self, top: int = 20) -> Dict:
+        """
+        Current statistics
+
+        'statements' is sorted by total time; 'n_plus_one' lists call sites that
+        ran the same statement many times with at most one row per call.
+        """
+        with self._lock:
+            statements = []
+            for key, stats in self._statements.items():
+                statements.append({
+                    'statement': key,
+                    'calls': stats['calls'],
+                    'errors': stats['errors'],
+                    'rows': stats['rows'],
+                    'total_ms': round(stats['total_ms'], 2),
+                    'avg_ms': round(stats['total_ms'] / stats['calls'], 3),
+                    'max_ms': round(stats['max_ms'], 2),
+                    'histogram': self._labelled(stats['histogram']),
+                    'call_sites': dict(stats['call_sites'])
+                })
+            statements.sort(key=lambda s: s['total_ms'], reverse=True)
+
+            n_plus_one = []
+            for site, site_stats in self._call_sites.items():
+                for key, calls in site_stats['statements'].items():
+                    stats = self._statements[key]
+                    if calls >= 50 and stats['rows'] <= stats['calls']:
+                        n_plus_one.append({'call_site': site, 'statement': key, 'calls': calls})
+            n_plus_one.sort(key=lambda s: s['calls'], reverse=True)
+
+            call_sites = sorted(
+                ({'call_site': site, 'calls': s['calls'], 'total_ms': round(s['total_ms'], 2)}
+                 for site, s in self._call_sites.items()),
+                key=lambda s: s['total_ms'], reverse=True
+            )
+
+            pool_wait = dict(self._pool_wait, histogram=self._labelled(self._pool_wait['histogram']))
+            pool_wait['avg_ms'] = round(pool_wait['total_ms'] / pool_wait['checkouts'], 3) if pool_wait['checkouts'] else 0.0
+
+            return {
+                'since': self._started,
+                'slow_query_ms': self.slow_ms,
+                'statements': statements[:top],
+                'call_sites': call_sites[:top],
+                'n_plus_one': n_plus_one[:top],
+                'pool_wait': pool_wait
+            }
+
+
+query_stats = QueryStats()
+
+
+class InstrumentedCursor(extras.RealDictCursor):
+    """RealDictCursor that reports every execute to query_stats"""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except Exception:
+            query_stats.record(query, (time.perf_counter() - started) * 1000, error=True)
+            raise
+        query_stats.record(query, (time.perf_counter() - started) * 1000, self.rowcount)
+        return result
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            result = super().executemany(query, vars_list)
+        except Exception:
+            query_stats.record(query, (time.perf_counter() - started) * 1000, error=True)
+            raise
+        query_stats.record(query, (time.perf_counter() - started) * 1000, self.rowcount)
+        return result
@@ -4,7 +4,8 @@ Sınav Model - CRUD Operations
 
 import logging
 from typing import List, Dict, Optional
-from models.database import DatabaseManager
+from psycopg2.extras import execute_values
+from models.database import DatabaseManager, read_query, write_query
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,34 @@ class SinavModel:
         """
         return self.db.execute_query(query, (program_id,))
     
+    @read_query
+    def get_sinavlar_for_export(self, program_id: int) -> List[Dict]:
+        """get_sinavlar_by_program for exports and reports, read from the replica"""
+        return self.get_sinavlar_by_program(program_id)
+    
+    @read_query
+    def get_ogrenci_yukleri(self, program_id: int, ardisik_esik_dk: int = 15,
+                            sadece_sorunlu: bool = False) -> List[Dict]:
+        """Per-student overlaps, exams per day and back-to-back counts (program_ogrenci_yukleri)"""
+        query = "SELECT * FROM program_ogrenci_yukleri(%s, %s, %s)"
+        return self.db.execute_query(query, (program_id, ardisik_esik_dk, sadece_sorunlu))
+    
+    def get_program_exam_rooms(self, program_id: int) -> List[Dict]:
+        """Get one row per (exam, classroom) of a program, with capacities"""
+        query = """
+            SELECT s.sinav_id, s.ders_id, d.ders_kodu, s.tarih,
+                   s.baslangic_saati, s.bitis_saati,
+                   sd.derslik_id, dr.derslik_kodu, dr.kapasite
+            FROM sinavlar s
+            JOIN dersler d ON s.ders_id = d.ders_id
+            LEFT JOIN sinav_derslikleri sd ON s.sinav_id = sd.sinav_id
+            LEFT JOIN derslikler dr ON sd.derslik_id = dr.derslik_id
+            WHERE s.program_id = %s
+            ORDER BY s.tarih, s.baslangic_saati
+        """
+        return self.db.execute_query(query, (program_id,))
+    
+    @write_query
     def create_program(self, program_data: Dict) -> int:
         """Create exam program"""
         query = """
@@ -65,6 +94,7 @@ class SinavModel:
         logger.info(f"✅ Exam program created: {program_data['program_adi']}")
         return result[0]['program_id']
     
+    @write_query
     def insert_sinav(self, sinav_data: Dict) -> int:
         """Insert new exam"""
         query = """
@@ -85,6 +115,7 @@ class SinavModel:
         logger.info(f"✅ Exam created: {sinav_data['ders_id']}")
         return result[0]['sinav_id']
     
+    @write_query
     def assign_derslik(self, sinav_id: int, derslik_id: int) -> bool:
         """Assign classroom to exam"""
         query = """
@@ -96,6 +127,7 @@ class SinavModel:
         logger.info(f"✅ Classroom assigned to exam: {sinav_id}")
         return True
 
+    @write_query
     def insert_exam_with_classrooms(self, sinav_data: Dict, derslik_ids: List[int]) -> int:
         """Insert exam and assign classrooms atomically in a single transaction.
 
@@ -151,6 +183,69 @@ class SinavModel:
                 )
                 raise
     
+    @write_query
+    def save_program_bulk(self, program_data: Dict, exams: List[Dict]) -> Dict:
+        """Insert a program with all its exams and classrooms in one transaction.
+
+        exams: [{'ders_id', 'tarih', 'baslangic_saati', 'bitis_saati', 'derslik_ids'}]
+        Uses multi-row INSERTs; classroom conflicts are rejected by the
+        exc_derslik_cakisma EXCLUDE constraint (fed by a statement-level trigger),
+        so any conflict rolls back the whole program. Returns {'program_id', 'sinav_ids': {ders_id: sinav_id}}.
+        """
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO sinav_programi
+                (bolum_id, program_adi, sinav_tipi, baslangic_tarihi, bitis_tarihi)
+                VALUES (%s, %s, %s, %s, %s)
+                RETURNING program_id
+                """,
+                (
+                    program_data['bolum_id'],
+                    program_data['program_adi'],
+                    program_data.get('sinav_tipi', 'Final'),
+                    program_data['baslangic_tarihi'],
+                    program_data['bitis_tarihi']
+                )
+            )
+            program_id = cursor.fetchone()['program_id']
+
+            rows = execute_values(
+                cursor,
+                """
+                INSERT INTO sinavlar (program_id, ders_id, tarih, baslangic_saati, bitis_saati)
+                VALUES %s
+                RETURNING sinav_id, ders_id
+                """,
+                [
+                    (program_id, e['ders_id'], e['tarih'], e['baslangic_saati'], e['bitis_saati'])
+                    for e in exams
+                ],
+                page_size=max(len(exams), 1),
+                fetch=True
+            )
+            sinav_ids = {row['ders_id']: row['sinav_id'] for row in rows}
+
+            derslik_rows = [
+                (sinav_ids[e['ders_id']], derslik_id)
+                for e in exams
+                for derslik_id in dict.fromkeys(e.get('derslik_ids') or [])
+            ]
+            if derslik_rows:
+                execute_values(
+                    cursor,
+                    "INSERT INTO sinav_derslikleri (sinav_id, derslik_id) VALUES %s",
+                    derslik_rows,
+                    page_size=len(derslik_rows)
+                )
+
+        logger.info(
+            f"✅ Exam program saved in bulk: program_id={program_id}, "
+            f"{len(sinav_ids)} exams, {len(derslik_rows)} classroom assignments"
+        )
+        return {'program_id': program_id, 'sinav_ids': sinav_ids}
+    
+    @write_query
     def delete_program(self, program_id: int) -> bool:
         """Delete exam program"""
         query = "DELETE FROM sinav_programi WHERE program_id = %s"
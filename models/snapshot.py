@@ -0,0 +1,389 @@
+"""
+Department Snapshot - Offline scheduling dataset
+Exports a department's scheduling data into a single SQLite file and loads it
+back into memory so SinavPlanlama / OturmaPlanlama can run without PostgreSQL
+"""
+
+import json
+import logging
+import sqlite3
+from collections import defaultdict
+from datetime import datetime, date, time, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DepartmentSnapshot:
+    """
+    In-memory department dataset with the same read API as the models
+
+    The planners only call get_dersler_by_bolum, get_derslikler_by_bolum,
+    get_ogrenciler_by_ders, get_sinav_by_id and get_sinav_derslikleri, so a
+    snapshot can be passed in place of DersModel, DerslikModel, OgrenciModel
+    and SinavModel.
+    """
+
+    FORMAT_VERSION = 1
+
+    _SCHEMA = """
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE dersler (
+            ders_id INTEGER PRIMARY KEY, bolum_id INTEGER, ders_kodu TEXT, ders_adi TEXT,
+            ogretim_elemani TEXT, sinif INTEGER, ders_yapisi TEXT
+        );
+        CREATE TABLE derslikler (
+            derslik_id INTEGER PRIMARY KEY, bolum_id INTEGER, derslik_kodu TEXT, derslik_adi TEXT,
+            kapasite INTEGER, satir_sayisi INTEGER, sutun_sayisi INTEGER, sira_yapisi INTEGER
+        );
+        CREATE TABLE ogrenciler (
+            ogrenci_no TEXT PRIMARY KEY, bolum_id INTEGER, ad_soyad TEXT, sinif INTEGER
+        );
+        CREATE TABLE ders_kayitlari (
+            ogrenci_no TEXT NOT NULL, ders_id INTEGER NOT NULL, PRIMARY KEY (ders_id, ogrenci_no)
+        ) WITHOUT ROWID;
+        CREATE TABLE sinavlar (
+            sinav_id INTEGER PRIMARY KEY, program_id INTEGER, ders_id INTEGER,
+            tarih TEXT, baslangic_saati TEXT, bitis_saati TEXT, ogrenci_sayisi INTEGER
+        );
+        CREATE TABLE sinav_derslikleri (
+            sinav_id INTEGER NOT NULL, derslik_id INTEGER NOT NULL, PRIMARY KEY (sinav_id, derslik_id)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(
+        self,
+        meta: Dict,
+        dersler: List[Dict],
+        derslikler: List[Dict],
+        ogrenciler: List[Dict],
+        kayitlar: List[tuple],
+        sinavlar: Optional[List[Dict]] = None,
+        sinav_derslikleri: Optional[List[tuple]] = None
+    ):
+        self.meta = meta
+        self.bolum_id = meta.get('bolum_id')
+        self.settings = meta.get('settings', {})
+        self.params = meta.get('params', {})
+
+        self._dersler = sorted(dersler, key=lambda d: (d['sinif'], d['ders_kodu']))
+        self._dersler_by_id = {d['ders_id']: d for d in self._dersler}
+        self._derslikler = sorted(derslikler, key=lambda d: d['derslik_kodu'])
+        self._derslikler_by_id = {d['derslik_id']: d for d in self._derslikler}
+        self._ogrenciler = {o['ogrenci_no']: o for o in ogrenciler}
+
+        self._ogrenciler_by_ders: Dict[int, List[Dict]] = defaultdict(list)
+        for ogrenci_no, ders_id in kayitlar:
+            ogrenci = self._ogrenciler.get(ogrenci_no)
+            if ogrenci is not None:
+                self._ogrenciler_by_ders[ders_id].append(ogrenci)
+        for ogrenci_list in self._ogrenciler_by_ders.values():
+            ogrenci_list.sort(key=lambda o: o['ad_soyad'])
+        # Same counter the live dersler table keeps via triggers
+        for ders in self._dersler:
+            ders['ogrenci_sayisi'] = len(self._ogrenciler_by_ders.get(ders['ders_id'], []))
+
+        self._sinavlar = {s['sinav_id']: s for s in (sinavlar or [])}
+        self._sinav_derslikleri: Dict[int, List[int]] = defaultdict(list)
+        for sinav_id, derslik_id in (sinav_derslikleri or []):
+            self._sinav_derslikleri[sinav_id].append(derslik_id)
+
+    # ------------------------------------------------------------------
+    # Model-compatible read API
+    # ------------------------------------------------------------------
+
+    def get_dersler_by_bolum(self, bolum_id: int) -> List[Dict]:
+        """Get all courses for a department"""
+        return [d for d in self._dersler if d['bolum_id'] == bolum_id]
+
+    def get_ders_by_id(self, ders_id: int) -> Optional[Dict]:
+        """Get course by ID"""
+        return self._dersler_by_id.get(ders_id)
+
+    def get_ogrenci_sayilari(self, ders_ids: List[int]) -> Dict[int, int]:
+        """Enrollment counts per course"""
+        return {
+            ders_id: self._dersler_by_id[ders_id]['ogrenci_sayisi']
+            for ders_id in ders_ids if ders_id in self._dersler_by_id
+        }
+
+    def get_derslikler_by_bolum(self, bolum_id: int) -> List[Dict]:
+        """Get all classrooms for a department"""
+        return [d for d in self._derslikler if d['bolum_id'] == bolum_id]
+
+    def get_ogrenciler_by_ders(self, ders_id: int) -> List[Dict]:
+        """Get all students taking a specific course (new list, safe to shuffle)"""
+        return list(self._ogrenciler_by_ders.get(ders_id, []))
+
+    def iter_kayitlar_by_bolum(self, bolum_id: int) -> Iterator[Tuple[int, str]]:
+        """Yield (ders_id, ogrenci_no) enrollments of a department's courses"""
+        for ders in self.get_dersler_by_bolum(bolum_id):
+            for ogrenci in self._ogrenciler_by_ders.get(ders['ders_id'], []):
+                yield ders['ders_id'], ogrenci['ogrenci_no']
+
+    def get_sinav_by_id(self, sinav_id: int) -> Optional[Dict]:
+        """Get exam details by ID"""
+        return self._sinavlar.get(sinav_id)
+
+    def get_sinav_derslikleri(self, sinav_id: int) -> List[Dict]:
+        """Get all classrooms assigned to an exam"""
+        derslikler = [
+            self._derslikler_by_id[derslik_id]
+            for derslik_id in self._sinav_derslikleri.get(sinav_id, [])
+            if derslik_id in self._derslikler_by_id
+        ]
+        return sorted(derslikler, key=lambda d: d['derslik_kodu'])
+
+    def get_sinavlar(self) -> List[Dict]:
+        """Get all exams in the snapshot ordered by date and time"""
+        return sorted(self._sinavlar.values(), key=lambda s: (s['tarih'], s['baslangic_saati']))
+
+    # ------------------------------------------------------------------
+    # What-if support
+    # ------------------------------------------------------------------
+
+    def add_schedule(self, schedule: List[Dict], program_id: int = 0) -> List[Dict]:
+        """
+        Register an in-memory schedule as exams so seating can run offline
+
+        Entries are grouped by (ders_id, tarih_saat) exactly like
+        SinavController.save_exam_schedule. Returns the created exam dicts.
+        """
+        groups: Dict[tuple, List[Dict]] = defaultdict(list)
+        for entry in schedule:
+            groups[(entry.get('ders_id'), entry.get('tarih_saat'))].append(entry)
+
+        next_id = max(self._sinavlar.keys(), default=0) + 1
+        created = []
+
+        for (ders_id, tarih_saat), entries in groups.items():
+            ders = self._dersler_by_id.get(ders_id)
+            if ders is None:
+                continue
+            if isinstance(tarih_saat, str):
+                tarih_saat = datetime.fromisoformat(tarih_saat)
+
+            sure = entries[0].get('sure', 120)
+            bitis = tarih_saat + timedelta(minutes=sure)
+            sinav = {
+                'sinav_id': next_id,
+                'program_id': program_id,
+                'ders_id': ders_id,
+                'tarih': tarih_saat.date(),
+                'baslangic_saati': tarih_saat.time(),
+                'bitis_saati': bitis.time(),
+                'ogrenci_sayisi': len(self._ogrenciler_by_ders.get(ders_id, [])),
+                'ders_kodu': ders['ders_kodu'],
+                'ders_adi': ders['ders_adi'],
+                'sinif': ders['sinif'],
+                'tarih_saat': f"{tarih_saat.date()} {tarih_saat.time()}"
+            }
+            self._sinavlar[next_id] = sinav
+            self._sinav_derslikleri[next_id] = list(dict.fromkeys(
+                e['derslik_id'] for e in entries if e.get('derslik_id') is not None
+            ))
+            created.append(sinav)
+            next_id += 1
+
+        return created
+
+    # ------------------------------------------------------------------
+    # Export / import
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def export_from_db(
+        cls,
+        db,
+        bolum_id: int,
+        file_path: str,
+        program_id: Optional[int] = None,
+        params: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Export a department's scheduling dataset from PostgreSQL to a SQLite file
+
+        Args:
+            db: DatabaseManager instance
+            bolum_id: Department ID
+            file_path: Target .sqlite file (overwritten)
+            program_id: Optionally include a stored program's exams
+            params: Optional planning parameters stored alongside the data
+
+        Returns:
+            Row counts per table
+        """
+        bolum = db.execute_query(
+            "SELECT bolum_id, bolum_kodu, bolum_adi FROM bolumler WHERE bolum_id = %s",
+            (bolum_id,)
+        )
+        if not bolum:
+            raise ValueError(f"Bölüm bulunamadı: {bolum_id}")
+
+        dersler = db.execute_query("""
+            SELECT ders_id, bolum_id, ders_kodu, ders_adi, ogretim_elemani, sinif, ders_yapisi
+            FROM dersler
+            WHERE bolum_id = %s AND aktif = TRUE
+        """, (bolum_id,))
+
+        derslikler = db.execute_query("""
+            SELECT derslik_id, bolum_id, derslik_kodu, derslik_adi, kapasite,
+                   satir_sayisi, sutun_sayisi, sira_yapisi
+            FROM derslikler
+            WHERE bolum_id = %s AND aktif = TRUE
+        """, (bolum_id,))
+
+        # Enrollments and students are the large tables: streamed straight into SQLite below
+        kayitlar = db.stream_query("""
+            SELECT dk.ogrenci_no, dk.ders_id
+            FROM ders_kayitlari dk
+            JOIN dersler d ON d.ders_id = dk.ders_id
+            WHERE d.bolum_id = %s AND d.aktif = TRUE
+        """, (bolum_id,), itersize=5000, row_type='tuple')
+
+        # Students of the department plus anyone enrolled in its courses
+        ogrenciler = db.stream_query("""
+            SELECT o.ogrenci_no, o.bolum_id, o.ad_soyad, o.sinif
+            FROM ogrenciler o
+            WHERE o.aktif = TRUE
+              AND (o.bolum_id = %s OR EXISTS (
+                    SELECT 1 FROM ders_kayitlari dk
+                    JOIN dersler d ON d.ders_id = dk.ders_id
+                    WHERE dk.ogrenci_no = o.ogrenci_no AND d.bolum_id = %s
+              ))
+        """, (bolum_id, bolum_id), itersize=5000, row_type='tuple')
+
+        streamed = {'ogrenciler': 0, 'ders_kayitlari': 0}
+
+        def counted(rows, key):
+            for row in rows:
+                streamed[key] += 1
+                yield row
+
+        settings = {
+            row['setting_key']: row['setting_value']
+            for row in db.execute_query("SELECT setting_key, setting_value FROM system_settings")
+        }
+
+        sinavlar = []
+        sinav_derslikleri = []
+        if program_id is not None:
+            sinavlar = db.execute_query("""
+                SELECT sinav_id, program_id, ders_id, tarih, baslangic_saati, bitis_saati, ogrenci_sayisi
+                FROM sinavlar
+                WHERE program_id = %s
+            """, (program_id,))
+            sinav_derslikleri = db.execute_query("""
+                SELECT sd.sinav_id, sd.derslik_id
+                FROM sinav_derslikleri sd
+                JOIN sinavlar s ON s.sinav_id = sd.sinav_id
+                WHERE s.program_id = %s
+            """, (program_id,))
+
+        meta = {
+            'format_version': cls.FORMAT_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'bolum_id': bolum_id,
+            'bolum_kodu': bolum[0]['bolum_kodu'],
+            'bolum_adi': bolum[0]['bolum_adi'],
+            'program_id': program_id,
+            'settings': settings,
+            'params': params or {}
+        }
+
+        path = Path(file_path)
+        if path.exists():
+            path.unlink()
+
+        conn = sqlite3.connect(str(path))
+        try:
+            conn.executescript(cls._SCHEMA)
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [(k, json.dumps(v, ensure_ascii=False, default=str)) for k, v in meta.items()]
+            )
+            conn.executemany(
+                "INSERT INTO dersler VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(d['ders_id'], d['bolum_id'], d['ders_kodu'], d['ders_adi'],
+                  d['ogretim_elemani'], d['sinif'], d['ders_yapisi']) for d in dersler]
+            )
+            conn.executemany(
+                "INSERT INTO derslikler VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(d['derslik_id'], d['bolum_id'], d['derslik_kodu'], d['derslik_adi'], d['kapasite'],
+                  d['satir_sayisi'], d['sutun_sayisi'], d['sira_yapisi']) for d in derslikler]
+            )
+            conn.executemany("INSERT INTO ogrenciler VALUES (?, ?, ?, ?)", counted(ogrenciler, 'ogrenciler'))
+            conn.executemany("INSERT INTO ders_kayitlari VALUES (?, ?)", counted(kayitlar, 'ders_kayitlari'))
+            conn.executemany(
+                "INSERT INTO sinavlar VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(s['sinav_id'], s['program_id'], s['ders_id'], s['tarih'].isoformat(),
+                  s['baslangic_saati'].isoformat(), s['bitis_saati'].isoformat(),
+                  s['ogrenci_sayisi']) for s in sinavlar]
+            )
+            conn.executemany(
+                "INSERT INTO sinav_derslikleri VALUES (?, ?)",
+                [(sd['sinav_id'], sd['derslik_id']) for sd in sinav_derslikleri]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+            # Release pooled connections if a stream was not fully consumed
+            kayitlar.close()
+            ogrenciler.close()
+
+        counts = {
+            'dersler': len(dersler),
+            'derslikler': len(derslikler),
+            'ogrenciler': streamed['ogrenciler'],
+            'ders_kayitlari': streamed['ders_kayitlari'],
+            'sinavlar': len(sinavlar)
+        }
+        logger.info(f"✅ Snapshot exported: {file_path} → {counts}")
+        return counts
+
+    @classmethod
+    def load(cls, file_path: str) -> 'DepartmentSnapshot':
+        """Load a snapshot file fully into memory"""
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"Snapshot dosyası bulunamadı: {file_path}")
+
+        conn = sqlite3.connect(str(file_path))
+        conn.row_factory = sqlite3.Row
+        try:
+            meta = {row['key']: json.loads(row['value']) for row in conn.execute("SELECT key, value FROM meta")}
+            version = meta.get('format_version')
+            if version != cls.FORMAT_VERSION:
+                raise ValueError(f"Desteklenmeyen snapshot sürümü: {version}")
+
+            dersler = [dict(row, aktif=True) for row in conn.execute("SELECT * FROM dersler")]
+            derslikler = [dict(row, aktif=True) for row in conn.execute("SELECT * FROM derslikler")]
+            ogrenciler = [dict(row, aktif=True) for row in conn.execute("SELECT * FROM ogrenciler")]
+            kayitlar = conn.execute("SELECT ogrenci_no, ders_id FROM ders_kayitlari").fetchall()
+            sinav_derslikleri = conn.execute("SELECT sinav_id, derslik_id FROM sinav_derslikleri").fetchall()
+
+            dersler_by_id = {d['ders_id']: d for d in dersler}
+            sinavlar = []
+            for row in conn.execute("SELECT * FROM sinavlar"):
+                sinav = dict(row)
+                sinav['tarih'] = date.fromisoformat(sinav['tarih'])
+                sinav['baslangic_saati'] = time.fromisoformat(sinav['baslangic_saati'])
+                sinav['bitis_saati'] = time.fromisoformat(sinav['bitis_saati'])
+                ders = dersler_by_id.get(sinav['ders_id'], {})
+                sinav['ders_kodu'] = ders.get('ders_kodu')
+                sinav['ders_adi'] = ders.get('ders_adi')
+                sinav['sinif'] = ders.get('sinif')
+                sinav['tarih_saat'] = f"{sinav['tarih']} {sinav['baslangic_saati']}"
+                sinavlar.append(sinav)
+        finally:
+            conn.close()
+
+        snapshot = cls(
+            meta, dersler, derslikler, ogrenciler,
+            [tuple(k) for k in kayitlar], sinavlar, [tuple(sd) for sd in sinav_derslikleri]
+        )
+        logger.info(
+            f"📦 Snapshot loaded: {file_path} ({len(dersler)} ders, {len(derslikler)} derslik, "
+            f"{len(ogrenciler)} öğrenci, {len(kayitlar)} kayıt)"
+        )
+        return snapshot
@@ -3,7 +3,7 @@ User Model - CRUD Operations
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from models.database import DatabaseManager
 
 logger = logging.getLogger(__name__)
@@ -45,6 +45,43 @@ class UserModel:
         """
         return self.db.execute_query(query, (role,))
     
+    def get_users_sayfasi(
+        self,
+        after: Optional[Tuple[str, str, int]] = None,
+        limit: int = 200,
+        exclude_user_id: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        One keyset page of active users with their department name
+
+        Ordered by (role, ad_soyad, user_id); pass the last row's key as
+        `after` for the next page (idx_users_sayfa serves the seek).
+        """
+        conditions = ["u.aktif = TRUE"]
+        params: list = []
+        if exclude_user_id is not None:
+            conditions.append("u.user_id != %s")
+            params.append(exclude_user_id)
+        if after is not None:
+            conditions.append("(u.role, u.ad_soyad, u.user_id) > (%s::role_enum, %s, %s)")
+            params.extend(after)
+        query = f"""
+            SELECT u.user_id, u.ad_soyad, u.email, u.role, u.bolum_id, u.son_giris,
+                   b.bolum_adi
+            FROM users u
+            LEFT JOIN bolumler b ON u.bolum_id = b.bolum_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY u.role, u.ad_soyad, u.user_id
+            LIMIT %s
+        """
+        params.append(limit)
+        return self.db.execute_query(query, tuple(params))
+    
+    @staticmethod
+    def sayfa_anahtari(user: Dict) -> Tuple[str, str, int]:
+        """Keyset cursor of a row returned by get_users_sayfasi"""
+        return (user['role'], user['ad_soyad'], user['user_id'])
+    
     def insert_user(self, user_data: Dict) -> int:
         """Insert new user"""
         query = """
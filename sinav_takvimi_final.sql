@@ -13,6 +13,7 @@ CREATE DATABASE sinav_takvimi_db
 \c sinav_takvimi_db;
 
 CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+CREATE EXTENSION IF NOT EXISTS "btree_gist"; -- EXCLUDE (int/varchar WITH =, tsrange WITH &&)
 CREATE EXTENSION IF NOT EXISTS "pg_stat_statements"; -- Performans monitoring
 
 -- Connection Pooling için ayarlar
@@ -294,6 +295,8 @@ CREATE TABLE users (
 );
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_aktif_role ON users(aktif, role) WHERE aktif = TRUE;
+-- Kullanıcı listesi sayfalama (keyset): ORDER BY role, ad_soyad, user_id
+CREATE INDEX idx_users_sayfa ON users(role, ad_soyad, user_id) WHERE aktif = TRUE;
 
 CREATE TABLE derslikler (
     derslik_id SERIAL PRIMARY KEY,
@@ -317,10 +320,14 @@ CREATE TABLE dersler (
     ogretim_elemani VARCHAR(150) NOT NULL,
     sinif INT NOT NULL CHECK (sinif BETWEEN 1 AND 5),
     ders_yapisi ders_yapisi_enum NOT NULL,
-    aktif BOOLEAN DEFAULT TRUE
+    aktif BOOLEAN DEFAULT TRUE,
+    -- ders_kayitlari tetikleyicileriyle güncel tutulan kayıtlı öğrenci sayısı
+    ogrenci_sayisi INT NOT NULL DEFAULT 0 CHECK (ogrenci_sayisi >= 0)
 );
 CREATE INDEX idx_dersler_bolum_aktif ON dersler(bolum_id, aktif) WHERE aktif = TRUE;
 CREATE INDEX idx_dersler_kodu_trgm ON dersler USING GIN(ders_kodu gin_trgm_ops);
+-- Ders listesi sayfalama (keyset): ORDER BY sinif, ders_kodu
+CREATE INDEX idx_dersler_sayfa ON dersler(bolum_id, sinif, ders_kodu) WHERE aktif = TRUE;
 
 CREATE TABLE ogrenciler (
     ogrenci_no VARCHAR(20) PRIMARY KEY,
@@ -331,6 +338,8 @@ CREATE TABLE ogrenciler (
 );
 CREATE INDEX idx_ogrenciler_bolum_aktif ON ogrenciler(bolum_id) WHERE aktif = TRUE;
 CREATE INDEX idx_ogrenciler_ad_soyad_trgm ON ogrenciler USING GIN(ad_soyad gin_trgm_ops);
+-- Öğrenci listesi sayfalama (keyset): ORDER BY COALESCE(sinif, 0), ogrenci_no
+CREATE INDEX idx_ogrenciler_sayfa ON ogrenciler(bolum_id, (COALESCE(sinif, 0)), ogrenci_no) WHERE aktif = TRUE;
 
 CREATE TABLE ders_kayitlari (
     kayit_id SERIAL PRIMARY KEY,
@@ -338,7 +347,8 @@ CREATE TABLE ders_kayitlari (
     ders_id INT NOT NULL REFERENCES dersler(ders_id) ON DELETE CASCADE,
     UNIQUE(ogrenci_no, ders_id)
 );
-CREATE INDEX idx_kayit_ders ON ders_kayitlari(ders_id);
+-- INCLUDE: program_ogrenci_yukleri() sınav -> öğrenci eşlemesini index-only okur
+CREATE INDEX idx_kayit_ders ON ders_kayitlari(ders_id) INCLUDE (ogrenci_no);
 CREATE INDEX idx_kayit_ogrenci ON ders_kayitlari(ogrenci_no);
 
 -- ============================================================
@@ -377,7 +387,7 @@ CREATE TABLE sinavlar (
     UNIQUE(program_id, ders_id),
     CONSTRAINT chk_saat_sirasi CHECK (bitis_saati > baslangic_saati)
 );
-CREATE INDEX idx_sinav_program_tarih ON sinavlar(program_id, tarih, baslangic_saati);
+CREATE INDEX idx_sinav_program_tarih ON sinavlar(program_id, tarih, baslangic_saati) INCLUDE (ders_id, bitis_saati);
 
 -- KRİTİK: Yerleşim sayacı ile performans optimizasyonu
 CREATE TABLE sinav_derslikleri (
@@ -405,6 +415,26 @@ CREATE TABLE oturma_planlari (
 CREATE INDEX idx_oturma_sinav_derslik ON oturma_planlari(sinav_id, derslik_id);
 CREATE INDEX idx_oturma_ogrenci ON oturma_planlari(ogrenci_no);
 
+-- KRİTİK: Rezervasyon tabloları - her derslik/öğrenci kullanımı bir zaman aralığı (tsrange).
+-- btree_gist EXCLUDE kısıtları çakışmayı GiST index üzerinden ve eşzamanlı yazımlarda
+-- da yarışsız engeller. Tetikleyicilerle beslenir (BÖLÜM 4); uygulama doğrudan yazmaz.
+-- Aralıklar yarı açıktır '[)': biri 10:00'da biterken diğeri 10:00'da başlayabilir.
+CREATE TABLE derslik_rezervasyonlari (
+    sinav_id INT NOT NULL REFERENCES sinavlar(sinav_id) ON DELETE CASCADE,
+    derslik_id INT NOT NULL REFERENCES derslikler(derslik_id) ON DELETE CASCADE,
+    zaman TSRANGE NOT NULL,
+    PRIMARY KEY (sinav_id, derslik_id),
+    CONSTRAINT exc_derslik_cakisma EXCLUDE USING gist (derslik_id WITH =, zaman WITH &&)
+);
+
+CREATE TABLE ogrenci_sinav_zamanlari (
+    sinav_id INT NOT NULL REFERENCES sinavlar(sinav_id) ON DELETE CASCADE,
+    ogrenci_no VARCHAR(20) NOT NULL REFERENCES ogrenciler(ogrenci_no) ON DELETE CASCADE,
+    zaman TSRANGE NOT NULL,
+    PRIMARY KEY (sinav_id, ogrenci_no),
+    CONSTRAINT exc_ogrenci_cakisma EXCLUDE USING gist (ogrenci_no WITH =, zaman WITH &&)
+);
+
 -- ============================================================
 -- BÖLÜM 3: EXCEL IMPORT LOG
 -- ============================================================
@@ -425,122 +455,318 @@ CREATE INDEX idx_import_logs_created ON import_logs(created_at DESC);
 -- BÖLÜM 4: YÜKSEK PERFORMANS TRİGGERLAR
 -- ============================================================
 
--- 1. Sınav Öğrenci Sayısı (INSERT ve UPDATE'te otomatik güncelleme)
+-- 1a. Ders Kayıt Sayacı (STATEMENT-LEVEL, transition table)
+-- dersler.ogrenci_sayisi, ders başına tek UPDATE ile artırılır/azaltılır;
+-- toplu öğrenci/kayıt yüklemesinde satır başına değil ifade başına çalışır.
+CREATE OR REPLACE FUNCTION trg_ders_kayit_sayaci() 
+RETURNS TRIGGER AS $$
+BEGIN
+    IF (TG_OP IN ('INSERT', 'UPDATE')) THEN
+        UPDATE dersler d
+        SET ogrenci_sayisi = d.ogrenci_sayisi + y.adet
+        FROM (
+            SELECT ders_id, COUNT(*) AS adet
+            FROM yeni_kayitlar
+            GROUP BY ders_id
+        ) y
+        WHERE d.ders_id = y.ders_id;
+    END IF;
+
+    IF (TG_OP IN ('DELETE', 'UPDATE')) THEN
+        UPDATE dersler d
+        SET ogrenci_sayisi = GREATEST(d.ogrenci_sayisi - y.adet, 0)
+        FROM (
+            SELECT ders_id, COUNT(*) AS adet
+            FROM eski_kayitlar
+            GROUP BY ders_id
+        ) y
+        WHERE d.ders_id = y.ders_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_ders_kayit_sayaci_ekle 
+AFTER INSERT ON ders_kayitlari
+REFERENCING NEW TABLE AS yeni_kayitlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_ders_kayit_sayaci();
+
+CREATE TRIGGER trg_ders_kayit_sayaci_guncelle 
+AFTER UPDATE ON ders_kayitlari
+REFERENCING OLD TABLE AS eski_kayitlar NEW TABLE AS yeni_kayitlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_ders_kayit_sayaci();
+
+CREATE TRIGGER trg_ders_kayit_sayaci_sil 
+AFTER DELETE ON ders_kayitlari
+REFERENCING OLD TABLE AS eski_kayitlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_ders_kayit_sayaci();
+
+-- 1b. Sınav Öğrenci Sayısı (INSERT ve UPDATE'te otomatik güncelleme)
+-- COUNT(*) yerine sayaç okunur: birincil anahtar üzerinden tek satır
 CREATE OR REPLACE FUNCTION trg_sinav_ogrenci_sayisi() 
-RETURNS TRIGGER AS $
+RETURNS TRIGGER AS $$
 BEGIN
-    NEW.ogrenci_sayisi := (
-        SELECT COUNT(*) FROM ders_kayitlari WHERE ders_id = NEW.ders_id
+    NEW.ogrenci_sayisi := COALESCE(
+        (SELECT d.ogrenci_sayisi FROM dersler d WHERE d.ders_id = NEW.ders_id), 0
     );
     RETURN NEW;
 END;
-$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql;
 
 CREATE TRIGGER trg_set_ogrenci_sayisi
 BEFORE INSERT OR UPDATE OF ders_id ON sinavlar
 FOR EACH ROW EXECUTE FUNCTION trg_sinav_ogrenci_sayisi();
 
--- 2. Derslik Zaman Çakışma Kontrolü (Optimized Query)
-CREATE OR REPLACE FUNCTION trg_derslik_cakisma_kontrol() 
+-- 2. Derslik Rezervasyonları (STATEMENT-LEVEL, transition table)
+-- sinav_derslikleri yazımları derslik_rezervasyonlari'na yansıtılır; çakışmayı
+-- exc_derslik_cakisma EXCLUDE kısıtı yakalar (SQLSTATE 23P01). Eski OVERLAPS'lı
+-- self-join gibi kayıtlı sınav sayısıyla büyümez ve eşzamanlı INSERT'lerde yarış olmaz.
+CREATE OR REPLACE FUNCTION trg_derslik_rezervasyon_yaz() 
 RETURNS TRIGGER AS $$
 BEGIN
-    -- Index kullanarak hızlı sorgulama
-    IF EXISTS (
-        SELECT 1 
-        FROM sinav_derslikleri sd
-        INNER JOIN sinavlar s1 ON sd.sinav_id = s1.sinav_id
-        INNER JOIN sinavlar s2 ON s2.sinav_id = NEW.sinav_id
-        WHERE sd.derslik_id = NEW.derslik_id
-          AND s1.tarih = s2.tarih
-          AND s1.sinav_id != NEW.sinav_id
-          AND (s1.baslangic_saati, s1.bitis_saati) OVERLAPS (s2.baslangic_saati, s2.bitis_saati)
-    ) THEN
-        RAISE EXCEPTION 'Derslik çakışması tespit edildi!';
+    IF (TG_OP = 'INSERT') THEN
+        INSERT INTO derslik_rezervasyonlari (sinav_id, derslik_id, zaman)
+        SELECT n.sinav_id, n.derslik_id,
+               tsrange(s.tarih + s.baslangic_saati, s.tarih + s.bitis_saati, '[)')
+        FROM yeni_satirlar n
+        INNER JOIN sinavlar s ON s.sinav_id = n.sinav_id;
+    ELSIF (TG_OP = 'UPDATE') THEN
+        -- Sadece sinav_id/derslik_id değişen satırlar (yerlesim_sayisi güncellemeleri atlanır)
+        DELETE FROM derslik_rezervasyonlari r
+        USING eski_satirlar o
+        INNER JOIN yeni_satirlar n ON n.id = o.id
+        WHERE r.sinav_id = o.sinav_id AND r.derslik_id = o.derslik_id
+          AND (n.sinav_id, n.derslik_id) IS DISTINCT FROM (o.sinav_id, o.derslik_id);
+
+        INSERT INTO derslik_rezervasyonlari (sinav_id, derslik_id, zaman)
+        SELECT n.sinav_id, n.derslik_id,
+               tsrange(s.tarih + s.baslangic_saati, s.tarih + s.bitis_saati, '[)')
+        FROM yeni_satirlar n
+        INNER JOIN eski_satirlar o ON o.id = n.id
+        INNER JOIN sinavlar s ON s.sinav_id = n.sinav_id
+        WHERE (n.sinav_id, n.derslik_id) IS DISTINCT FROM (o.sinav_id, o.derslik_id);
+    ELSE
+        DELETE FROM derslik_rezervasyonlari r
+        USING eski_satirlar o
+        WHERE r.sinav_id = o.sinav_id AND r.derslik_id = o.derslik_id;
     END IF;
-    RETURN NEW;
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER trg_derslik_cakisma 
-BEFORE INSERT OR UPDATE ON sinav_derslikleri
-FOR EACH ROW EXECUTE FUNCTION trg_derslik_cakisma_kontrol();
+-- Transition table'lı tetikleyiciler tek olay alabildiği için INSERT/UPDATE/DELETE ayrı
+CREATE TRIGGER trg_derslik_rezervasyon_ekle 
+AFTER INSERT ON sinav_derslikleri
+REFERENCING NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_derslik_rezervasyon_yaz();
+
+CREATE TRIGGER trg_derslik_rezervasyon_guncelle 
+AFTER UPDATE ON sinav_derslikleri
+REFERENCING OLD TABLE AS eski_satirlar NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_derslik_rezervasyon_yaz();
+
+CREATE TRIGGER trg_derslik_rezervasyon_sil 
+AFTER DELETE ON sinav_derslikleri
+REFERENCING OLD TABLE AS eski_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_derslik_rezervasyon_yaz();
 
--- 3. Öğrenci Sınav Çakışma Kontrolü (Optimized)
-CREATE OR REPLACE FUNCTION trg_ogrenci_cakisma_kontrol() 
+-- Sınavın tarihi/saati değişirse rezervasyon aralıkları da taşınır
+CREATE OR REPLACE FUNCTION trg_sinav_zaman_esitle() 
 RETURNS TRIGGER AS $$
 BEGIN
-    -- Index scan ile hızlı kontrol
-    IF EXISTS (
-        SELECT 1 
-        FROM oturma_planlari op
-        INNER JOIN sinavlar s1 ON op.sinav_id = s1.sinav_id
-        INNER JOIN sinavlar s2 ON s2.sinav_id = NEW.sinav_id
-        WHERE op.ogrenci_no = NEW.ogrenci_no
-          AND s1.tarih = s2.tarih
-          AND s1.sinav_id != NEW.sinav_id
-          AND (s1.baslangic_saati, s1.bitis_saati) OVERLAPS (s2.baslangic_saati, s2.bitis_saati)
-    ) THEN
-        RAISE EXCEPTION 'Öğrenci % sınav çakışması!', NEW.ogrenci_no;
-    END IF;
-    RETURN NEW;
+    UPDATE derslik_rezervasyonlari r
+    SET zaman = tsrange(n.tarih + n.baslangic_saati, n.tarih + n.bitis_saati, '[)')
+    FROM guncel_sinavlar n
+    WHERE r.sinav_id = n.sinav_id
+      AND r.zaman <> tsrange(n.tarih + n.baslangic_saati, n.tarih + n.bitis_saati, '[)');
+
+    UPDATE ogrenci_sinav_zamanlari z
+    SET zaman = tsrange(n.tarih + n.baslangic_saati, n.tarih + n.bitis_saati, '[)')
+    FROM guncel_sinavlar n
+    WHERE z.sinav_id = n.sinav_id
+      AND z.zaman <> tsrange(n.tarih + n.baslangic_saati, n.tarih + n.bitis_saati, '[)');
+
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER trg_ogrenci_cakisma 
-BEFORE INSERT ON oturma_planlari
-FOR EACH ROW EXECUTE FUNCTION trg_ogrenci_cakisma_kontrol();
+CREATE TRIGGER trg_sinav_zaman_esitle 
+AFTER UPDATE ON sinavlar
+REFERENCING NEW TABLE AS guncel_sinavlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_sinav_zaman_esitle();
 
--- 4. Derslik Kapasite Kontrolü (SAYAÇ İLE - ULTRA HIZLI)
-CREATE OR REPLACE FUNCTION trg_derslik_kapasite_kontrol() 
+-- 3-5. Oturma Planı Toplu Kontrol ve Sayaçlar (STATEMENT-LEVEL, transition table)
+-- Bir sınavın tüm planı tek INSERT ile yazıldığında çakışma, sayaç ve kapasite
+-- kontrolleri satır başına değil, ifade başına bir kez set-based çalışır.
+-- Sayaçlar her (sinav, derslik) için tek UPDATE ile güncellenir.
+CREATE OR REPLACE FUNCTION trg_oturma_toplu_ekle() 
 RETURNS TRIGGER AS $$
 DECLARE
+    v_derslik_id INT;
     v_kapasite INT;
     v_yerlesim_sayisi INT;
 BEGIN
-    -- Tek sorgu ile her ikisini de al (JOIN ile optimize)
-    SELECT d.kapasite, COALESCE(sd.yerlesim_sayisi, 0)
-    INTO v_kapasite, v_yerlesim_sayisi
-    FROM derslikler d
-    LEFT JOIN sinav_derslikleri sd ON sd.sinav_id = NEW.sinav_id AND sd.derslik_id = NEW.derslik_id
-    WHERE d.derslik_id = NEW.derslik_id;
-
-    -- Kapasite kontrolü (sayaç sayesinde COUNT yok!)
-    IF v_yerlesim_sayisi >= v_kapasite THEN
-        RAISE EXCEPTION 'Derslik kapasitesi dolu! (Kapasite: %, Mevcut: %)', 
-            v_kapasite, v_yerlesim_sayisi;
+    -- Öğrenci çakışması: exc_ogrenci_cakisma EXCLUDE kısıtı (GiST, yarışsız)
+    INSERT INTO ogrenci_sinav_zamanlari (sinav_id, ogrenci_no, zaman)
+    SELECT n.sinav_id, n.ogrenci_no,
+           tsrange(s.tarih + s.baslangic_saati, s.tarih + s.bitis_saati, '[)')
+    FROM yeni_yerlesimler n
+    INNER JOIN sinavlar s ON s.sinav_id = n.sinav_id;
+
+    -- Yerleşim sayacı: (sinav, derslik) başına tek UPDATE
+    UPDATE sinav_derslikleri sd
+    SET yerlesim_sayisi = sd.yerlesim_sayisi + y.adet
+    FROM (
+        SELECT sinav_id, derslik_id, COUNT(*) AS adet
+        FROM yeni_yerlesimler
+        GROUP BY sinav_id, derslik_id
+    ) y
+    WHERE sd.sinav_id = y.sinav_id AND sd.derslik_id = y.derslik_id;
+
+    -- Kapasite: sadece bu ifadenin dokunduğu derslikler
+    SELECT sd.derslik_id, d.kapasite, sd.yerlesim_sayisi
+    INTO v_derslik_id, v_kapasite, v_yerlesim_sayisi
+    FROM (SELECT DISTINCT sinav_id, derslik_id FROM yeni_yerlesimler) y
+    INNER JOIN sinav_derslikleri sd ON sd.sinav_id = y.sinav_id AND sd.derslik_id = y.derslik_id
+    INNER JOIN derslikler d ON d.derslik_id = sd.derslik_id
+    WHERE sd.yerlesim_sayisi > d.kapasite
+    LIMIT 1;
+
+    IF FOUND THEN
+        RAISE EXCEPTION 'Derslik kapasitesi dolu! (Derslik: %, Kapasite: %, Mevcut: %)', 
+            v_derslik_id, v_kapasite, v_yerlesim_sayisi;
     END IF;
-    
-    RETURN NEW;
+
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER trg_kapasite_kontrol 
-BEFORE INSERT ON oturma_planlari
-FOR EACH ROW EXECUTE FUNCTION trg_derslik_kapasite_kontrol();
+CREATE OR REPLACE FUNCTION trg_oturma_toplu_sil() 
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM ogrenci_sinav_zamanlari z
+    USING silinen_yerlesimler o
+    WHERE z.sinav_id = o.sinav_id AND z.ogrenci_no = o.ogrenci_no;
+
+    UPDATE sinav_derslikleri sd
+    SET yerlesim_sayisi = GREATEST(sd.yerlesim_sayisi - y.adet, 0)
+    FROM (
+        SELECT sinav_id, derslik_id, COUNT(*) AS adet
+        FROM silinen_yerlesimler
+        GROUP BY sinav_id, derslik_id
+    ) y
+    WHERE sd.sinav_id = y.sinav_id AND sd.derslik_id = y.derslik_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_oturma_toplu_ekle 
+AFTER INSERT ON oturma_planlari
+REFERENCING NEW TABLE AS yeni_yerlesimler
+FOR EACH STATEMENT EXECUTE FUNCTION trg_oturma_toplu_ekle();
 
--- 5. Yerleşim Sayacı Güncelleme (ROW-LEVEL LOCKING ile)
-CREATE OR REPLACE FUNCTION trg_update_yerlesim_sayaci() 
+CREATE TRIGGER trg_oturma_toplu_sil 
+AFTER DELETE ON oturma_planlari
+REFERENCING OLD TABLE AS silinen_yerlesimler
+FOR EACH STATEMENT EXECUTE FUNCTION trg_oturma_toplu_sil();
+
+-- ============================================================
+-- BÖLÜM 4b: DEĞİŞİKLİK BİLDİRİMLERİ (LISTEN/NOTIFY)
+-- ============================================================
+-- Aynı veritabanına bağlı diğer uygulama örnekleri 'tablo_degisiklik' kanalını
+-- dinler; yalnızca değişen tablo/bölüm için önbelleği ve açık ekranları yeniler.
+-- Yük: {"tablo": ..., "islem": ..., "bolum_id": ..., "program_id": ...}
+-- PostgreSQL aynı işlemdeki özdeş bildirimleri birleştirir, bildirimler COMMIT'te gider.
+CREATE OR REPLACE FUNCTION bildir_tablo_degisikligi(
+    p_tablo TEXT, p_islem TEXT, p_bolum_id INT, p_program_id INT DEFAULT NULL
+)
+RETURNS void AS $$
+BEGIN
+    PERFORM pg_notify('tablo_degisiklik', json_build_object(
+        'tablo', p_tablo,
+        'islem', p_islem,
+        'bolum_id', p_bolum_id,
+        'program_id', p_program_id
+    )::text);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Referans tabloları (tek satırlık yazımlar): satır başına bildirim
+CREATE OR REPLACE FUNCTION trg_referans_degisiklik_bildir()
 RETURNS TRIGGER AS $$
+DECLARE
+    v_satir RECORD;
+    v_program_id INT;
 BEGIN
-    IF (TG_OP = 'INSERT') THEN
-        -- FOR UPDATE ile row-level lock (race condition önleme)
-        UPDATE sinav_derslikleri
-        SET yerlesim_sayisi = yerlesim_sayisi + 1
-        WHERE sinav_id = NEW.sinav_id AND derslik_id = NEW.derslik_id;
-        
-    ELSIF (TG_OP = 'DELETE') THEN
-        UPDATE sinav_derslikleri
-        SET yerlesim_sayisi = yerlesim_sayisi - 1
-        WHERE sinav_id = OLD.sinav_id AND derslik_id = OLD.derslik_id;
+    IF TG_OP = 'DELETE' THEN
+        v_satir := OLD;
+    ELSE
+        v_satir := NEW;
     END IF;
-    
+
+    IF TG_TABLE_NAME = 'sinav_programi' THEN
+        v_program_id := v_satir.program_id;
+    END IF;
+
+    PERFORM bildir_tablo_degisikligi(TG_TABLE_NAME, TG_OP, v_satir.bolum_id, v_program_id);
+
+    -- Bölüm değiştiren güncellemede eski bölüm de yenilenmeli
+    IF TG_OP = 'UPDATE' THEN
+        IF OLD.bolum_id IS DISTINCT FROM NEW.bolum_id THEN
+            PERFORM bildir_tablo_degisikligi(TG_TABLE_NAME, TG_OP, OLD.bolum_id, v_program_id);
+        END IF;
+    END IF;
+
     RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER trg_yerlesim_sayaci_guncelle 
-AFTER INSERT OR DELETE ON oturma_planlari
-FOR EACH ROW EXECUTE FUNCTION trg_update_yerlesim_sayaci();
+CREATE TRIGGER trg_bolumler_bildir
+AFTER INSERT OR UPDATE OR DELETE ON bolumler
+FOR EACH ROW EXECUTE FUNCTION trg_referans_degisiklik_bildir();
+
+CREATE TRIGGER trg_dersler_bildir
+AFTER INSERT OR UPDATE OR DELETE ON dersler
+FOR EACH ROW EXECUTE FUNCTION trg_referans_degisiklik_bildir();
+
+CREATE TRIGGER trg_derslikler_bildir
+AFTER INSERT OR UPDATE OR DELETE ON derslikler
+FOR EACH ROW EXECUTE FUNCTION trg_referans_degisiklik_bildir();
+
+CREATE TRIGGER trg_sinav_programi_bildir
+AFTER INSERT OR UPDATE OR DELETE ON sinav_programi
+FOR EACH ROW EXECUTE FUNCTION trg_referans_degisiklik_bildir();
+
+-- Sınavlar toplu yazılır (save_program_bulk): ifade başına, program başına tek bildirim
+CREATE OR REPLACE FUNCTION trg_sinav_degisiklik_bildir()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Program silinirken (CASCADE) program satırı artık yok: bolum_id NULL kalır,
+    -- o durumda sinav_programi tetikleyicisi bölümü zaten bildirmiştir.
+    PERFORM bildir_tablo_degisikligi('sinavlar', TG_OP, sp.bolum_id, s.program_id)
+    FROM (SELECT DISTINCT program_id FROM degisen_sinavlar) s
+    LEFT JOIN sinav_programi sp ON sp.program_id = s.program_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_sinav_bildir_ekle
+AFTER INSERT ON sinavlar
+REFERENCING NEW TABLE AS degisen_sinavlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_sinav_degisiklik_bildir();
+
+CREATE TRIGGER trg_sinav_bildir_guncelle
+AFTER UPDATE ON sinavlar
+REFERENCING NEW TABLE AS degisen_sinavlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_sinav_degisiklik_bildir();
+
+CREATE TRIGGER trg_sinav_bildir_sil
+AFTER DELETE ON sinavlar
+REFERENCING OLD TABLE AS degisen_sinavlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_sinav_degisiklik_bildir();
 
 -- ============================================================
 -- BÖLÜM 5: ROW LEVEL SECURITY (RLS)
@@ -553,6 +779,37 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Geçerli kullanıcının rolü ve bölümü.
+-- STABLE + SECURITY DEFINER: politikalarda (SELECT fn()) olarak çağrıldığında
+-- planlayıcı bunu InitPlan yapar ve ifade başına BİR kez çalıştırır; eski
+-- EXISTS (SELECT ... FROM users ...) satır başına korelasyonlu sorgu yapıyordu.
+-- SECURITY DEFINER, users tablosuna RLS/GRANT'tan bağımsız erişim sağlar.
+CREATE OR REPLACE FUNCTION rls_aktif_kullanici_id()
+RETURNS INT AS $$
+    SELECT COALESCE(NULLIF(current_setting('app.current_user_id', TRUE), '')::INT, 0);
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION rls_admin_mi()
+RETURNS BOOLEAN AS $$
+    SELECT COALESCE((
+        SELECT u.role = 'Admin'
+        FROM users u
+        WHERE u.user_id = rls_aktif_kullanici_id() AND u.aktif = TRUE
+    ), FALSE);
+$$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION rls_bolum_id()
+RETURNS INT AS $$
+    SELECT u.bolum_id
+    FROM users u
+    WHERE u.user_id = rls_aktif_kullanici_id() AND u.aktif = TRUE;
+$$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+
+-- Politika tahminlerini destekleyen indexler (aktif filtresi olmadan da kullanılabilir)
+CREATE INDEX idx_users_rls ON users(user_id) INCLUDE (role, bolum_id) WHERE aktif = TRUE;
+CREATE INDEX idx_dersler_bolum ON dersler(bolum_id);
+CREATE INDEX idx_ogrenciler_bolum ON ogrenciler(bolum_id);
+
 ALTER TABLE derslikler ENABLE ROW LEVEL SECURITY;
 ALTER TABLE dersler ENABLE ROW LEVEL SECURITY;
 ALTER TABLE ogrenciler ENABLE ROW LEVEL SECURITY;
@@ -561,59 +818,36 @@ ALTER TABLE sinav_programi ENABLE ROW LEVEL SECURITY;
 ALTER TABLE oturma_planlari ENABLE ROW LEVEL SECURITY;
 
 CREATE POLICY pol_derslikler_erisim ON derslikler FOR ALL USING (
-    EXISTS (
-        SELECT 1 FROM users u
-        WHERE u.user_id = COALESCE(current_setting('app.current_user_id', TRUE)::INT, 0)
-        AND u.aktif = TRUE
-        AND (u.role = 'Admin' OR u.bolum_id = derslikler.bolum_id)
-    )
+    (SELECT rls_admin_mi()) OR bolum_id = (SELECT rls_bolum_id())
 );
 
 CREATE POLICY pol_dersler_erisim ON dersler FOR ALL USING (
-    EXISTS (
-        SELECT 1 FROM users u
-        WHERE u.user_id = COALESCE(current_setting('app.current_user_id', TRUE)::INT, 0)
-        AND u.aktif = TRUE
-        AND (u.role = 'Admin' OR u.bolum_id = dersler.bolum_id)
-    )
+    (SELECT rls_admin_mi()) OR bolum_id = (SELECT rls_bolum_id())
 );
 
 CREATE POLICY pol_ogrenciler_erisim ON ogrenciler FOR ALL USING (
-    EXISTS (
-        SELECT 1 FROM users u
-        WHERE u.user_id = COALESCE(current_setting('app.current_user_id', TRUE)::INT, 0)
-        AND u.aktif = TRUE
-        AND (u.role = 'Admin' OR u.bolum_id = ogrenciler.bolum_id)
-    )
+    (SELECT rls_admin_mi()) OR bolum_id = (SELECT rls_bolum_id())
 );
 
 CREATE POLICY pol_program_erisim ON sinav_programi FOR ALL USING (
-    EXISTS (
-        SELECT 1 FROM users u
-        WHERE u.user_id = COALESCE(current_setting('app.current_user_id', TRUE)::INT, 0)
-        AND u.aktif = TRUE
-        AND (u.role = 'Admin' OR u.bolum_id = sinav_programi.bolum_id)
-    )
+    (SELECT rls_admin_mi()) OR bolum_id = (SELECT rls_bolum_id())
 );
 
+-- Korelasyonsuz alt sorgu: bölümün programları bir kez hash'lenir
 CREATE POLICY pol_sinavlar_erisim ON sinavlar FOR ALL USING (
-    EXISTS (
-        SELECT 1 FROM users u
-        JOIN sinav_programi sp ON sp.program_id = sinavlar.program_id
-        WHERE u.user_id = COALESCE(current_setting('app.current_user_id', TRUE)::INT, 0)
-        AND u.aktif = TRUE
-        AND (u.role = 'Admin' OR u.bolum_id = sp.bolum_id)
+    (SELECT rls_admin_mi())
+    OR program_id IN (
+        SELECT sp.program_id FROM sinav_programi sp
+        WHERE sp.bolum_id = (SELECT rls_bolum_id())
     )
 );
 
 CREATE POLICY pol_oturma_erisim ON oturma_planlari FOR ALL USING (
-    EXISTS (
-        SELECT 1 FROM users u
-        JOIN sinavlar s ON s.sinav_id = oturma_planlari.sinav_id
+    (SELECT rls_admin_mi())
+    OR sinav_id IN (
+        SELECT s.sinav_id FROM sinavlar s
         JOIN sinav_programi sp ON sp.program_id = s.program_id
-        WHERE u.user_id = COALESCE(current_setting('app.current_user_id', TRUE)::INT, 0)
-        AND u.aktif = TRUE
-        AND (u.role = 'Admin' OR u.bolum_id = sp.bolum_id)
+        WHERE sp.bolum_id = (SELECT rls_bolum_id())
     )
 );
 
@@ -632,16 +866,190 @@ SELECT
     d.ders_yapisi,
     b.bolum_adi,
     b.bolum_id,
-    COUNT(DISTINCT dk.ogrenci_no) as ogrenci_sayisi
+    d.ogrenci_sayisi
 FROM dersler d
 JOIN bolumler b ON d.bolum_id = b.bolum_id
-LEFT JOIN ders_kayitlari dk ON d.ders_id = dk.ders_id
-WHERE d.aktif = TRUE
-GROUP BY d.ders_id, b.bolum_adi, b.bolum_id;
+WHERE d.aktif = TRUE;
 
 CREATE UNIQUE INDEX ON mv_ders_detaylari(ders_id);
 CREATE INDEX ON mv_ders_detaylari(bolum_id);
 
+-- Bölüm istatistikleri (Dashboard için özet tablo)
+-- Dashboard tek bir birincil anahtar okumasıyla çizilir; sayılar, bölümü
+-- etkileyen her ifadeden sonra bölüm başına farkla (x = x + fark) güncellenir.
+CREATE TABLE bolum_istatistikleri (
+    bolum_id INT PRIMARY KEY REFERENCES bolumler(bolum_id) ON DELETE CASCADE,
+    ders_sayisi INT NOT NULL DEFAULT 0,
+    ogrenci_sayisi INT NOT NULL DEFAULT 0,
+    derslik_sayisi INT NOT NULL DEFAULT 0,
+    program_sayisi INT NOT NULL DEFAULT 0,
+    guncelleme_zamani TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Tam yeniden sayım (yeni bölüm ve refresh_materialized_views() için).
+-- Önce özet satırları kilitlenir: farkını yazmış ama commit etmemiş bir
+-- transaction varsa beklenir ve sayım, onun satırlarını gören yeni bir
+-- snapshot ile yapılır; böylece yeniden sayım bir farkı ezmez.
+-- SECURITY DEFINER: sayımlar çağıranın RLS görünürlüğünden bağımsız olmalı
+CREATE OR REPLACE FUNCTION bolum_istatistiklerini_yenile(p_bolum_ids INT[])
+RETURNS void AS $$
+    SELECT 1 FROM bolum_istatistikleri
+    WHERE bolum_id = ANY(p_bolum_ids)
+    ORDER BY bolum_id
+    FOR UPDATE;
+
+    INSERT INTO bolum_istatistikleri
+        (bolum_id, ders_sayisi, ogrenci_sayisi, derslik_sayisi, program_sayisi, guncelleme_zamani)
+    SELECT
+        b.bolum_id,
+        (SELECT COUNT(*) FROM dersler d WHERE d.bolum_id = b.bolum_id AND d.aktif = TRUE),
+        (SELECT COUNT(*) FROM ogrenciler o WHERE o.bolum_id = b.bolum_id AND o.aktif = TRUE),
+        (SELECT COUNT(*) FROM derslikler dr WHERE dr.bolum_id = b.bolum_id AND dr.aktif = TRUE),
+        (SELECT COUNT(*) FROM sinav_programi sp WHERE sp.bolum_id = b.bolum_id),
+        NOW()
+    FROM bolumler b
+    WHERE b.bolum_id = ANY(p_bolum_ids)
+    ON CONFLICT (bolum_id) DO UPDATE SET
+        ders_sayisi = EXCLUDED.ders_sayisi,
+        ogrenci_sayisi = EXCLUDED.ogrenci_sayisi,
+        derslik_sayisi = EXCLUDED.derslik_sayisi,
+        program_sayisi = EXCLUDED.program_sayisi,
+        guncelleme_zamani = EXCLUDED.guncelleme_zamani;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+-- STATEMENT-LEVEL: bölüm başına fark = eklenen - silinen sayılan satır
+-- (aktif = TRUE; aktif sütunu olmayan sinav_programi'nde her satır).
+-- Sayaçlar "x = x + fark" ile güncellendiği için aynı bölüme eşzamanlı
+-- yazan transaction'lar birbirinin sayımını ezmez; satır kilidi
+-- güncellemeleri sıraya koyar. UPDATE'te bolum_id/aktif değişmeyen
+-- satırların farkı 0'dır, böylece dersler.ogrenci_sayisi sayaç
+-- güncellemeleri özet tabloya yazmaz.
+-- SECURITY DEFINER: özet tabloda yalnızca SELECT politikası var (RLS)
+CREATE OR REPLACE FUNCTION trg_bolum_istatistik_yenile() 
+RETURNS TRIGGER AS $$
+DECLARE
+    v_eklenen INT[] := '{}';
+    v_silinen INT[] := '{}';
+BEGIN
+    IF (TG_TABLE_NAME = 'bolumler') THEN
+        PERFORM bolum_istatistiklerini_yenile(ARRAY(SELECT bolum_id FROM yeni_satirlar));
+        RETURN NULL;
+    END IF;
+
+    IF (TG_OP IN ('INSERT', 'UPDATE')) THEN
+        SELECT COALESCE(array_agg(y.bolum_id), '{}') INTO v_eklenen
+        FROM yeni_satirlar y
+        WHERE COALESCE((to_jsonb(y) ->> 'aktif')::boolean, TRUE);
+    END IF;
+
+    IF (TG_OP IN ('DELETE', 'UPDATE')) THEN
+        SELECT COALESCE(array_agg(e.bolum_id), '{}') INTO v_silinen
+        FROM eski_satirlar e
+        WHERE COALESCE((to_jsonb(e) ->> 'aktif')::boolean, TRUE);
+    END IF;
+
+    INSERT INTO bolum_istatistikleri AS bi
+        (bolum_id, ders_sayisi, ogrenci_sayisi, derslik_sayisi, program_sayisi, guncelleme_zamani)
+    SELECT
+        f.bolum_id,
+        CASE WHEN TG_TABLE_NAME = 'dersler' THEN f.fark ELSE 0 END,
+        CASE WHEN TG_TABLE_NAME = 'ogrenciler' THEN f.fark ELSE 0 END,
+        CASE WHEN TG_TABLE_NAME = 'derslikler' THEN f.fark ELSE 0 END,
+        CASE WHEN TG_TABLE_NAME = 'sinav_programi' THEN f.fark ELSE 0 END,
+        NOW()
+    FROM (
+        SELECT bolum_id, SUM(fark)::int AS fark
+        FROM (
+            SELECT unnest(v_eklenen) AS bolum_id, 1 AS fark
+            UNION ALL
+            SELECT unnest(v_silinen), -1
+        ) degisen
+        GROUP BY bolum_id
+    ) f
+    WHERE f.fark <> 0
+    ORDER BY f.bolum_id  -- sabit kilit sırası: çok bölümlü ifadeler deadlock'a girmez
+    ON CONFLICT (bolum_id) DO UPDATE SET
+        ders_sayisi = GREATEST(bi.ders_sayisi + EXCLUDED.ders_sayisi, 0),
+        ogrenci_sayisi = GREATEST(bi.ogrenci_sayisi + EXCLUDED.ogrenci_sayisi, 0),
+        derslik_sayisi = GREATEST(bi.derslik_sayisi + EXCLUDED.derslik_sayisi, 0),
+        program_sayisi = GREATEST(bi.program_sayisi + EXCLUDED.program_sayisi, 0),
+        guncelleme_zamani = EXCLUDED.guncelleme_zamani;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER trg_istatistik_bolum_ekle 
+AFTER INSERT ON bolumler
+REFERENCING NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_dersler_ekle 
+AFTER INSERT ON dersler
+REFERENCING NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_dersler_guncelle 
+AFTER UPDATE ON dersler
+REFERENCING OLD TABLE AS eski_satirlar NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_dersler_sil 
+AFTER DELETE ON dersler
+REFERENCING OLD TABLE AS eski_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_ogrenciler_ekle 
+AFTER INSERT ON ogrenciler
+REFERENCING NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_ogrenciler_guncelle 
+AFTER UPDATE ON ogrenciler
+REFERENCING OLD TABLE AS eski_satirlar NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_ogrenciler_sil 
+AFTER DELETE ON ogrenciler
+REFERENCING OLD TABLE AS eski_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_derslikler_ekle 
+AFTER INSERT ON derslikler
+REFERENCING NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_derslikler_guncelle 
+AFTER UPDATE ON derslikler
+REFERENCING OLD TABLE AS eski_satirlar NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_derslikler_sil 
+AFTER DELETE ON derslikler
+REFERENCING OLD TABLE AS eski_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_sinav_programi_ekle 
+AFTER INSERT ON sinav_programi
+REFERENCING NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_sinav_programi_guncelle 
+AFTER UPDATE ON sinav_programi
+REFERENCING OLD TABLE AS eski_satirlar NEW TABLE AS yeni_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+CREATE TRIGGER trg_istatistik_sinav_programi_sil 
+AFTER DELETE ON sinav_programi
+REFERENCING OLD TABLE AS eski_satirlar
+FOR EACH STATEMENT EXECUTE FUNCTION trg_bolum_istatistik_yenile();
+
+ALTER TABLE bolum_istatistikleri ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY pol_bolum_istatistik_erisim ON bolum_istatistikleri FOR SELECT USING (
+    (SELECT rls_admin_mi()) OR bolum_id = (SELECT rls_bolum_id())
+);
+
 -- Öğrenci ders listesi (Arama için optimize)
 CREATE VIEW v_ogrenci_dersleri AS
 SELECT 
@@ -687,6 +1095,8 @@ CREATE OR REPLACE FUNCTION refresh_materialized_views()
 RETURNS void AS $$
 BEGIN
     REFRESH MATERIALIZED VIEW CONCURRENTLY mv_ders_detaylari;
+    -- Tetikleyicilerin dışında kalan değişikliklere karşı (ör. TRUNCATE) tam eşitleme
+    PERFORM bolum_istatistiklerini_yenile(ARRAY(SELECT bolum_id FROM bolumler));
 END;
 $$ LANGUAGE plpgsql;
 
@@ -702,6 +1112,70 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Bir programdaki öğrenci başına çakışma ve sınav yükü (tek set-based sorgu).
+-- Sınavlar öğrenci+gün bazında başlangıca göre sıralanır; her sınav, aynı gün
+-- daha önce başlamış sınavların en geç bitişiyle karşılaştırılır:
+--   cakisma_sayisi   : kendinden önce başlayan bir sınavla kesişen sınav sayısı
+--   gunluk_en_fazla  : bir günde girilen en fazla sınav
+--   yogun_gun_sayisi : birden fazla sınav olan gün sayısı
+--   ardisik_sayisi   : öncekinin bitişinden en fazla p_ardisik_esik_dk sonra başlayan sınavlar
+--   en_kisa_ara_dk   : aynı gündeki iki sınav arasındaki en kısa ara (negatif = çakışma)
+-- SECURITY INVOKER: RLS politikaları çağıran kullanıcı için geçerli kalır.
+CREATE OR REPLACE FUNCTION program_ogrenci_yukleri(
+    p_program_id INT,
+    p_ardisik_esik_dk INT DEFAULT 15,
+    p_sadece_sorunlu BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE (
+    ogrenci_no VARCHAR,
+    ad_soyad VARCHAR,
+    sinav_sayisi INT,
+    cakisma_sayisi INT,
+    gunluk_en_fazla INT,
+    yogun_gun_sayisi INT,
+    ardisik_sayisi INT,
+    en_kisa_ara_dk INT
+) AS $$
+    WITH ogrenci_sinavlari AS (
+        SELECT dk.ogrenci_no, s.sinav_id, s.tarih,
+               s.tarih + s.baslangic_saati AS baslangic,
+               s.tarih + s.bitis_saati AS bitis
+        FROM sinavlar s
+        INNER JOIN ders_kayitlari dk ON dk.ders_id = s.ders_id
+        WHERE s.program_id = p_program_id
+    ),
+    sirali AS (
+        SELECT os.ogrenci_no, os.tarih, os.baslangic,
+               MAX(os.bitis) OVER (
+                   PARTITION BY os.ogrenci_no, os.tarih
+                   ORDER BY os.baslangic, os.sinav_id
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ) AS onceki_bitis,
+               COUNT(*) OVER (PARTITION BY os.ogrenci_no, os.tarih) AS gunluk
+        FROM ogrenci_sinavlari os
+    ),
+    ozet AS (
+        SELECT sr.ogrenci_no,
+               COUNT(*)::INT AS sinav_sayisi,
+               COUNT(*) FILTER (WHERE sr.baslangic < sr.onceki_bitis)::INT AS cakisma_sayisi,
+               MAX(sr.gunluk)::INT AS gunluk_en_fazla,
+               COUNT(DISTINCT sr.tarih) FILTER (WHERE sr.gunluk > 1)::INT AS yogun_gun_sayisi,
+               COUNT(*) FILTER (
+                   WHERE sr.baslangic >= sr.onceki_bitis
+                     AND sr.baslangic - sr.onceki_bitis <= make_interval(mins => p_ardisik_esik_dk)
+               )::INT AS ardisik_sayisi,
+               MIN(EXTRACT(EPOCH FROM sr.baslangic - sr.onceki_bitis) / 60)::INT AS en_kisa_ara_dk
+        FROM sirali sr
+        GROUP BY sr.ogrenci_no
+    )
+    SELECT oz.ogrenci_no, o.ad_soyad, oz.sinav_sayisi, oz.cakisma_sayisi, oz.gunluk_en_fazla,
+           oz.yogun_gun_sayisi, oz.ardisik_sayisi, oz.en_kisa_ara_dk
+    FROM ozet oz
+    INNER JOIN ogrenciler o ON o.ogrenci_no = oz.ogrenci_no
+    WHERE NOT p_sadece_sorunlu OR oz.cakisma_sayisi > 0 OR oz.gunluk_en_fazla > 1
+    ORDER BY oz.cakisma_sayisi DESC, oz.gunluk_en_fazla DESC, oz.ardisik_sayisi DESC, oz.ogrenci_no;
+$$ LANGUAGE sql STABLE;
+
 -- ============================================================
 -- BÖLÜM 8: ÖRNEK VERİLER
 -- ============================================================
@@ -0,0 +1,171 @@
+"""
+Async Query Executor
+Veritabanı işlerini sınırlı bir thread havuzunda çalıştırır, sonuçları Qt
+sinyalleriyle GUI thread'ine teslim eder
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from PySide6.QtCore import QObject, Qt, Signal
+
+logger = logging.getLogger(__name__)
+
+
+class QueryFuture(QObject):
+    """
+    Sonucu GUI thread'inde `resolved` / `failed` ile yayımlanan istek
+
+    A cancelled future never emits, so a view that was navigated away from
+    (or that issued a newer request) does not receive a stale response.
+    """
+
+    resolved = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, key: Optional[Hashable], owner: Any = None):
+        super().__init__()
+        self.key = key
+        self.owner_id = id(owner) if owner is not None else None
+        self._cancelled = False
+        self._done = False
+
+    def then(self, on_result: Callable[[Any], None],
+             on_error: Optional[Callable[[str], None]] = None) -> 'QueryFuture':
+        """Connect result/error handlers; returns self for chaining"""
+        self.resolved.connect(on_result)
+        if on_error is not None:
+            self.failed.connect(on_error)
+        return self
+
+    def cancel(self):
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+
+class _Task:
+    """One running job shared by every coalesced future"""
+
+    def __init__(self, key: Optional[Hashable]):
+        self.key = key
+        self.futures: List[QueryFuture] = []
+
+
+class AsyncQueryExecutor(QObject):
+    """
+    Views için paylaşılan arka plan sorgu çalıştırıcı
+
+    submit(fn, *args, key=..., owner=...) runs fn on a bounded thread pool
+    (DB_ASYNC_WORKERS, default 4; each job borrows a pooled connection via
+    DatabaseManager as usual) and returns a QueryFuture.
+
+    - Coalescing: a submit whose key matches a job that is still running
+      for another owner attaches to that job instead of starting another
+      round trip. A repeat request from the same owner (e.g. a refresh
+      right after a save) always starts a new job, since the running one
+      may have read the data before the change was committed.
+    - Latest wins: the previous future of the same key and owner is
+      cancelled, so only the newest request updates the view.
+    - cancel_owner(view) drops every pending result of a view that is no
+      longer visible.
+    """
+
+    # (task, result, error) from a worker thread -> GUI thread
+    _completed = Signal(object, object, object)
+
+    def __init__(self, max_workers: Optional[int] = None):
+        super().__init__()
+        self.max_workers = int(max_workers or os.getenv('DB_ASYNC_WORKERS', 4))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='db-async')
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Task] = {}
+        self._latest: Dict[tuple, QueryFuture] = {}
+        self._stats = {'submitted': 0, 'coalesced': 0, 'cancelled': 0, 'failed': 0}
+        self._completed.connect(self._deliver, Qt.QueuedConnection)
+
+    def submit(self, fn: Callable[..., Any], *args, key: Optional[Hashable] = None,
+               owner: Any = None, **kwargs) -> QueryFuture:
+        """fn(*args, **kwargs)'u arka planda çalıştır; sonucu QueryFuture ile döndür"""
+        future = QueryFuture(key, owner)
+
+        if key is not None:
+            previous = self._latest.get((future.owner_id, key))
+            if previous is not None and not previous.done:
+                self._cancel(previous)
+            self._latest[(future.owner_id, key)] = future
+
+        with self._lock:
+            self._stats['submitted'] += 1
+            task = self._inflight.get(key) if key is not None else None
+            if task is not None and all(f.owner_id != future.owner_id for f in task.futures):
+                task.futures.append(future)
+                self._stats['coalesced'] += 1
+                return future
+
+            task = _Task(key)
+            task.futures.append(future)
+            if key is not None:
+                self._inflight[key] = task
+
+        self._pool.submit(self._run, task, fn, args, kwargs)
+        return future
+
+    def _run(self, task: _Task, fn, args, kwargs):
+        try:
+            result, error = fn(*args, **kwargs), None
+        except Exception as e:
+            result, error = None, e
+        with self._lock:
+            # New submits with this key start a fresh job from now on
+            if task.key is not None and self._inflight.get(task.key) is task:
+                del self._inflight[task.key]
+        self._completed.emit(task, result, error)
+
+    def _deliver(self, task: _Task, result, error):
+        """GUI thread: hand the result to every future that still wants it"""
+        if error is not None:
+            self._stats['failed'] += 1
+            logger.error(f"Async query failed ({task.key}): {error}")
+        for future in task.futures:
+            if future.cancelled:
+                continue
+            future._done = True
+            if error is None:
+                future.resolved.emit(result)
+            else:
+                future.failed.emit(str(error))
+        for future in task.futures:
+            if self._latest.get((future.owner_id, future.key)) is future:
+                del self._latest[(future.owner_id, future.key)]
+
+    def _cancel(self, future: QueryFuture):
+        future.cancel()
+        self._stats['cancelled'] += 1
+
+    def cancel_owner(self, owner: Any) -> int:
+        """Cancel every pending future submitted for owner (e.g. a hidden view)"""
+        owner_id = id(owner)
+        stale = [f for (oid, _), f in self._latest.items() if oid == owner_id and not f.done]
+        for future in stale:
+            self._cancel(future)
+        return len(stale)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, inflight=len(self._inflight), max_workers=self.max_workers)
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work (application exit)"""
+        self._pool.shutdown(wait=wait)
+
+
+query_executor = AsyncQueryExecutor()
@@ -0,0 +1,39 @@
+"""
+Change Notifier
+Veritabanı değişiklik bildirimlerini (LISTEN/NOTIFY) Qt sinyallerine aktarır
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+from PySide6.QtCore import QObject, Signal
+
+from models.database import db
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeNotifier(QObject):
+    """
+    DatabaseManager dinleyici thread'i ile GUI thread'i arasındaki köprü
+
+    Abonelik callback'i dinleyici thread'inde çalışır; sinyal yayımı Qt
+    tarafından alıcının thread'ine kuyruklanır, böylece slotlar widget'lara
+    güvenle dokunabilir.
+    """
+
+    # tablo adı ('*' = her şey), event sözlüğü
+    table_changed = Signal(str, object)
+
+    def __init__(self, tables: Optional[Iterable[str]] = None, parent=None):
+        super().__init__(parent)
+        self._token = db.subscribe_changes(self._on_change, tables)
+        db.start_change_listener()
+
+    def _on_change(self, event: Dict):
+        self.table_changed.emit(event.get('tablo') or '*', event)
+
+    def close(self):
+        """Aboneliği bırak (pencere kapanırken çağrılmalı)"""
+        if self._token is not None:
+            db.unsubscribe_changes(self._token)
+            self._token = None
@@ -0,0 +1,91 @@
+"""
+Keyset Pager
+Tabloları kaydırdıkça sayfa sayfa dolduran yardımcı (seek pagination)
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from PySide6.QtCore import QObject
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 200
+
+
+class KeysetPager(QObject):
+    """
+    Fetches the next keyset page when a table is scrolled near its end
+
+    fetch_page(after, limit) must return rows ordered by the same key that
+    key(row) extracts; the last row's key becomes the next page's `after`.
+    Rows are handed to append_rows(rows), which adds them to the table.
+    """
+
+    def __init__(
+        self,
+        table,
+        fetch_page: Callable[[Optional[Tuple], int], List[Dict]],
+        key: Callable[[Dict], Tuple],
+        append_rows: Callable[[List[Dict]], Any],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        parent=None
+    ):
+        super().__init__(parent or table)
+        self.table = table
+        self.fetch_page = fetch_page
+        self.key = key
+        self.append_rows = append_rows
+        self.page_size = page_size
+        self.loaded_count = 0
+        self.has_more = False
+        self._after = None
+        self._loading = False
+        table.verticalScrollBar().valueChanged.connect(self._on_scroll)
+
+    def reset(self) -> int:
+        """Clear the table and load the first page"""
+        self.table.setRowCount(0)
+        self.loaded_count = 0
+        self._after = None
+        self.has_more = True
+        return self.fetch_more()
+
+    def stop(self):
+        """Stop paging (the table shows something else, e.g. an Excel preview)"""
+        self.has_more = False
+
+    def fetch_more(self) -> int:
+        """Append the next page; returns the number of rows added"""
+        if self._loading or not self.has_more:
+            return 0
+        self._loading = True
+        try:
+            rows = self.fetch_page(self._after, self.page_size)
+        finally:
+            self._loading = False
+
+        self.has_more = len(rows) == self.page_size
+        if rows:
+            self._after = self.key(rows[-1])
+            self.append_rows(rows)
+            self.loaded_count += len(rows)
+        return len(rows)
+
+    def fetch_all(self) -> int:
+        """Load every remaining page (explicit "select all" style actions)"""
+        total = 0
+        while self.has_more:
+            added = self.fetch_more()
+            if not added:
+                break
+            total += added
+        return total
+
+    def _on_scroll(self, value: int):
+        bar = self.table.verticalScrollBar()
+        # Within one screen of the bottom: prefetch the next page
+        if self.has_more and value >= bar.maximum() - bar.pageStep():
+            try:
+                self.fetch_more()
+            except Exception as e:
+                logger.error(f"Error fetching next page: {e}")
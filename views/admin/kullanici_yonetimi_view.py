@@ -19,6 +19,7 @@ from models.bolum_model import BolumModel
 from models.database import db
 from utils.password_utils import PasswordUtils
 from utils.modern_dialogs import ModernMessageBox
+from utils.keyset_pager import KeysetPager
 
 logger = logging.getLogger(__name__)
 
@@ -274,6 +275,11 @@ class KullaniciYonetimiView(QWidget):
         self.bolum_model = BolumModel(db)
 
         self.setup_ui()
+
+        # Kullanıcılar sayfa sayfa (kaydırdıkça) yüklenir
+        self.pager = KeysetPager(
+            self.table, self.fetch_user_page, UserModel.sayfa_anahtari, self.append_users
+        )
         self.load_users()
 
     def setup_ui(self):
@@ -411,140 +417,136 @@ class KullaniciYonetimiView(QWidget):
         layout.addWidget(table_container)
 
     def load_users(self):
-        """Load all users"""
+        """Load the first page of users (more pages load on scroll)"""
         try:
-            # Get all users except current admin
-            query = """
-                SELECT u.user_id, u.ad_soyad, u.email, u.role, u.bolum_id, u.son_giris,
-                       b.bolum_adi
-                FROM users u
-                LEFT JOIN bolumler b ON u.bolum_id = b.bolum_id
-                WHERE u.aktif = TRUE AND u.user_id != %s
-                ORDER BY u.role, u.ad_soyad
-            """
-            users = db.execute_query(query, (self.user_data.get('user_id'),))
-
-            self.table.setRowCount(0)
-
-            for user in users:
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-
-                # Ad Soyad
-                name_item = QTableWidgetItem(user['ad_soyad'])
-                name_item.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                self.table.setItem(row, 0, name_item)
-
-                # Email
-                email_item = QTableWidgetItem(user['email'])
-                self.table.setItem(row, 1, email_item)
-
-                # Role
-                role_item = QTableWidgetItem(user['role'])
-                if user['role'] == 'Admin':
-                    role_item.setForeground(Qt.red)
-                    role_item.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                else:
-                    role_item.setForeground(Qt.blue)
-                self.table.setItem(row, 2, role_item)
-
-                # Bölüm
-                bolum = user.get('bolum_adi', '-')
-                dept_item = QTableWidgetItem(bolum)
-                self.table.setItem(row, 3, dept_item)
-
-                # Son Giriş
-                son_giris = user.get('son_giris', '')
-                if son_giris:
-                    son_giris = son_giris.strftime('%d.%m.%Y %H:%M') if hasattr(son_giris, 'strftime') else str(son_giris)
-                else:
-                    son_giris = 'Hiç giriş yok'
-                login_item = QTableWidgetItem(son_giris)
-                login_item.setForeground(Qt.darkGray)
-                self.table.setItem(row, 4, login_item)
-
-                # Actions - Compact buttons aligned left
-                action_widget = QWidget()
-                action_layout = QHBoxLayout(action_widget)
-                action_layout.setContentsMargins(4, 2, 4, 2)
-                action_layout.setSpacing(6)
-
-                edit_btn = QPushButton("Düzenle")
-                edit_btn.setFixedHeight(32)
-                edit_btn.setFixedWidth(75)
-                edit_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #10b981;
-                        color: white;
-                        border: none;
-                        border-radius: 6px;
-                        font-weight: 600;
-                        font-size: 11px;
-                        padding: 4px 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #059669;
-                    }
-                """)
-                edit_btn.setCursor(Qt.PointingHandCursor)
-                edit_btn.clicked.connect(lambda checked=False, u=user: self.edit_user(u))
-
-                password_btn = QPushButton("Şifre")
-                password_btn.setFixedHeight(32)
-                password_btn.setFixedWidth(60)
-                password_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #3b82f6;
-                        color: white;
-                        border: none;
-                        border-radius: 6px;
-                        font-weight: 600;
-                        font-size: 11px;
-                        padding: 4px 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #2563eb;
-                    }
-                """)
-                password_btn.setCursor(Qt.PointingHandCursor)
-                password_btn.clicked.connect(lambda checked=False, u=user: self.change_password(u))
-
-                delete_btn = QPushButton("Sil")
-                delete_btn.setFixedHeight(32)
-                delete_btn.setFixedWidth(50)
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #ef4444;
-                        color: white;
-                        border: none;
-                        border-radius: 6px;
-                        font-weight: 600;
-                        font-size: 11px;
-                        padding: 4px 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #dc2626;
-                    }
-                """)
-                delete_btn.setCursor(Qt.PointingHandCursor)
-                delete_btn.clicked.connect(lambda checked=False, u=user: self.delete_user(u))
-
-                action_layout.addWidget(edit_btn)
-                action_layout.addWidget(password_btn)
-                action_layout.addWidget(delete_btn)
-                action_layout.addStretch()
-
-                self.table.setCellWidget(row, 5, action_widget)
-
-            # Adjust columns after loading
-            self.adjust_columns()
-
-            logger.info(f"Loaded {len(users)} users")
+            self.pager.reset()
+            logger.info(f"Loaded {self.pager.loaded_count} users")
 
         except Exception as e:
             logger.error(f"Error loading users: {e}")
             ModernMessageBox.error(self, "Hata", "Kullanıcılar yüklenirken oluştu", f"{str(e)}")
 
+    def fetch_user_page(self, after, limit):
+        """Keyset page source for the pager: all users except the current admin"""
+        return self.user_model.get_users_sayfasi(
+            after=after, limit=limit, exclude_user_id=self.user_data.get('user_id')
+        )
+
+    def append_users(self, users):
+        """Append user rows to the table"""
+        for user in users:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+
+            # Ad Soyad
+            name_item = QTableWidgetItem(user['ad_soyad'])
+            name_item.setFont(QFont("Segoe UI", 10, QFont.Bold))
+            self.table.setItem(row, 0, name_item)
+
+            # Email
+            email_item = QTableWidgetItem(user['email'])
+            self.table.setItem(row, 1, email_item)
+
+            # Role
+            role_item = QTableWidgetItem(user['role'])
+            if user['role'] == 'Admin':
+                role_item.setForeground(Qt.red)
+                role_item.setFont(QFont("Segoe UI", 10, QFont.Bold))
+            else:
+                role_item.setForeground(Qt.blue)
+            self.table.setItem(row, 2, role_item)
+
+            # Bölüm
+            bolum = user.get('bolum_adi', '-')
+            dept_item = QTableWidgetItem(bolum)
+            self.table.setItem(row, 3, dept_item)
+
+            # Son Giriş
+            son_giris = user.get('son_giris', '')
+            if son_giris:
+                son_giris = son_giris.strftime('%d.%m.%Y %H:%M') if hasattr(son_giris, 'strftime') else str(son_giris)
+            else:
+                son_giris = 'Hiç giriş yok'
+            login_item = QTableWidgetItem(son_giris)
+            login_item.setForeground(Qt.darkGray)
+            self.table.setItem(row, 4, login_item)
+
+            # Actions - Compact buttons aligned left
+            action_widget = QWidget()
+            action_layout = QHBoxLayout(action_widget)
+            action_layout.setContentsMargins(4, 2, 4, 2)
+            action_layout.setSpacing(6)
+
+            edit_btn = QPushButton("Düzenle")
+            edit_btn.setFixedHeight(32)
+            edit_btn.setFixedWidth(75)
+            edit_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #10b981;
+                    color: white;
+                    border: none;
+                    border-radius: 6px;
+                    font-weight: 600;
+                    font-size: 11px;
+                    padding: 4px 8px;
+                }
+                QPushButton:hover {
+                    background-color: #059669;
+                }
+            """)
+            edit_btn.setCursor(Qt.PointingHandCursor)
+            edit_btn.clicked.connect(lambda checked=False, u=user: self.edit_user(u))
+
+            password_btn = QPushButton("Şifre")
+            password_btn.setFixedHeight(32)
+            password_btn.setFixedWidth(60)
+            password_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #3b82f6;
+                    color: white;
+                    border: none;
+                    border-radius: 6px;
+                    font-weight: 600;
+                    font-size: 11px;
+                    padding: 4px 8px;
+                }
+                QPushButton:hover {
+                    background-color: #2563eb;
+                }
+            """)
+            password_btn.setCursor(Qt.PointingHandCursor)
+            password_btn.clicked.connect(lambda checked=False, u=user: self.change_password(u))
+
+            delete_btn = QPushButton("Sil")
+            delete_btn.setFixedHeight(32)
+            delete_btn.setFixedWidth(50)
+            delete_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #ef4444;
+                    color: white;
+                    border: none;
+                    border-radius: 6px;
+                    font-weight: 600;
+                    font-size: 11px;
+                    padding: 4px 8px;
+                }
+                QPushButton:hover {
+                    background-color: #dc2626;
+                }
+            """)
+            delete_btn.setCursor(Qt.PointingHandCursor)
+            delete_btn.clicked.connect(lambda checked=False, u=user: self.delete_user(u))
+
+            action_layout.addWidget(edit_btn)
+            action_layout.addWidget(password_btn)
+            action_layout.addWidget(delete_btn)
+            action_layout.addStretch()
+
+            self.table.setCellWidget(row, 5, action_widget)
+
+        # Adjust columns after loading
+        self.adjust_columns()
+
     def add_user(self):
         """Add new user"""
         try:
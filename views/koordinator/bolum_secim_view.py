@@ -14,6 +14,7 @@ from PySide6.QtGui import QFont
 from models.database import db
 from models.bolum_model import BolumModel
 from utils.modern_dialogs import ModernMessageBox
+from utils.async_query import query_executor
 
 logger = logging.getLogger(__name__)
 
@@ -198,44 +199,61 @@ class BolumSecimView(QWidget):
         layout.addWidget(content, 1)
     
     def load_bolumler(self):
-        """Load departments with assigned coordinators only"""
+        """Load departments with assigned coordinators only (in the background)"""
+        query_executor.submit(
+            self.fetch_bolumler, key=('bolum_secim',), owner=self
+        ).then(self.render_bolumler, self.on_bolumler_error)
+    
+    @staticmethod
+    def fetch_bolumler():
+        """Worker thread: active departments grouped with their coordinators"""
+        query = """
+            SELECT b.bolum_id, b.bolum_kodu, b.bolum_adi,
+                   u.user_id, u.ad_soyad, u.email
+            FROM bolumler b
+            INNER JOIN users u ON b.bolum_id = u.bolum_id
+              AND u.aktif = TRUE 
+              AND u.role = 'Bölüm Koordinatörü'
+            WHERE b.aktif = TRUE 
+            ORDER BY b.bolum_adi
+        """
+        results = db.execute_query(query)
+        
+        # Group by department (in case multiple coordinators per department)
+        bolumler_dict = {}
+        for row in results:
+            bolum_id = row['bolum_id']
+            if bolum_id not in bolumler_dict:
+                bolumler_dict[bolum_id] = {
+                    'bolum_id': row['bolum_id'],
+                    'bolum_kodu': row['bolum_kodu'],
+                    'bolum_adi': row['bolum_adi'],
+                    'koordinatorler': []
+                }
+            bolumler_dict[bolum_id]['koordinatorler'].append({
+                'user_id': row['user_id'],
+                'ad_soyad': row['ad_soyad'],
+                'email': row['email']
+            })
+        
+        return list(bolumler_dict.values())
+    
+    def on_bolumler_error(self, message):
+        logger.error(f"Error loading departments: {message}")
+        ModernMessageBox.error(
+            self,
+            "Yükleme Hatası",
+            "Bölümler yüklenirken bir hata oluştu.",
+            f"Hata detayı:\n{message}"
+        )
+    
+    def render_bolumler(self, bolumler):
+        """Show one card per department"""
         try:
-            # Get departments with assigned coordinators only
-            query = """
-                SELECT b.bolum_id, b.bolum_kodu, b.bolum_adi,
-                       u.user_id, u.ad_soyad, u.email
-                FROM bolumler b
-                INNER JOIN users u ON b.bolum_id = u.bolum_id
-                  AND u.aktif = TRUE 
-                  AND u.role = 'Bölüm Koordinatörü'
-                WHERE b.aktif = TRUE 
-                ORDER BY b.bolum_adi
-            """
-            results = db.execute_query(query)
-            
-            if not results:
+            if not bolumler:
                 self.show_no_departments()
                 return
             
-            # Group by department (in case multiple coordinators per department)
-            bolumler_dict = {}
-            for row in results:
-                bolum_id = row['bolum_id']
-                if bolum_id not in bolumler_dict:
-                    bolumler_dict[bolum_id] = {
-                        'bolum_id': row['bolum_id'],
-                        'bolum_kodu': row['bolum_kodu'],
-                        'bolum_adi': row['bolum_adi'],
-                        'koordinatorler': []
-                    }
-                bolumler_dict[bolum_id]['koordinatorler'].append({
-                    'user_id': row['user_id'],
-                    'ad_soyad': row['ad_soyad'],
-                    'email': row['email']
-                })
-            
-            bolumler = list(bolumler_dict.values())
-            
             # Clear existing
             while self.bolum_layout.count():
                 item = self.bolum_layout.takeAt(0)
@@ -255,13 +273,7 @@ class BolumSecimView(QWidget):
             logger.info(f"Loaded {len(bolumler)} departments with coordinators")
             
         except Exception as e:
-            logger.error(f"Error loading departments: {e}")
-            ModernMessageBox.error(
-                self,
-                "Yükleme Hatası",
-                "Bölümler yüklenirken bir hata oluştu.",
-                f"Hata detayı:\n{str(e)}"
-            )
+            self.on_bolumler_error(str(e))
     
     def show_no_departments(self):
         """Show message when no departments available"""
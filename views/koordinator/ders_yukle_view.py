@@ -17,7 +17,9 @@ from controllers.ders_controller import DersController
 from models.database import db
 from models.ders_model import DersModel
 from models.ogrenci_model import OgrenciModel
+from models.dashboard_model import DashboardModel
 from utils.excel_parser import ExcelParser
+from utils.keyset_pager import KeysetPager
 from utils.modern_dialogs import ModernMessageBox
 
 logger = logging.getLogger(__name__)
@@ -45,6 +47,16 @@ class ExcelLoadThread(QThread):
 class DersYukleView(QWidget):
     """Course upload and management view"""
     
+    # Filtre seçeneği -> get_dersler_sayfasi parametreleri
+    COURSE_FILTERS = {
+        "Tüm Dersler": {},
+        "1. Sınıf": {'sinif': 1},
+        "2. Sınıf": {'sinif': 2},
+        "3. Sınıf": {'sinif': 3},
+        "4. Sınıf": {'sinif': 4},
+        "Seçmeli Dersler": {'ders_yapisi': 'Seçmeli'},
+    }
+    
     def __init__(self, user_data, parent=None):
         super().__init__(parent)
         self.user_data = user_data
@@ -55,8 +67,16 @@ class DersYukleView(QWidget):
         self.ders_controller = DersController(self.ders_model)
         
         self.pending_dersler = []
+        self.course_filter = {}
+        self.registered_count = 0
         
         self.setup_ui()
+        
+        # Kayıtlı dersler sayfa sayfa (kaydırdıkça) yüklenir; filtre sunucuda uygulanır
+        self.pager = KeysetPager(
+            self.table, self.fetch_ders_page, DersModel.sayfa_anahtari, self.append_courses
+        )
+        
         self.load_existing_dersler()
     
     def refresh_main_window_ui(self):
@@ -422,57 +442,54 @@ class DersYukleView(QWidget):
         bottom_layout.addWidget(info_group, stretch=1)
         
         layout.addWidget(bottom_container)
-        
-        # Store all courses
-        self.all_courses = []
     
     def filter_by_class(self, filter_text):
         """Filter courses by class - Excel başlıklarından alınan sınıf bilgisi ile"""
-        if not self.all_courses:
-            return
-        
-        filtered_courses = []
-        
-        if filter_text == "Tüm Dersler":
-            filtered_courses = self.all_courses
-        elif filter_text == "1. Sınıf":
-            filtered_courses = [d for d in self.all_courses if d.get('sinif', 0) == 1]
-        elif filter_text == "2. Sınıf":
-            filtered_courses = [d for d in self.all_courses if d.get('sinif', 0) == 2]
-        elif filter_text == "3. Sınıf":
-            filtered_courses = [d for d in self.all_courses if d.get('sinif', 0) == 3]
-        elif filter_text == "4. Sınıf":
-            filtered_courses = [d for d in self.all_courses if d.get('sinif', 0) == 4]
-        elif filter_text == "Seçmeli Dersler":
-            filtered_courses = [d for d in self.all_courses if d.get('ders_yapisi', '') == 'Seçmeli']
-        
-        # Display filtered results without updating all_courses
-        self.display_courses(filtered_courses)
+        try:
+            self.course_filter = self.COURSE_FILTERS.get(filter_text, {})
+            self.pager.reset()
+        except Exception as e:
+            logger.error(f"Error filtering courses: {e}")
+            ModernMessageBox.error(self, "Hata", "Dersler yüklenirken oluştu", f"{str(e)}")
     
+    def has_pending_changes(self) -> bool:
+        """True while an Excel preview is waiting to be saved"""
+        return bool(self.pending_dersler)
+
     def load_existing_dersler(self):
-        """Load existing courses"""
+        """Load the first page of existing courses (more pages load on scroll)"""
         try:
-            dersler = self.ders_model.get_dersler_by_bolum(self.bolum_id)
-            
             # Reset filter to show all courses
             if hasattr(self, 'class_filter'):
                 self.class_filter.blockSignals(True)
                 self.class_filter.setCurrentIndex(0)  # "Tüm Dersler"
                 self.class_filter.blockSignals(False)
+            self.course_filter = {}
             
-            self.populate_table(dersler, existing=True)
-            self.update_stats(len(dersler), 0)
+            self.pager.reset()
+            self.registered_count = DashboardModel(db).get_bolum_istatistikleri(self.bolum_id)['ders_sayisi']
+            self.update_stats(self.registered_count, 0)
             
-            logger.info(f"Loaded {len(dersler)} courses from database")
+            logger.info(f"Loaded {self.pager.loaded_count}/{self.registered_count} courses from database")
         except Exception as e:
             logger.error(f"Error loading courses: {e}")
             ModernMessageBox.error(self, "Hata", "Dersler yüklenirken oluştu", f"{str(e)}")
     
+    def fetch_ders_page(self, after, limit):
+        """Keyset page source for the pager (honours the class filter)"""
+        return self.ders_model.get_dersler_sayfasi(
+            self.bolum_id, after=after, limit=limit, **self.course_filter
+        )
+    
     def display_courses(self, dersler):
-        """Display courses in table without updating all_courses"""
+        """Display courses in table"""
         self.table.setRowCount(0)
-        
-        for row, ders in enumerate(dersler):
+        self.append_courses(dersler)
+    
+    def append_courses(self, dersler):
+        """Append course rows to the table"""
+        start = self.table.rowCount()
+        for row, ders in enumerate(dersler, start):
             self.table.insertRow(row)
             
             # DERS KODU
@@ -510,12 +527,7 @@ class DersYukleView(QWidget):
             self.table.setItem(row, 4, tur_item)
     
     def populate_table(self, dersler, existing=False):
-        """Populate table with course data and update all_courses if from database"""
-        # Update all_courses only when loading from database
-        if existing:
-            self.all_courses = dersler
-        
-        # Display the courses
+        """Populate table with course data"""
         self.display_courses(dersler)
     
     def upload_excel(self):
@@ -560,9 +572,10 @@ class DersYukleView(QWidget):
                 new_count += 1
         
         self.pending_dersler = dersler
-        # Display pending courses (don't update all_courses until saved)
+        # Display pending courses (paging resumes after save/reload)
+        self.pager.stop()
         self.display_courses(dersler)
-        self.update_stats(len(self.all_courses), len(dersler))
+        self.update_stats(self.registered_count, len(dersler))
         
         # Show summary with existing course info
         summary_msg = f"📚 Excel'den {len(dersler)} ders yüklendi\n\n"
@@ -846,6 +859,8 @@ class DersYukleView(QWidget):
     
     def select_all_courses(self):
         """Select all courses in table"""
+        # Only a page is on screen; load the rest so "all" means all
+        self.pager.fetch_all()
         self.table.selectAll()
     
     def deselect_all_courses(self):
@@ -881,20 +896,15 @@ class DersYukleView(QWidget):
 
         
         if confirmed:
-            success_count = 0
-            error_count = 0
-            
-            for ders_kodu, ders_adi in course_list:
-                ders = self.ders_model.get_ders_by_kod(self.bolum_id, ders_kodu)
-                if ders:
-                    result = self.ders_controller.delete_ders(ders['ders_id'])
-                    if result['success']:
-                        success_count += 1
-                    else:
-                        error_count += 1
-                        logger.error(f"Failed to delete {ders_kodu}: {result['message']}")
-                else:
-                    error_count += 1
+            # One lookup and one DELETE for the whole selection
+            ders_ids = self.ders_model.get_ders_ids_by_kod(self.bolum_id, [kod for kod, _ in course_list])
+            result = self.ders_controller.delete_dersler(list(ders_ids.values()))
+            if result['success']:
+                success_count = result['ders_sayisi']
+            else:
+                success_count = 0
+                logger.error(f"Failed to delete courses: {result['message']}")
+            error_count = len(course_list) - success_count
             
             # Show result message
             if error_count > 0:
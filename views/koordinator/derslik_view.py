@@ -16,6 +16,7 @@ from PySide6.QtGui import QFont
 from models.database import db
 from models.derslik_model import DerslikModel
 from utils.modern_dialogs import ModernMessageBox
+from utils.async_query import query_executor
 from controllers.derslik_controller import DerslikController
 
 logger = logging.getLogger(__name__)
@@ -614,14 +615,20 @@ class DerslikView(QWidget):
         self.save_edit_btn.setEnabled(True)
     
     def load_derslikler(self):
-        """Load classrooms"""
-        try:
-            derslikler = self.derslik_model.get_derslikler_by_bolum(self.bolum_id)
-            self.populate_table(derslikler)
-            self.update_stats(len(derslikler))
-        except Exception as e:
-            logger.error(f"Error loading classrooms: {e}")
-            ModernMessageBox.error(self, "Yükleme Hatası", "Derslikler yüklenirken bir hata oluştu.", f"Hata detayı:\n{str(e)}")
+        """Load classrooms (in the background)"""
+        query_executor.submit(
+            self.derslik_model.get_derslikler_by_bolum, self.bolum_id,
+            key=('derslikler', self.bolum_id), owner=self
+        ).then(self.on_derslikler_loaded, self.on_derslikler_error)
+
+    def on_derslikler_loaded(self, derslikler):
+        """Fill the table with the fetched classrooms"""
+        self.populate_table(derslikler)
+        self.update_stats(len(derslikler))
+
+    def on_derslikler_error(self, message):
+        logger.error(f"Error loading classrooms: {message}")
+        ModernMessageBox.error(self, "Yükleme Hatası", "Derslikler yüklenirken bir hata oluştu.", f"Hata detayı:\n{message}")
     
     def populate_table(self, derslikler):
         """Populate table"""
@@ -5,7 +5,7 @@ Professional interface for uploading and managing students from Excel
 
 import logging
 
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QThread, QTimer, Signal
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
@@ -17,7 +17,9 @@ from PySide6.QtWidgets import (
 from controllers.ogrenci_controller import OgrenciController
 from models.database import db
 from models.ogrenci_model import OgrenciModel
+from models.dashboard_model import DashboardModel
 from utils.excel_parser import ExcelParser
+from utils.keyset_pager import KeysetPager
 from utils.modern_dialogs import ModernMessageBox
 
 logger = logging.getLogger(__name__)
@@ -54,8 +56,20 @@ class OgrenciYukleView(QWidget):
         self.ogrenci_controller = OgrenciController(self.ogrenci_model)
         
         self.pending_ogrenciler = []
+        self.showing_pending = False
         
         self.setup_ui()
+        
+        # Kayıtlı öğrenciler sayfa sayfa (kaydırdıkça) yüklenir; arama sunucuda yapılır
+        self.pager = KeysetPager(
+            self.table, self.fetch_ogrenci_page, OgrenciModel.sayfa_anahtari,
+            lambda rows: self.append_rows(rows, existing=True)
+        )
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.load_existing_ogrenciler)
+        
         self.load_existing_ogrenciler()
     
     def refresh_main_window_ui(self):
@@ -392,20 +406,32 @@ class OgrenciYukleView(QWidget):
         layout.addWidget(bottom_container)
     
     def load_existing_ogrenciler(self):
-        """Load existing students"""
+        """Load the first page of existing students (more pages load on scroll)"""
         try:
-            ogrenciler = self.ogrenci_model.get_ogrenciler_by_bolum(self.bolum_id)
-            self.populate_table(ogrenciler, existing=True)
-            self.update_stats(len(ogrenciler), 0)
+            self.showing_pending = False
+            self.pager.reset()
+            kayitli = DashboardModel(db).get_bolum_istatistikleri(self.bolum_id)['ogrenci_sayisi']
+            self.update_stats(kayitli, 0)
         except Exception as e:
             logger.error(f"Error loading students: {e}")
             ModernMessageBox.error(self, "Hata", "Öğrenciler yüklenirken oluştu", f"{str(e)}")
     
+    def fetch_ogrenci_page(self, after, limit):
+        """Keyset page source for the pager (honours the search box)"""
+        arama = self.search_input.text().strip() if self.search_input else ''
+        return self.ogrenci_model.get_ogrenciler_sayfasi(
+            self.bolum_id, after=after, limit=limit, arama=arama or None
+        )
+    
     def populate_table(self, ogrenciler, existing=False):
         """Populate table with student data"""
         self.table.setRowCount(0)
-        
-        for row, ogrenci in enumerate(ogrenciler):
+        self.append_rows(ogrenciler, existing)
+    
+    def append_rows(self, ogrenciler, existing=False):
+        """Append student rows to the table"""
+        start = self.table.rowCount()
+        for row, ogrenci in enumerate(ogrenciler, start):
             self.table.insertRow(row)
             
             self.table.setItem(row, 0, QTableWidgetItem(str(ogrenci.get('ogrenci_no', ''))))
@@ -422,6 +448,11 @@ class OgrenciYukleView(QWidget):
     
     def filter_table(self):
         """Filter table based on search"""
+        if not self.showing_pending:
+            # Saved students are searched in the database (debounced)
+            self.search_timer.start()
+            return
+        
         search_text = self.search_input.text().lower()
         
         for row in range(self.table.rowCount()):
@@ -475,6 +506,8 @@ class OgrenciYukleView(QWidget):
                 new_count += 1
         
         self.pending_ogrenciler = ogrenciler
+        self.showing_pending = True
+        self.pager.stop()
         self.populate_table(ogrenciler, existing=False)
         self.update_stats(0, len(ogrenciler))
         
@@ -662,6 +695,9 @@ class OgrenciYukleView(QWidget):
     
     def select_all_students(self):
         """Select all students in table"""
+        if not self.showing_pending:
+            # Only a page is on screen; load the rest so "all" means all
+            self.pager.fetch_all()
         self.table.selectAll()
     
     def deselect_all_students(self):
@@ -701,16 +737,13 @@ class OgrenciYukleView(QWidget):
 
         
         if confirmed:
-            success_count = 0
-            error_count = 0
-            
-            for ogrenci_no, ad_soyad in student_list:
-                result = self.ogrenci_controller.delete_ogrenci(ogrenci_no)
-                if result['success']:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    logger.error(f"Failed to delete {ogrenci_no}: {result['message']}")
+            result = self.ogrenci_controller.delete_ogrenciler([ogrenci_no for ogrenci_no, _ in student_list])
+            if result['success']:
+                success_count = result['ogrenci_sayisi']
+            else:
+                success_count = 0
+                logger.error(f"Failed to delete students: {result['message']}")
+            error_count = len(student_list) - success_count
             
             ModernMessageBox.success(
                 self, "İşlem Tamamlandı", f"{success_count} öğrenci silindi", f"❌ {error_count} öğrenci silinemedi"
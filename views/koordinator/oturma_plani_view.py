@@ -20,6 +20,7 @@ from models.sinav_model import SinavModel
 from models.derslik_model import DerslikModel
 from models.ogrenci_model import OgrenciModel
 from utils.modern_dialogs import ModernMessageBox, sanitize_filename
+from utils.async_query import query_executor
 from algorithms.oturma_planlama import OturmaPlanlama
 
 logger = logging.getLogger(__name__)
@@ -213,24 +214,32 @@ class OturmaPlaniView(QWidget):
         layout.addLayout(content_layout)
 
     def load_exams(self):
-        """Load all exams for the department"""
+        """Load all exams for the department (in the background)"""
+        query_executor.submit(
+            self.fetch_exams, self.bolum_id, key=('oturma_plani_sinavlar', self.bolum_id), owner=self
+        ).then(self.render_exams, self.on_exams_error)
+
+    def fetch_exams(self, bolum_id: int) -> List[Dict]:
+        """Worker thread: exams of every program of the department"""
+        all_exams = []
+        for program in self.sinav_model.get_programs_by_bolum(bolum_id):
+            for exam in self.sinav_model.get_sinavlar_by_program(program['program_id']):
+                exam['program_id'] = program['program_id']
+                exam['program_adi'] = program['program_adi']
+                all_exams.append(exam)
+        return all_exams
+
+    def on_exams_error(self, message: str):
+        logger.error(f"Error loading exams: {message}")
+        ModernMessageBox.error(self, "Yükleme Hatası", "Sınavlar yüklenirken bir hata oluştu.", f"Hata detayı:\n{message}")
+
+    def render_exams(self, all_exams: List[Dict]):
+        """Fill the exam table"""
         try:
-            # Get all exam programs for department
-            programs = self.sinav_model.get_programs_by_bolum(self.bolum_id)
-
-            if not programs:
+            if not all_exams:
                 logger.info("Oturma Planı: Henüz sınav programı yok")
                 return
 
-            # Get exams from all programs
-            all_exams = []
-            for program in programs:
-                exams = self.sinav_model.get_sinavlar_by_program(program['program_id'])
-                for exam in exams:
-                    exam['program_id'] = program['program_id']
-                    exam['program_adi'] = program['program_adi']
-                    all_exams.append(exam)
-
             logger.info(f"Oturma Planı: {len(all_exams)} sınav yüklendi")
             self.exams_table.setRowCount(0)
 
@@ -277,8 +286,8 @@ class OturmaPlaniView(QWidget):
                         item.setData(Qt.UserRole, exam)
 
         except Exception as e:
-            logger.error(f"Error loading exams: {e}", exc_info=True)
-            ModernMessageBox.error(self, "Yükleme Hatası", "Sınavlar yüklenirken bir hata oluştu.", f"Hata detayı:\n{str(e)}")
+            logger.error(f"Error rendering exams: {e}", exc_info=True)
+            self.on_exams_error(str(e))
 
     def on_exam_selected(self):
         """Handle exam selection"""
@@ -368,7 +377,8 @@ class OturmaPlaniView(QWidget):
             ders_id = self.selected_sinav.get('ders_id')
             sinav_id = self.selected_sinav.get('sinav_id')
 
-            students = self.ogrenci_model.get_ogrenciler_by_ders(ders_id)
+            with db.read_replica():
+                students = self.ogrenci_model.get_ogrenciler_by_ders(ders_id)
 
             if not students:
                 ModernMessageBox.information(self, "Bilgi", "Bu derse kayıtlı öğrenci bulunamadı!")
@@ -472,7 +482,8 @@ class OturmaPlaniView(QWidget):
                 WHERE sd.sinav_id = %s
                 ORDER BY dr.derslik_adi
             """
-            result = db.execute_query(query, (sinav_id,), fetch=True)
+            with db.read_replica():
+                result = db.execute_query(query, (sinav_id,), fetch=True)
             return result if result else []
         except Exception as e:
             logger.error(f"Error getting exam classrooms: {e}", exc_info=True)
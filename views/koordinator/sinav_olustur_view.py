@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (
     QGroupBox, QFormLayout, QSpinBox, QTableWidget,
     QTableWidgetItem, QHeaderView, QProgressBar, QCheckBox,
     QLineEdit, QScrollArea, QFileDialog, QTabWidget, QDialog,
-    QDialogButtonBox
+    QDialogButtonBox, QInputDialog
 )
 from PySide6.QtCore import Qt, QDateTime, QThread, Signal
 from PySide6.QtGui import QFont, QColor
@@ -21,10 +21,12 @@ from models.sinav_model import SinavModel
 from models.ders_model import DersModel
 from models.derslik_model import DerslikModel
 from models.ogrenci_model import OgrenciModel
+from models.bolum_model import BolumModel
 from controllers.sinav_controller import SinavController
 from algorithms.sinav_planlama import SinavPlanlama
 from utils.export_utils import ExportUtils
 from utils.modern_dialogs import ModernMessageBox, sanitize_filename
+from utils.async_query import query_executor
 
 logger = logging.getLogger(__name__)
 
@@ -239,9 +241,7 @@ class ProgramResultDialog(QDialog):
                 return
 
             # Get department info
-            bolum_query = "SELECT bolum_adi FROM bolumler WHERE bolum_id = %s"
-            bolum_result = db.execute_query(bolum_query, (self.bolum_id,))
-            bolum_adi = bolum_result[0]['bolum_adi'] if bolum_result else "BÖLÜM"
+            bolum_adi = BolumModel(db).get_bolum_adi(self.bolum_id)
 
             sinav_tipi = self.params.get('sinav_tipi', 'SINAV')
 
@@ -280,9 +280,7 @@ class ProgramResultDialog(QDialog):
                 return
 
             # Get department info
-            bolum_query = "SELECT bolum_adi FROM bolumler WHERE bolum_id = %s"
-            bolum_result = db.execute_query(bolum_query, (self.bolum_id,))
-            bolum_adi = bolum_result[0]['bolum_adi'] if bolum_result else "BÖLÜM"
+            bolum_adi = BolumModel(db).get_bolum_adi(self.bolum_id)
 
             sinav_tipi = self.params.get('sinav_tipi', 'SINAV')
 
@@ -719,6 +717,14 @@ class SinavOlusturView(QWidget):
         self.ayni_anda_sinav_checkbox.setStyleSheet("font-size: 11px;")
         constraints_layout.addWidget(self.ayni_anda_sinav_checkbox)
 
+        self.derslik_zaman_cizelgesi_checkbox = QCheckBox("Boşalan derslikleri hemen kullan")
+        self.derslik_zaman_cizelgesi_checkbox.setToolTip(
+            "Kısa süren sınavın dersliği, aynı oturumdaki en uzun sınavın bitmesini beklemeden yeni sınava verilir"
+        )
+        self.derslik_zaman_cizelgesi_checkbox.setChecked(True)
+        self.derslik_zaman_cizelgesi_checkbox.setStyleSheet("font-size: 11px;")
+        constraints_layout.addWidget(self.derslik_zaman_cizelgesi_checkbox)
+
         gunluk_limit_layout = QHBoxLayout()
         gunluk_limit_layout.setSpacing(8)
         gunluk_limit_label = QLabel("Günlük limit (sınıf):")
@@ -1121,10 +1127,26 @@ class SinavOlusturView(QWidget):
         layout.addWidget(self.create_btn)
 
     def load_existing_programs(self):
-        """Load and display existing programs"""
+        """Load and display existing programs (in the background)"""
+        query_executor.submit(
+            self.fetch_existing_programs, self.bolum_id,
+            key=('sinav_programlari', self.bolum_id), owner=self
+        ).then(self.render_existing_programs, self.on_programs_error)
+
+    def fetch_existing_programs(self, bolum_id):
+        """Worker thread: programs of the department with their exam counts"""
+        programs = self.sinav_model.get_programs_by_bolum(bolum_id)
+        for program in programs:
+            program['sinav_sayisi'] = len(self.sinav_model.get_sinavlar_by_program(program['program_id']))
+        return programs
+
+    def on_programs_error(self, message):
+        logger.error(f"Error loading programs: {message}")
+        QMessageBox.critical(self, "Hata", f"Programlar yüklenirken hata:\n{message}")
+
+    def render_existing_programs(self, programs):
+        """Fill the programs table"""
         try:
-            programs = self.sinav_model.get_programs_by_bolum(self.bolum_id)
-
             self.programs_table.setRowCount(0)
 
             for program in programs:
@@ -1132,8 +1154,7 @@ class SinavOlusturView(QWidget):
                 self.programs_table.insertRow(row)
                 self.programs_table.setRowHeight(row, 50)
 
-                sinavlar = self.sinav_model.get_sinavlar_by_program(program['program_id'])
-                exam_count = len(sinavlar)
+                exam_count = program.pop('sinav_sayisi', 0)
 
                 self.programs_table.setItem(row, 0, QTableWidgetItem(program['program_adi']))
                 self.programs_table.setItem(row, 1, QTableWidgetItem(program.get('sinav_tipi', 'Final')))
@@ -1268,8 +1289,8 @@ class SinavOlusturView(QWidget):
             logger.info(f"Loaded {len(programs)} exam programs")
 
         except Exception as e:
-            logger.error(f"Error loading programs: {e}", exc_info=True)
-            QMessageBox.critical(self, "Hata", f"Programlar yüklenirken hata:\n{str(e)}")
+            logger.error(f"Error rendering programs: {e}", exc_info=True)
+            self.on_programs_error(str(e))
 
     def view_program(self, program):
         """View program details in a dialog"""
@@ -1404,7 +1425,7 @@ class SinavOlusturView(QWidget):
     def export_program_excel(self, program):
         """Export program to Excel"""
         try:
-            sinavlar = self.sinav_model.get_sinavlar_by_program(program['program_id'])
+            sinavlar = self.sinav_model.get_sinavlar_for_export(program['program_id'])
 
             if not sinavlar:
                 QMessageBox.information(self, "Bilgi", "Bu programda henüz sınav yok!")
@@ -1424,9 +1445,7 @@ class SinavOlusturView(QWidget):
                 return
 
             # Get department info
-            bolum_query = "SELECT bolum_adi FROM bolumler WHERE bolum_id = %s"
-            bolum_result = db.execute_query(bolum_query, (self.bolum_id,))
-            bolum_adi = bolum_result[0]['bolum_adi'] if bolum_result else "BÖLÜM"
+            bolum_adi = BolumModel(db).get_bolum_adi(self.bolum_id)
             sinav_tipi = program.get('sinav_tipi', 'SINAV')
 
             data = {
@@ -1452,16 +1471,14 @@ class SinavOlusturView(QWidget):
     def export_program_pdf(self, program):
         """Export program to PDF using ExportUtils"""
         try:
-            sinavlar = self.sinav_model.get_sinavlar_by_program(program['program_id'])
+            sinavlar = self.sinav_model.get_sinavlar_for_export(program['program_id'])
 
             if not sinavlar:
                 QMessageBox.information(self, "Bilgi", "Bu programda henüz sınav yok!")
                 return
 
             # Get department info
-            bolum_query = "SELECT bolum_adi FROM bolumler WHERE bolum_id = %s"
-            bolum_result = db.execute_query(bolum_query, (self.bolum_id,))
-            bolum_adi = bolum_result[0]['bolum_adi'] if bolum_result else "BÖLÜM"
+            bolum_adi = BolumModel(db).get_bolum_adi(self.bolum_id)
             sinav_tipi = program.get('sinav_tipi', 'SINAV')
 
             # Ask for save location
@@ -1510,7 +1527,7 @@ class SinavOlusturView(QWidget):
             import os
             from datetime import datetime
 
-            sinavlar = self.sinav_model.get_sinavlar_by_program(program['program_id'])
+            sinavlar = self.sinav_model.get_sinavlar_for_export(program['program_id'])
 
             if not sinavlar:
                 QMessageBox.information(self, "Bilgi", "Bu programda henüz sınav yok!")
@@ -1771,10 +1788,7 @@ class SinavOlusturView(QWidget):
                 if not bolum_adi:
                     # Try to get from database if not in user_data
                     try:
-                        from models.bolum_model import BolumModel
-                        bolum_model = BolumModel(db)
-                        bolum = bolum_model.get_bolum_by_id(self.bolum_id)
-                        bolum_adi = bolum.get('bolum_adi', '') if bolum else ''
+                        bolum_adi = BolumModel(db).get_bolum_adi(self.bolum_id, default='')
                     except:
                         bolum_adi = ''
 
@@ -2207,6 +2221,7 @@ class SinavOlusturView(QWidget):
             'ogle_arasi_baslangic': ogle_baslangic,
             'ogle_arasi_bitis': ogle_bitis,
             'no_parallel_exams': self.ayni_anda_sinav_checkbox.isChecked(),
+            'room_timeline': self.derslik_zaman_cizelgesi_checkbox.isChecked(),
             'class_per_day_limit': self.gunluk_sinav_limiti.value(),
             'ders_sinavlari_suresi': ders_sureleri,
         }
@@ -2245,6 +2260,10 @@ class SinavOlusturView(QWidget):
         schedule = result.get('schedule', [])
 
         if schedule and result.get('success'):
+            schedule = self.select_pareto_alternative(result, schedule)
+            if schedule is None:
+                return
+
             # Show result dialog
             params = {
                 'bolum_id': self.bolum_id,
@@ -2271,6 +2290,52 @@ class SinavOlusturView(QWidget):
                 details
             )
 
+    def select_pareto_alternative(self, result, schedule):
+        """Let the coordinator pick one of the non-dominated alternatives (None = cancelled)"""
+        front = result.get('pareto_front') or []
+        if len(front) < 2:
+            return schedule
+
+        labels = []
+        for idx, alt in enumerate(front, start=1):
+            obj = alt['objectives']
+            label = (
+                f"{idx}. {obj['scheduled_courses']} ders | {obj['days_used']} gün | "
+                f"öğrenci/gün maks {obj['max_student_load']}, ort {obj['avg_student_load']:.2f} | "
+                f"ardışık sınıf cezası {obj['class_gap_penalty']}"
+            )
+            error_count = alt.get('validation', {}).get('stats', {}).get('error_count', 0)
+            if error_count:
+                label += f" | ⚠️ {error_count} denetim uyarısı"
+            labels.append(label)
+
+        choice, ok = QInputDialog.getItem(
+            self,
+            "Alternatif Programlar",
+            "Birbirine üstün olmayan alternatifler bulundu.\nİncelemek istediğiniz programı seçin:",
+            labels,
+            0,
+            False
+        )
+        if not ok:
+            return None
+
+        chosen = front[labels.index(choice)]
+        # Result reflects the chosen alternative, not the best-ranked one
+        for field in ('schedule', 'message', 'stats', 'warnings', 'validation'):
+            result[field] = chosen[field]
+
+        audit_errors = chosen['validation'].get('errors', [])
+        if audit_errors:
+            error_count = chosen['validation'].get('stats', {}).get('error_count', len(audit_errors))
+            ModernMessageBox.warning(
+                self,
+                "Denetim Uyarıları",
+                f"Seçilen program denetimde {error_count} uyarı verdi.",
+                "\n".join(audit_errors)
+            )
+        return chosen['schedule']
+
     def on_planning_error(self, error_msg):
         """Handle planning error"""
         self.progress_bar.setVisible(False)
@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (
     QFrame, QGraphicsOpacityEffect, QProgressBar,
     QApplication, QStackedWidget, QMessageBox
 )
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer, Signal
+from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer, QThread, Signal
 from PySide6.QtGui import QFont, QColor
 
 sys.path.append(str(Path(__file__).parent.parent))
@@ -29,6 +29,8 @@ from views.admin.bolum_yonetimi_view import BolumYonetimiView
 from views.admin.duyuru_yonetimi_view import DuyuruYonetimiView
 from styles.theme import KocaeliTheme
 from utils.modern_dialogs import ModernMessageBox
+from utils.change_notifier import ChangeNotifier
+from utils.async_query import query_executor
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +92,24 @@ class Theme:
         return "0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05)"
 
 
+class DashboardLoadThread(QThread):
+    """Thread for loading dashboard statistics off the GUI thread"""
+    loaded = Signal(dict)
+    error = Signal(str)
+
+    def __init__(self, bolum_id=None):
+        super().__init__()
+        self.bolum_id = bolum_id
+
+    def run(self):
+        try:
+            from models.database import db
+            from models.dashboard_model import DashboardModel
+            self.loaded.emit(DashboardModel(db).load_dashboard(self.bolum_id))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class StatCard(QFrame):
     """Statistics card"""
 
@@ -297,6 +317,14 @@ class MainWindow(QMainWindow):
     module_opened = Signal(str)
     logout_requested = Signal()
 
+    # Başka bir örnekte değişen tablo -> (sayfa, yeniden yükleme metodu)
+    REMOTE_REFRESH = {
+        'derslikler': (('derslikler', 'load_derslikler'),),
+        'dersler': (('dersler', 'load_existing_dersler'),),
+        'sinav_programi': (('sinavlar', 'load_existing_programs'), ('oturma', 'load_exams')),
+        'sinavlar': (('sinavlar', 'load_existing_programs'), ('oturma', 'load_exams')),
+    }
+
     def __init__(self, user_data, parent=None):
         super().__init__(parent)
         self.user_data = user_data
@@ -308,6 +336,9 @@ class MainWindow(QMainWindow):
         self.is_impersonating = False
         self._original_user_data = None
         self.impersonated_user_data = None
+        # Son yüklenen dashboard verisi (bolum_id -> veri); yeniden çizimde anında gösterilir
+        self._dashboard_data = {}
+        self._dashboard_threads = set()
         
         # Admin için bölüm kontrolü
         self.is_admin = user_data.get('role') == 'Admin'
@@ -319,6 +350,16 @@ class MainWindow(QMainWindow):
         self.setup_ui()
         self.apply_styles()
 
+        # Diğer örneklerin yazımlarını dinle; görünür sayfa hemen, diğerleri açılınca yenilenir
+        self._stale_pages = set()
+        self._pending_changes = []
+        self._change_timer = QTimer(self)
+        self._change_timer.setSingleShot(True)
+        self._change_timer.setInterval(300)
+        self._change_timer.timeout.connect(self.apply_remote_changes)
+        self.change_notifier = ChangeNotifier(tables=self.REMOTE_REFRESH.keys(), parent=self)
+        self.change_notifier.table_changed.connect(self.on_remote_change)
+
         self.showMaximized()
 
     def setup_ui(self):
@@ -684,6 +725,8 @@ class MainWindow(QMainWindow):
         
         layout.addLayout(bottom_row)
 
+        self.load_dashboard_stats()
+
         return content
 
     def create_welcome_card(self):
@@ -776,7 +819,7 @@ class MainWindow(QMainWindow):
         return card
 
     def create_stats_card(self):
-        """Statistics card with real data"""
+        """Statistics card (filled by load_dashboard_stats)"""
         card = QFrame()
         layout = QVBoxLayout(card)
         layout.setContentsMargins(24, 24, 24, 24)
@@ -786,74 +829,10 @@ class MainWindow(QMainWindow):
         title.setFont(QFont("Segoe UI", 14, QFont.Bold))
         layout.addWidget(title)
 
-        # Get real statistics
         stats_list = QWidget()
-        stats_layout = QVBoxLayout(stats_list)
-        stats_layout.setSpacing(12)
-
-        try:
-            from models.database import db
-            is_impersonating = getattr(self, 'is_impersonating', False)
-            eff_user = self.get_effective_user_data()
-            
-            if self.is_admin and not is_impersonating:
-                # Admin stats
-                users_count = db.execute_query("SELECT COUNT(*) AS c FROM users WHERE aktif = TRUE")[0]['c']
-                bolum_count = db.execute_query("SELECT COUNT(*) AS c FROM bolumler WHERE aktif = TRUE")[0]['c']
-                koor_count = db.execute_query("SELECT COUNT(*) AS c FROM users WHERE aktif = TRUE AND role = 'Bölüm Koordinatörü'")[0]['c']
-                
-                stats_data = [
-                    ("👥 Aktif Kullanıcılar", users_count),
-                    ("🏢 Bölümler", bolum_count),
-                    ("👨‍🏫 Koordinatörler", koor_count),
-                ]
-            else:
-                # Department stats
-                from models.sinav_model import SinavModel
-                from models.ders_model import DersModel
-                from models.derslik_model import DerslikModel
-                from models.ogrenci_model import OgrenciModel
-                
-                bolum_id = eff_user.get('bolum_id')
-                sinav_model = SinavModel(db)
-                ders_model = DersModel(db)
-                derslik_model = DerslikModel(db)
-                ogrenci_model = OgrenciModel(db)
-                
-                programlar = sinav_model.get_programs_by_bolum(bolum_id)
-                program_count = len([p for p in programlar if p.get('aktif', True)])
-                ders_count = len(ders_model.get_dersler_by_bolum(bolum_id))
-                derslik_count = len(derslik_model.get_derslikler_by_bolum(bolum_id))
-                ogrenci_count = len(ogrenci_model.get_ogrenciler_by_bolum(bolum_id))
-                
-                stats_data = [
-                    ("📅 Sınav Programları", program_count),
-                    ("📚 Dersler", ders_count),
-                    ("🏛 Derslikler", derslik_count),
-                    ("👨‍🎓 Öğrenciler", ogrenci_count),
-                ]
-        except Exception as e:
-            logger.error(f"Stats error: {e}")
-            stats_data = [("⚠️ Veri yüklenemedi", 0)]
-
-        for label, value in stats_data:
-            item = QWidget()
-            item_layout = QHBoxLayout(item)
-            item_layout.setContentsMargins(0, 0, 0, 0)
-            item_layout.setSpacing(12)
-
-            lbl = QLabel(label)
-            lbl.setFont(QFont("Segoe UI", 11))
-            item_layout.addWidget(lbl)
-            
-            item_layout.addStretch()
-
-            val = QLabel(str(value))
-            val.setFont(QFont("Segoe UI", 14, QFont.Bold))
-            val.setStyleSheet("color: #10b981;")
-            item_layout.addWidget(val)
-
-            stats_layout.addWidget(item)
+        self._stats_layout = QVBoxLayout(stats_list)
+        self._stats_layout.setSpacing(12)
+        self._stats_layout.addWidget(self._muted_label("Yükleniyor..."))
 
         layout.addWidget(stats_list)
         layout.addStretch()
@@ -861,7 +840,7 @@ class MainWindow(QMainWindow):
         return card
     
     def create_activity_card(self):
-        """Recent activity or upcoming events card"""
+        """Recent activity or upcoming events card (filled by load_dashboard_stats)"""
         card = QFrame()
         layout = QVBoxLayout(card)
         layout.setContentsMargins(24, 24, 24, 24)
@@ -871,64 +850,130 @@ class MainWindow(QMainWindow):
         title.setFont(QFont("Segoe UI", 14, QFont.Bold))
         layout.addWidget(title)
 
-        # Activity list
         activity_list = QWidget()
-        activity_layout = QVBoxLayout(activity_list)
-        activity_layout.setSpacing(12)
-
-        try:
-            from models.database import db
-            is_impersonating = getattr(self, 'is_impersonating', False)
-            eff_user = self.get_effective_user_data()
-            
-            if self.is_admin and not is_impersonating:
-                # Admin: show recent system activities
-                recent_users = db.execute_query("""
-                    SELECT ad_soyad, son_giris 
-                    FROM users 
-                    WHERE aktif = TRUE AND son_giris IS NOT NULL
-                    ORDER BY son_giris DESC 
-                    LIMIT 5
-                """)
-                
-                if recent_users:
-                    for user in recent_users:
-                        activity_item = QLabel(f"• {user['ad_soyad']} - Son giriş")
-                        activity_item.setFont(QFont("Segoe UI", 10))
-                        activity_layout.addWidget(activity_item)
-                else:
-                    no_data = QLabel("Henüz aktivite yok")
-                    no_data.setFont(QFont("Segoe UI", 10))
-                    no_data.setStyleSheet("color: #9ca3af;")
-                    activity_layout.addWidget(no_data)
-            else:
-                # Department: show recent exam programs
-                from models.sinav_model import SinavModel
-                bolum_id = eff_user.get('bolum_id')
-                sinav_model = SinavModel(db)
-                programlar = sinav_model.get_programs_by_bolum(bolum_id)
-                
-                if programlar:
-                    for prog in programlar[:5]:
-                        prog_item = QLabel(f"• {prog.get('program_adi', 'Program')}")
-                        prog_item.setFont(QFont("Segoe UI", 10))
-                        activity_layout.addWidget(prog_item)
-                else:
-                    no_data = QLabel("Henüz sınav programı yok")
-                    no_data.setFont(QFont("Segoe UI", 10))
-                    no_data.setStyleSheet("color: #9ca3af;")
-                    activity_layout.addWidget(no_data)
-        except Exception as e:
-            logger.error(f"Activity error: {e}")
-            error_label = QLabel("⚠️ Veri yüklenemedi")
-            error_label.setFont(QFont("Segoe UI", 10))
-            activity_layout.addWidget(error_label)
+        self._activity_layout = QVBoxLayout(activity_list)
+        self._activity_layout.setSpacing(12)
+        self._activity_layout.addWidget(self._muted_label("Yükleniyor..."))
 
         layout.addWidget(activity_list)
         layout.addStretch()
 
         return card
 
+    def _dashboard_bolum_id(self):
+        """Department shown on the dashboard; None for the admin overview"""
+        if self.is_admin and not getattr(self, 'is_impersonating', False):
+            return None
+        return self.get_effective_user_data().get('bolum_id')
+
+    def load_dashboard_stats(self):
+        """Paint the last known numbers immediately, then refresh them in the background"""
+        bolum_id = self._dashboard_bolum_id()
+        if bolum_id in self._dashboard_data:
+            self.render_dashboard_stats(self._dashboard_data[bolum_id])
+
+        thread = DashboardLoadThread(bolum_id)
+        thread.loaded.connect(lambda data, key=bolum_id: self.on_dashboard_loaded(key, data))
+        thread.error.connect(self.on_dashboard_error)
+        # Keep a reference until the thread has really stopped
+        self._dashboard_threads.add(thread)
+        thread.finished.connect(lambda t=thread: self._dashboard_threads.discard(t))
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+
+    def on_dashboard_loaded(self, bolum_id, data):
+        """Store the result and draw it if the dashboard still shows that department"""
+        self._dashboard_data[bolum_id] = data
+        if bolum_id == self._dashboard_bolum_id():
+            self.render_dashboard_stats(data)
+
+    def on_dashboard_error(self, error_msg):
+        logger.error(f"Stats error: {error_msg}")
+        if self._dashboard_bolum_id() in self._dashboard_data:
+            return  # Keep showing the last known numbers
+        self._fill_layout(self._stats_layout, [self._muted_label("⚠️ Veri yüklenemedi")])
+        self._fill_layout(self._activity_layout, [self._muted_label("⚠️ Veri yüklenemedi")])
+
+    def render_dashboard_stats(self, data):
+        """Fill the statistics and activity cards from DashboardModel.load_dashboard output"""
+        if 'ozet' in data:
+            ozet = data['ozet']
+            stats_data = [
+                ("👥 Aktif Kullanıcılar", ozet['kullanici_sayisi']),
+                ("🏢 Bölümler", ozet['bolum_sayisi']),
+                ("👨‍🏫 Koordinatörler", ozet['koordinator_sayisi']),
+            ]
+            # Per-department breakdown
+            for bolum in data.get('bolumler', []):
+                stats_data.append((
+                    f"🎓 {bolum['bolum_kodu']}",
+                    f"{bolum['ders_sayisi']} ders · {bolum['ogrenci_sayisi']} öğrenci · "
+                    f"{bolum['derslik_sayisi']} derslik · {bolum['program_sayisi']} program"
+                ))
+            activities = [f"• {user['ad_soyad']} - Son giriş" for user in data.get('aktiviteler', [])]
+            empty_msg = "Henüz aktivite yok"
+        else:
+            bolum = data['bolum']
+            stats_data = [
+                ("📅 Sınav Programları", bolum['program_sayisi']),
+                ("📚 Dersler", bolum['ders_sayisi']),
+                ("🏛 Derslikler", bolum['derslik_sayisi']),
+                ("👨‍🎓 Öğrenciler", bolum['ogrenci_sayisi']),
+            ]
+            activities = [f"• {prog.get('program_adi', 'Program')}" for prog in data.get('aktiviteler', [])]
+            empty_msg = "Henüz sınav programı yok"
+
+        stat_items = []
+        for label, value in stats_data:
+            item = QWidget()
+            item_layout = QHBoxLayout(item)
+            item_layout.setContentsMargins(0, 0, 0, 0)
+            item_layout.setSpacing(12)
+
+            lbl = QLabel(label)
+            lbl.setFont(QFont("Segoe UI", 11))
+            item_layout.addWidget(lbl)
+            
+            item_layout.addStretch()
+
+            val = QLabel(str(value))
+            if isinstance(value, str):
+                val.setFont(QFont("Segoe UI", 10))
+                val.setStyleSheet("color: #9ca3af;")
+            else:
+                val.setFont(QFont("Segoe UI", 14, QFont.Bold))
+                val.setStyleSheet("color: #10b981;")
+            item_layout.addWidget(val)
+
+            stat_items.append(item)
+        self._fill_layout(self._stats_layout, stat_items)
+
+        activity_items = []
+        for text in activities:
+            activity_item = QLabel(text)
+            activity_item.setFont(QFont("Segoe UI", 10))
+            activity_items.append(activity_item)
+        self._fill_layout(self._activity_layout, activity_items or [self._muted_label(empty_msg)])
+
+    def _muted_label(self, text):
+        label = QLabel(text)
+        label.setFont(QFont("Segoe UI", 10))
+        label.setStyleSheet("color: #9ca3af;")
+        return label
+
+    def _fill_layout(self, layout, widgets):
+        """Replace the widgets of a layout"""
+        try:
+            while layout.count():
+                old = layout.takeAt(0).widget()
+                if old is not None:
+                    old.deleteLater()
+            for widget in widgets:
+                layout.addWidget(widget)
+        except RuntimeError:
+            # Dashboard was rebuilt while loading; the old layout is gone
+            pass
+
     def toggle_theme(self):
         """Toggle theme"""
         self.theme.dark_mode = not self.theme.dark_mode
@@ -988,6 +1033,16 @@ class MainWindow(QMainWindow):
         # Switch to page
         if page_id in self.pages:
             target_page = self.pages[page_id]
+            current_page = self.content_stack.currentWidget()
+            if current_page is not None and current_page is not target_page:
+                # Responses for the page being left are stale; drop them and
+                # reload the page when it is shown again
+                if query_executor.cancel_owner(current_page):
+                    left_id = next((pid for pid, page in self.pages.items() if page is current_page), None)
+                    if left_id is not None:
+                        self._stale_pages.add(left_id)
+            if page_id in self._stale_pages:
+                self.reload_page(page_id)
             self.content_stack.setCurrentWidget(target_page)
             logger.info(f"✅ Switched to page: {page_id}")
         else:
@@ -1155,6 +1210,67 @@ class MainWindow(QMainWindow):
             self.pages['dashboard'] = self.dashboard_page
             self.content_stack.setCurrentWidget(self.dashboard_page)
 
+    def on_remote_change(self, tablo, event):
+        """Collect change notifications; bursts are applied together"""
+        self._pending_changes.append((tablo, event))
+        self._change_timer.start()
+
+    def apply_remote_changes(self):
+        """Reload only the pages affected by the collected notifications"""
+        changes, self._pending_changes = self._pending_changes, []
+        eff_bolum_id = self.get_effective_user_data().get('bolum_id')
+
+        affected = set()
+        for tablo, event in changes:
+            bolum_id = event.get('bolum_id')
+            if tablo != '*' and bolum_id is not None and bolum_id != eff_bolum_id:
+                continue
+            if tablo == '*':
+                for targets in self.REMOTE_REFRESH.values():
+                    affected.update(page_id for page_id, _ in targets)
+            else:
+                affected.update(page_id for page_id, _ in self.REMOTE_REFRESH.get(tablo, ()))
+
+        if not affected:
+            return
+        logger.info(f"🔄 Remote changes affect pages: {sorted(affected)}")
+
+        current = self.content_stack.currentWidget()
+        for page_id in affected:
+            if page_id not in self.pages:
+                continue
+            if self.pages[page_id] is current:
+                self.reload_page(page_id)
+            else:
+                self._stale_pages.add(page_id)
+
+        if self.active_menu == 'dashboard':
+            self.refresh_ui_for_data_change()
+
+    def reload_page(self, page_id):
+        """Re-run the loaders of a cached page"""
+        page = self.pages.get(page_id)
+        has_pending_changes = getattr(page, 'has_pending_changes', None)
+        if has_pending_changes is not None and has_pending_changes():
+            # Reloading would replace an unsaved preview; retry when the page is shown again
+            self._stale_pages.add(page_id)
+            return
+        self._stale_pages.discard(page_id)
+        method_names = {
+            method_name
+            for targets in self.REMOTE_REFRESH.values()
+            for target_page, method_name in targets
+            if target_page == page_id
+        }
+        for method_name in method_names:
+            loader = getattr(page, method_name, None)
+            if loader is None:
+                continue
+            try:
+                loader()
+            except Exception as e:
+                logger.error(f"Error reloading {page_id}.{method_name}: {e}", exc_info=True)
+
     def refresh_top_bar(self):
         """Recreate top bar to reflect impersonation state and user info"""
         if hasattr(self, 'top_bar') and self.top_bar:
@@ -1228,13 +1344,16 @@ class MainWindow(QMainWindow):
             logger.error(f"Error creating page {page_id}: {e}", exc_info=True)
             raise
     
+    def _bolum_istatistikleri(self, bolum_id):
+        """Summary counts of a department (one primary key read)"""
+        from models.database import db
+        from models.dashboard_model import DashboardModel
+        return DashboardModel(db).get_bolum_istatistikleri(bolum_id)
+    
     @property
     def _check_classrooms_exist(self) -> bool:
         """Check if classrooms exist for current user/bolum"""
         try:
-            from models.database import db
-            from models.derslik_model import DerslikModel
-            
             # Get effective user (handle impersonation)
             eff_user = self.get_effective_user_data()
             eff_bolum_id = eff_user.get('bolum_id')
@@ -1242,9 +1361,7 @@ class MainWindow(QMainWindow):
             if not eff_bolum_id:
                 return True  # Admin without bolum - allow all
             
-            derslik_model = DerslikModel(db)
-            derslikler = derslik_model.get_derslikler_by_bolum(eff_bolum_id)
-            return len(derslikler) > 0
+            return self._bolum_istatistikleri(eff_bolum_id)['derslik_sayisi'] > 0
             
         except Exception as e:
             logger.error(f"Error checking classrooms: {e}", exc_info=True)
@@ -1254,9 +1371,6 @@ class MainWindow(QMainWindow):
     def _check_courses_exist(self) -> bool:
         """Check if courses exist for current user/bolum"""
         try:
-            from models.database import db
-            from models.ders_model import DersModel
-            
             # Get effective user (handle impersonation)
             eff_user = self.get_effective_user_data()
             eff_bolum_id = eff_user.get('bolum_id')
@@ -1264,9 +1378,7 @@ class MainWindow(QMainWindow):
             if not eff_bolum_id:
                 return True  # Admin without bolum - allow all
             
-            ders_model = DersModel(db)
-            dersler = ders_model.get_dersler_by_bolum(eff_bolum_id)
-            return len(dersler) > 0
+            return self._bolum_istatistikleri(eff_bolum_id)['ders_sayisi'] > 0
             
         except Exception as e:
             logger.error(f"Error checking courses: {e}", exc_info=True)
@@ -1276,9 +1388,6 @@ class MainWindow(QMainWindow):
     def _check_exam_programs_exist(self) -> bool:
         """Check if exam programs exist for current user/bolum"""
         try:
-            from models.database import db
-            from models.sinav_model import SinavModel
-            
             # Get effective user (handle impersonation)
             eff_user = self.get_effective_user_data()
             eff_bolum_id = eff_user.get('bolum_id')
@@ -1286,9 +1395,7 @@ class MainWindow(QMainWindow):
             if not eff_bolum_id:
                 return True  # Admin without bolum - allow all
             
-            sinav_model = SinavModel(db)
-            programs = sinav_model.get_programs_by_bolum(eff_bolum_id)
-            return len(programs) > 0
+            return self._bolum_istatistikleri(eff_bolum_id)['program_sayisi'] > 0
             
         except Exception as e:
             logger.error(f"Error checking exam programs: {e}", exc_info=True)
@@ -1298,9 +1405,6 @@ class MainWindow(QMainWindow):
     def _check_students_exist(self) -> bool:
         """Check if students exist for current user/bolum"""
         try:
-            from models.database import db
-            from models.ogrenci_model import OgrenciModel
-            
             # Get effective user (handle impersonation)
             eff_user = self.get_effective_user_data()
             eff_bolum_id = eff_user.get('bolum_id')
@@ -1308,9 +1412,7 @@ class MainWindow(QMainWindow):
             if not eff_bolum_id:
                 return True  # Admin without bolum - allow all
             
-            ogrenci_model = OgrenciModel(db)
-            ogrenciler = ogrenci_model.get_ogrenciler_by_bolum(eff_bolum_id)
-            return len(ogrenciler) > 0
+            return self._bolum_istatistikleri(eff_bolum_id)['ogrenci_sayisi'] > 0
             
         except Exception as e:
             logger.error(f"Error checking students: {e}", exc_info=True)
@@ -1337,6 +1439,9 @@ class MainWindow(QMainWindow):
 
     def handle_logout(self):
         """Logout"""
+        self.change_notifier.close()
+        for page in self.pages.values():
+            query_executor.cancel_owner(page)
         # Emit signal - main.py will handle
         self.logout_requested.emit()
 